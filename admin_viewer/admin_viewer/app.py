@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+Run with:
+    python -m admin_viewer.app
+
+Headless (no tkinter), e.g.:
+    python -m admin_viewer.app --sync <manifest> --ids 123,456 --from 2024-01-01 --to 2024-01-31 --out report.xlsx
+"""
+import sys
+import multiprocessing
+
+def main(argv=None):
+    multiprocessing.freeze_support()
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        from .cli import main as cli_main
+        return cli_main(argv)
+    from .viewer import ViewerApp
+    ViewerApp().mainloop()
+
+if __name__ == "__main__":
+    sys.exit(main())
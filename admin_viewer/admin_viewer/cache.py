@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+import os, json, time, threading
+from datetime import datetime
+
+from .config import (CACHE_DIR, CACHE_INDEX_PATH, DEFAULT_VIEW_COLS, SNAPSHOT_META_PATH, SNAPSHOT_VERSION,
+                     SNAPSHOT_SHARD_COL, MANIFEST_CACHE_PATH, MANIFEST_TTL, MANIFEST_URL_MAX_AGE)
+
+INDEX_VERSION = 1
+# manifest 항목에 있을 수 있는 변경 판별용 키 (있는 것만 사용)
+FINGERPRINT_KEYS = ("size", "modifiedTime", "modified_time", "mtime", "md5Checksum", "md5", "sha256", "hash")
+
+def file_key(path: str):
+    """로컬 파일이 바뀌었는지 판별하는 값 (크기-수정시각). 없으면 None."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+def manifest_fingerprint(f: dict) -> dict:
+    fp = {}
+    for k in FINGERPRINT_KEYS:
+        v = f.get(k)
+        if v is not None and str(v).strip():
+            fp[k] = str(v).strip()
+    return fp
+
+class CacheIndex:
+    """CACHE_DIR 안의 shard 파일별 fileId/fingerprint/검증값 기록."""
+
+    def __init__(self, path: str = CACHE_INDEX_PATH):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        try:
+            if os.path.isfile(path):
+                with open(path, "r", encoding="utf-8") as fp:
+                    data = json.load(fp)
+                if data.get("version") == INDEX_VERSION:
+                    self.entries = data.get("files", {})
+        except:
+            self.entries = {}
+
+    def _entry(self, f: dict, local_path: str):
+        e = self.entries.get(f.get("name"))
+        if not e or e.get("fileId") != f.get("fileId"):
+            return None
+        try:
+            if os.path.getsize(local_path) != e.get("bytes"):
+                return None
+        except OSError:
+            return None
+        return e
+
+    def is_fresh(self, f: dict, local_path: str) -> bool:
+        """manifest에 fingerprint가 있고 지난 동기화 때와 같으면 True."""
+        e = self._entry(f, local_path)
+        fp = manifest_fingerprint(f)
+        return bool(e and fp and e.get("fingerprint") == fp)
+
+    def conditional_headers(self, f: dict, local_path: str) -> dict:
+        """fingerprint가 없을 때 재검증에 쓸 If-None-Match / If-Modified-Since.
+        manifest에 fingerprint가 있는데 is_fresh가 아니면 바뀐 것이므로 조건 없이 받아야 한다 (빈 dict)."""
+        e = self._entry(f, local_path)
+        headers = {}
+        if e and not manifest_fingerprint(f):
+            if e.get("etag"):
+                headers["If-None-Match"] = e["etag"]
+            if e.get("last_modified"):
+                headers["If-Modified-Since"] = e["last_modified"]
+        return headers
+
+    def recorded(self, f: dict, local_path: str) -> dict:
+        """같은 fileId로 받은 파일이 그대로 남아 있으면 그 기록, 아니면 빈 dict."""
+        return self._entry(f, local_path) or {}
+
+    def forget(self, name: str):
+        with self._lock:
+            self.entries.pop(name, None)
+
+    def record(self, f: dict, local_path: str, headers=None, fingerprint=None):
+        """fingerprint를 주면 manifest 항목 대신 그 값을 남긴다 (304로 파일을 그대로 둔 경우)."""
+        headers = headers or {}
+        entry = {
+            "fileId": f.get("fileId"),
+            "fingerprint": manifest_fingerprint(f) if fingerprint is None else fingerprint,
+            "bytes": os.path.getsize(local_path),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "synced_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self.entries[f.get("name")] = entry
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with self._lock:
+            entries = dict(self.entries)
+        try:
+            with open(tmp, "w", encoding="utf-8") as fp:
+                json.dump({"version": INDEX_VERSION, "files": entries}, fp, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+        except:
+            pass
+
+class ManifestCache:
+    """manifest 조회 결과 기록.
+      resolved : 입력값(API 주소/manifest id)별 manifest id·본문과 마지막 확인 시각 (MANIFEST_TTL 동안은 요청 없이 사용)
+      urls     : 요청 주소별 ETag/Last-Modified와 응답 본문 (304를 받으면 이 본문을 다시 씀)"""
+
+    def __init__(self, path: str = MANIFEST_CACHE_PATH):
+        self.path = path
+        self.resolved = {}
+        self.urls = {}
+        self._lock = threading.Lock()
+        try:
+            if os.path.isfile(path):
+                with open(path, "r", encoding="utf-8") as fp:
+                    data = json.load(fp)
+                if data.get("version") == INDEX_VERSION:
+                    self.resolved = data.get("resolved", {})
+                    self.urls = data.get("urls", {})
+        except:
+            self.resolved, self.urls = {}, {}
+
+    def lookup(self, raw: str):
+        """(저장된 manifest 또는 None, TTL 안이면 True)."""
+        with self._lock:
+            e = self.resolved.get(raw)
+        if not e or not isinstance(e.get("manifest"), dict):
+            return None, False
+        return e["manifest"], time.time() - e.get("checked_at", 0) < MANIFEST_TTL
+
+    def validators(self, url: str) -> dict:
+        with self._lock:
+            e = self.urls.get(url)
+        headers = {}
+        if e:
+            if e.get("etag"):
+                headers["If-None-Match"] = e["etag"]
+            if e.get("last_modified"):
+                headers["If-Modified-Since"] = e["last_modified"]
+        return headers
+
+    def body(self, url: str):
+        with self._lock:
+            e = self.urls.get(url)
+            if e:
+                e["fetched_at"] = time.time()
+            return e.get("body") if e else None
+
+    def store(self, url: str, payload, headers):
+        """재검증할 수 있는 응답(ETag 또는 Last-Modified가 있는 것)만 기억한다."""
+        etag, modified = headers.get("ETag"), headers.get("Last-Modified")
+        if not etag and not modified:
+            return
+        with self._lock:
+            self.urls[url] = {"etag": etag, "last_modified": modified, "body": payload, "fetched_at": time.time()}
+
+    def remember(self, raw: str, manifest_id, manifest: dict):
+        with self._lock:
+            self.resolved[raw] = {"manifest_id": manifest_id, "manifest": manifest, "checked_at": time.time()}
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        cutoff = time.time() - MANIFEST_URL_MAX_AGE
+        with self._lock:
+            urls = {u: e for u, e in self.urls.items() if e.get("fetched_at", 0) >= cutoff}
+            resolved = {r: e for r, e in self.resolved.items() if e.get("checked_at", 0) >= cutoff}
+        try:
+            with open(tmp, "w", encoding="utf-8") as fp:
+                json.dump({"version": INDEX_VERSION, "resolved": resolved, "urls": urls}, fp, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except:
+            pass
+
+def _snapshot_meta():
+    try:
+        with open(SNAPSHOT_META_PATH, "r", encoding="utf-8") as fp:
+            return json.load(fp)
+    except:
+        return None
+
+def _write_snapshot_meta(meta: dict):
+    tmp = SNAPSHOT_META_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(meta, fp, ensure_ascii=False, indent=2)
+    os.replace(tmp, SNAPSHOT_META_PATH)
+
+def save_snapshot(data, view_range=None, shards=None):
+    """정렬·압축된 df_all(또는 그 Arrow 표)을 Arrow IPC(Feather) 파일로 저장한다.
+    열려(memory-map) 있는 이전 파일을 덮어쓰지 않도록 매번 새 이름으로 쓰고 meta가 가리키게 한다."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    name = f"snapshot-{datetime.now().strftime('%Y%m%d%H%M%S%f')}.arrow"
+    path = os.path.join(CACHE_DIR, name)
+    table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+    feather.write_feather(table, path + ".tmp", compression="uncompressed")
+    os.replace(path + ".tmp", path)
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "view_cols": list(DEFAULT_VIEW_COLS),
+        "columns": table.column_names,
+        "schema": str(table.schema.remove_metadata()),
+        "file": name,
+        "rows": table.num_rows,
+        "view_range": view_range or {},
+        "shards": shards or {},
+        "saved_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    _write_snapshot_meta(meta)
+    for old in os.listdir(CACHE_DIR):
+        if old.startswith("snapshot-") and old != name:
+            try:
+                os.remove(os.path.join(CACHE_DIR, old))
+            except OSError:
+                pass
+
+def update_snapshot_meta(**fields):
+    """데이터는 그대로 두고 meta만 고친다 (바뀐 shard 없이 동기화가 끝났을 때)."""
+    meta = _snapshot_meta()
+    if meta:
+        meta.update(fields, saved_at=datetime.now().isoformat(timespec="seconds"))
+        _write_snapshot_meta(meta)
+
+def table_to_frame(table):
+    """Arrow 표를 pandas로 한 번에 바꾼다. 문자열은 Arrow 문자열 그대로, dictionary는 category가 된다.
+    스냅샷에만 쓰는 원본 shard 컬럼(SNAPSHOT_SHARD_COL)은 뺀다."""
+    import pandas as pd
+    import pyarrow as pa
+    if SNAPSHOT_SHARD_COL in table.column_names:
+        table = table.drop_columns([SNAPSHOT_SHARD_COL])
+    strings = {pa.string(): pd.StringDtype("pyarrow"), pa.large_string(): pd.StringDtype("pyarrow")}
+    return table.to_pandas(types_mapper=strings.get)
+
+def load_snapshot_table():
+    """저장된 스냅샷을 memory-map으로 열어 (Arrow 표, meta)를 돌려준다. 없거나 버전/컬럼이 다르면 None."""
+    meta = _snapshot_meta()
+    if not meta or meta.get("version") != SNAPSHOT_VERSION or meta.get("view_cols") != list(DEFAULT_VIEW_COLS):
+        return None
+    path = os.path.join(CACHE_DIR, meta.get("file") or "")
+    if not os.path.isfile(path):
+        return None
+    import pyarrow as pa
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if str(table.schema.remove_metadata()) != meta.get("schema") or table.column_names != meta.get("columns"):
+        return None
+    return table, meta
+
+def load_snapshot():
+    """저장된 스냅샷을 (df, meta)로. 없거나 버전/컬럼이 다르면 None."""
+    snap = load_snapshot_table()
+    return None if snap is None else (table_to_frame(snap[0]), snap[1])
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+tkinter 없이 동기화·조회·엑셀 저장을 실행하는 배치 모드.
+
+    python app.py --sync <API/manifest> --ids 123,456 --from 2024-01-01 --to 2024-01-31 --out 리포트.xlsx
+    python -m admin_viewer.cli --ids-file ids.txt --per-company --out reports/
+"""
+import os, sys, time, argparse
+from datetime import datetime
+from itertools import chain
+
+from .config import BULK_EXPORT_WORKERS, STREAM_MEMORY_MB
+from .rollups import Rollups
+from .helpers import parse_id_list, write_excel, write_excel_chunks
+from .index import PlaceIndex
+from .cache import load_snapshot
+from .sync import SyncJob, SyncError
+from .perf import Trace
+from .search import TitleIndex, select_titles, title_mask
+from .export import for_excel, date_span_text, report_title, report_filename, bulk_export, write_summary
+
+SUMMARY_FREQS = {"total": None, "day": "D", "week": "W", "month": "M"}
+
+def _date(s: str):
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="admin_viewer", description="애드민 리포트 뷰어 배치 모드")
+    p.add_argument("--sync", metavar="SOURCE", help="API URL 또는 manifest 파일 ID/공유링크 (생략하면 마지막 로컬 스냅샷 사용)")
+    p.add_argument("--lazy", action="store_true", help="shard를 합치지 않고 지연 조회 엔진으로 조회")
+    p.add_argument("--stream", action="store_true",
+                   help="지연 조회 엔진에서 batch 단위로 읽어 바로 엑셀에 쓴다 (전체를 메모리에 두지 않음, --sync 필요)")
+    p.add_argument("--memory-cap", type=float, default=STREAM_MEMORY_MB, metavar="MB", help="--stream 때 batch 메모리 한도")
+    p.add_argument("--ids", help="업체ID (콤마/공백 구분)")
+    p.add_argument("--ids-file", help="업체ID 목록 파일")
+    p.add_argument("--all", action="store_true", help="전체 업체")
+    p.add_argument("--title", help="포스팅제목에 이 문자열이 들어 있는 글만 (업체ID를 생략하면 전체 업체)")
+    p.add_argument("--from", dest="start", type=_date, help="시작일 YYYY-MM-DD")
+    p.add_argument("--to", dest="end", type=_date, help="끝일 YYYY-MM-DD")
+    p.add_argument("--out", help="저장할 .xlsx 파일 또는 폴더")
+    p.add_argument("--summary", choices=sorted(SUMMARY_FREQS), help="원본 대신 업체별 집계를 저장 (total 합계, day/week/month 기간별)")
+    p.add_argument("--per-company", action="store_true", help="업체별로 파일을 나눠 --out 폴더에 저장")
+    p.add_argument("--workers", type=int, default=BULK_EXPORT_WORKERS, help="업체별 저장 프로세스 수")
+    return p
+
+def _log(msg: str):
+    print(msg, file=sys.stderr, flush=True)
+
+def load_index(args):
+    if args.sync:
+        job = SyncJob(args.sync, lazy=args.lazy or args.stream)
+        job.run()
+        for w in job.warnings:
+            _log(f"알림: {w}")
+        vr = job.manifest.get("view_range", {})
+        _log(f"동기화 완료: 기간 {vr.get('min_date')} ~ {vr.get('max_date')} / {job.counts} / {job.trace.summary()}")
+        return job.index
+    snap = load_snapshot()
+    if snap is None:
+        return None
+    df, meta = snap
+    _log(f"로컬 스냅샷 사용: {len(df):,}행 (동기화 {meta.get('saved_at')})")
+    return PlaceIndex(df, presorted=True)
+
+def _title_index(index):
+    if getattr(index, "df", None) is None or "title" not in index.columns:
+        return None
+    titles = TitleIndex.load()
+    if titles.attach(index.df["title"]):
+        try:
+            titles.save()
+        except OSError as e:
+            _log(f"알림: 제목 검색 색인 저장 실패 {e}")
+    return titles
+
+def run(args) -> int:
+    try:
+        index = load_index(args)
+    except SyncError as e:
+        _log(f"에러: {e}")
+        return 1
+    except Exception as e:
+        _log(f"에러: 동기화 실패 {e}")
+        return 1
+    if index is None or index.empty:
+        _log("데이터가 없습니다. --sync로 먼저 동기화하세요.")
+        return 2
+    if not args.out:
+        return 0
+
+    ids = parse_id_list(args.ids or "")
+    if args.ids_file:
+        with open(args.ids_file, "r", encoding="utf-8") as fp:
+            ids += parse_id_list(fp.read())
+    if args.all:
+        ids = sorted(index.all_ids)
+    ids = list(dict.fromkeys(ids))
+    if args.summary:
+        return _summary_export(ids, args)
+    if not ids and not args.title:
+        _log("업체 ID나 제목 검색어를 지정해야 조회할 수 있습니다. (--ids, --ids-file, --all, --title)")
+        return 2
+
+    t = time.perf_counter()
+    if args.per_company:
+        if args.title:
+            # 제목으로 먼저 거른 결과를 업체별로 나눈다
+            index = PlaceIndex(select_titles(index, _title_index(index), args.title, ids, args.start, args.end), presorted=True)
+            ids = ids or sorted(index.all_ids)
+        summary = bulk_export(index, ids, args.out, args.start, args.end, workers=args.workers)
+        if not summary:
+            _log("조건에 맞는 데이터가 없습니다.")
+            return 2
+        s_txt = args.start.strftime("%Y-%m-%d") if args.start else "시작없음"
+        e_txt = args.end.strftime("%Y-%m-%d") if args.end else "마감없음"
+        write_summary(summary, os.path.join(args.out, f"애드민_리포트_요약_{s_txt}_{e_txt}.csv"))
+        for r in summary:
+            print(f"{r['file']}\t{r['rows']}\t{r['seconds']:.3f}\t{r['error']}")
+        _log(f"{len(summary)}개 파일 저장 ({time.perf_counter() - t:.1f}초)")
+        return 1 if any(r["error"] for r in summary) else 0
+
+    trace = Trace("cli_export")
+    if args.stream:
+        if hasattr(index, "iter_select"):
+            return _stream_export(index, ids, args, trace)
+        _log("알림: --stream은 --sync와 함께 써야 합니다. 로컬 스냅샷으로 저장합니다.")
+    with trace.phase("select", ids=len(ids), title=bool(args.title)):
+        if args.title:
+            titles = _title_index(index)
+            df = select_titles(index, titles, args.title, ids, args.start, args.end)
+        else:
+            df = index.select(ids, args.start, args.end)
+    if df.empty:
+        _log("조건에 맞는 데이터가 없습니다.")
+        return 2
+    out = args.out
+    if os.path.isdir(out) or out.endswith(("/", os.sep)):
+        os.makedirs(out, exist_ok=True)
+        title = report_title(df, set(ids), index.all_ids)
+        out = os.path.join(out, report_filename(title, *date_span_text(df, args.start, args.end)))
+    with trace.phase("prepare"):
+        xdf = for_excel(df)
+    write_excel(xdf, out, trace=trace)
+    trace.finish(rows=len(df), ids=len(ids))
+    print(out)
+    _log(f"{len(df):,}행 저장 ({trace.summary()})")
+    return 0
+
+def _summary_export(ids, args) -> int:
+    rollups = Rollups.load()
+    if rollups is None or rollups.empty:
+        _log("업체별 집계가 없습니다. --sync로 먼저 동기화하세요.")
+        return 2
+    trace = Trace("cli_summary")
+    freq = SUMMARY_FREQS[args.summary]
+    with trace.phase("rollup_query", mode=args.summary):
+        df = rollups.totals(ids, args.start, args.end) if freq is None else rollups.periods(ids, args.start, args.end, freq)
+    if df.empty:
+        _log("조건에 맞는 데이터가 없습니다.")
+        return 2
+    out = args.out
+    if os.path.isdir(out) or out.endswith(("/", os.sep)):
+        os.makedirs(out, exist_ok=True)
+        s_txt = args.start.strftime("%Y-%m-%d") if args.start else "시작없음"
+        e_txt = args.end.strftime("%Y-%m-%d") if args.end else "마감없음"
+        out = os.path.join(out, report_filename(report_title(df, set(ids)), s_txt, e_txt, f"애드민_요약_{args.summary}"))
+    write_excel(df, out, trace=trace)
+    trace.finish(rows=len(df), ids=len(ids), mode=args.summary)
+    print(out)
+    _log(f"요약 {len(df):,}행 저장 ({trace.summary()})")
+    return 0
+
+def _stream_export(index, ids, args, trace) -> int:
+    ids = ids or sorted(index.all_ids)
+    chunks = index.iter_select(ids, args.start, args.end, max_mb=args.memory_cap)
+    if args.title:
+        chunks = (c[title_mask(c, args.title)] for c in chunks)
+    chunks = (c for c in chunks if len(c))
+    first = next(chunks, None)
+    if first is None:
+        _log("조건에 맞는 데이터가 없습니다.")
+        return 2
+    out = args.out
+    if os.path.isdir(out) or out.endswith(("/", os.sep)):
+        os.makedirs(out, exist_ok=True)
+        title = report_title(first, set(ids), index.all_ids)
+        out = os.path.join(out, report_filename(title, *date_span_text(first, args.start, args.end)))
+    rows = write_excel_chunks((for_excel(c) for c in chain([first], chunks)), out, trace=trace)
+    trace.finish(rows=rows, ids=len(ids), stream=True)
+    print(out)
+    _log(f"{rows:,}행 저장 ({trace.summary()})")
+    return 0
+
+def main(argv=None) -> int:
+    return run(build_parser().parse_args(argv))
+
+if __name__ == "__main__":
+    sys.exit(main())
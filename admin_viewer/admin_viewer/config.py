@@ -2,7 +2,7 @@
 import os
 
 APP_TITLE = "애드민 리포트 뷰어"
-CACHE_DIR = os.path.join(os.path.expanduser("~"), ".adminviewer_cache")
+CACHE_DIR = os.environ.get("ADMINVIEWER_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".adminviewer_cache")
 SETTINGS_PATH = os.path.join(CACHE_DIR, "settings.json")
 
 HEADER_LABELS = {
@@ -12,5 +12,44 @@ HEADER_LABELS = {
     "pub_date": "발행일",
     "title": "포스팅제목",
     "post_url": "포스팅URL",
+    "period": "기간",
+    "posts": "글 수",
+    "first": "첫 발행일",
+    "last": "마지막 발행일",
 }
 DEFAULT_VIEW_COLS = ["place_id", "company_name", "pub_date", "title", "post_url"]
+DRIVE_DOWNLOAD_BASE = os.environ.get("ADMINVIEWER_DRIVE_BASE") or "https://drive.google.com/uc"
+CACHE_INDEX_PATH = os.path.join(CACHE_DIR, "cache_index.json")
+MANIFEST_CACHE_PATH = os.path.join(CACHE_DIR, "manifest_cache.json")
+MANIFEST_TTL = 60
+MANIFEST_URL_MAX_AGE = 30 * 86400
+DOWNLOAD_WORKERS = 6
+DOWNLOAD_CHUNK = 1 << 20
+DOWNLOAD_TIMEOUT = (15, 60)
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_BACKOFF = 1.0
+DOWNLOAD_BACKOFF_MAX = 30.0
+SYNC_POLL_MS = 150
+VIRTUAL_BUFFER_ROWS = 5
+CATEGORY_COLS = ["place_id", "company_name"]
+ARROW_STRING_COLS = ["title", "post_url"]
+SNAPSHOT_META_PATH = os.path.join(CACHE_DIR, "snapshot.json")
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SHARD_COL = "__shard"
+BULK_EXPORT_WORKERS = None
+WARM_MODULES = ("numpy", "pandas", "pyarrow", "pyarrow.parquet", "pyarrow.dataset", "requests", "openpyxl", "tkcalendar")
+STARTUP_PROBE_ENV = "ADMINVIEWER_STARTUP_PROBE"
+PERF_LOG_PATH = os.path.join(CACHE_DIR, "perf.log")
+PERF_LOG_BYTES = 1_000_000
+PERF_LOG_BACKUPS = 3
+SEARCH_DEBOUNCE_MS = 40
+HOVER_THROTTLE_MS = 16
+SEARCH_LIMIT = 200
+TITLE_INDEX_DIR = os.path.join(CACHE_DIR, "title_index")
+TITLE_INDEX_VERSION = 1
+TITLE_INDEX_MAX_SEGMENTS = 8
+STREAM_MEMORY_MB = 512
+STREAM_RESORT_FACTOR = 10
+ROLLUP_DIR = os.path.join(CACHE_DIR, "rollups")
+ROLLUP_VERSION = 2
+SUMMARY_MODES = {"업체별 합계": None, "일별": "D", "주별": "W", "월별": "M"}
@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
-import re
+import os, re, json, time, random, hashlib
+from html import unescape
+from urllib.parse import urlencode
+
+from .config import (DOWNLOAD_WORKERS, DOWNLOAD_CHUNK, DRIVE_DOWNLOAD_BASE, DOWNLOAD_TIMEOUT, DOWNLOAD_RETRIES,
+                     DOWNLOAD_BACKOFF, DOWNLOAD_BACKOFF_MAX)
 
 def drive_download_url(file_id: str) -> str:
-    return f"https://drive.google.com/uc?export=download&id={file_id}"
+    return f"{DRIVE_DOWNLOAD_BASE}?export=download&id={file_id}"
 
 def extract_drive_file_id(s: str) -> str | None:
     if not s:
@@ -12,3 +17,210 @@ def extract_drive_file_id(s: str) -> str | None:
     m = re.search(r"[?&]id=([A-Za-z0-9_-]+)", s)
     if m: return m.group(1)
     return None
+
+def make_session(pool_size: int = DOWNLOAD_WORKERS):
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class DownloadCancelled(Exception):
+    pass
+
+class DownloadError(Exception):
+    def __init__(self, message: str, retry: bool = False):
+        super().__init__(message)
+        self.retry = retry
+
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+def drive_confirm_url(html: str, url: str, cookies=None) -> str | None:
+    """Drive의 큰 파일 확인 페이지("바이러스 검사를 할 수 없음")에서 실제 다운로드 URL을 찾는다.
+    새 형식은 download-form의 hidden input, 예전 형식은 confirm 토큰(본문 링크 또는 download_warning 쿠키)."""
+    tag = re.search(r'<form\b[^>]*\bid="download-form"[^>]*>', html)
+    action = re.search(r'\baction="([^"]+)"', tag.group(0)) if tag else None
+    if action:
+        params = []
+        for inp in re.finditer(r"<input\b[^>]*>", html):
+            t = inp.group(0)
+            name = re.search(r'\bname="([^"]*)"', t)
+            value = re.search(r'\bvalue="([^"]*)"', t)
+            if name and 'type="hidden"' in t:
+                params.append((unescape(name.group(1)), unescape(value.group(1)) if value else ""))
+        return unescape(action.group(1)) + "?" + urlencode(params)
+    m = re.search(r"confirm=([0-9A-Za-z_-]+)", html)
+    token = m.group(1) if m else next((v for k, v in (cookies or {}).items() if k.startswith("download_warning")), None)
+    if token:
+        return f"{url}{'&' if '?' in url else '?'}confirm={token}"
+    return None
+
+def _is_html(r) -> bool:
+    """Drive 확인 페이지인지. 확인 페이지는 200으로만 온다 — 206(이어받기)·304는 Content-Type과 상관없이 파일 응답이다."""
+    return r.status_code == 200 and "text/html" in r.headers.get("Content-Type", "")
+
+def _open(session, url: str, headers: dict, timeout):
+    r = session.get(url, headers=headers, stream=True, timeout=timeout)
+    if not _is_html(r):
+        return r
+    confirm = drive_confirm_url(r.text, url, r.cookies.get_dict())
+    r.close()
+    if not confirm:
+        raise DownloadError("파일 대신 HTML 페이지를 받았습니다. 공유 설정이나 Drive 다운로드 한도를 확인하세요.")
+    r = session.get(confirm, headers=headers, stream=True, timeout=timeout)
+    if _is_html(r):
+        r.close()
+        raise DownloadError("Drive 다운로드 확인 단계를 통과하지 못했습니다.", retry=True)
+    return r
+
+def _expected(expect) -> dict:
+    """manifest 항목에서 검증할 크기/체크섬."""
+    out = {}
+    if not expect:
+        return out
+    try:
+        if expect.get("size") not in (None, ""):
+            out["size"] = int(expect["size"])
+    except (TypeError, ValueError):
+        pass
+    md5 = expect.get("md5Checksum") or expect.get("md5")
+    if md5: out["md5"] = str(md5).lower()
+    if expect.get("sha256"): out["sha256"] = str(expect["sha256"]).lower()
+    return out
+
+def file_matches(path: str, expect) -> bool:
+    """이미 받아 둔 path가 expect(manifest 항목)의 size/md5/sha256과 맞는지. 확인할 값이 없으면 True."""
+    want = _expected(expect)
+    hashes = {k: hashlib.new(k) for k in ("md5", "sha256") if k in want}
+    try:
+        if "size" in want and os.path.getsize(path) != want["size"]:
+            return False
+        if hashes:
+            with open(path, "rb") as fp:
+                for block in iter(lambda: fp.read(DOWNLOAD_CHUNK), b""):
+                    for h in hashes.values(): h.update(block)
+    except OSError:
+        return False
+    return all(h.hexdigest() == want[k] for k, h in hashes.items())
+
+def _read_meta(tmp: str) -> dict:
+    try:
+        with open(tmp + ".json", "r", encoding="utf-8") as fp:
+            return json.load(fp)
+    except:
+        return {}
+
+def _write_meta(tmp: str, meta: dict):
+    with open(tmp + ".json", "w", encoding="utf-8") as fp:
+        json.dump(meta, fp)
+
+def discard_partial(path: str):
+    for p in (path + ".part", path + ".part.json"):
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+def _total_size(r, start: int):
+    m = re.match(r"bytes (\d+)-(\d+)/(\d+)", r.headers.get("Content-Range", ""))
+    if m:
+        return int(m.group(3))
+    n = r.headers.get("Content-Length")
+    return start + int(n) if n and n.isdigit() and "Content-Encoding" not in r.headers else None
+
+def _download_once(session, url, path, headers, timeout, chunk_size, on_chunk, cancel, want):
+    tmp = path + ".part"
+    part = os.path.getsize(tmp) if os.path.isfile(tmp) else 0
+    meta = _read_meta(tmp) if part else {}
+    req = dict(headers or {})
+    if part:
+        validator = meta.get("etag") or meta.get("last_modified")
+        if meta.get("url") == url and (validator or want):
+            req.pop("If-None-Match", None)
+            req.pop("If-Modified-Since", None)
+            req["Range"] = f"bytes={part}-"
+            if validator: req["If-Range"] = validator
+        else:
+            part = 0
+
+    with _open(session, url, req, timeout) as r:
+        if r.status_code == 304:
+            discard_partial(path)
+            return None
+        if r.status_code == 416 and part:
+            discard_partial(path)
+            raise DownloadError("이어받을 위치가 파일 크기를 넘었습니다.", retry=True)
+        r.raise_for_status()
+        if r.status_code == 206:
+            m = re.match(r"bytes (\d+)-", r.headers.get("Content-Range", ""))
+            if not m or int(m.group(1)) != part:
+                discard_partial(path)
+                raise DownloadError("서버가 다른 위치부터 보냈습니다.", retry=True)
+        else:
+            part = 0  # Range를 무시했거나 If-Range가 맞지 않음(파일이 바뀜): 처음부터
+        total = _total_size(r, part)
+        _write_meta(tmp, {"url": url, "etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified"),
+                          "total": total})
+        hashes = {k: hashlib.new(k) for k in ("md5", "sha256") if k in want}
+        if part and hashes:
+            with open(tmp, "rb") as fp:
+                for block in iter(lambda: fp.read(chunk_size), b""):
+                    for h in hashes.values(): h.update(block)
+        with open(tmp, "ab" if part else "wb") as fp:
+            for chunk in r.iter_content(chunk_size):
+                if cancel is not None and cancel.is_set():
+                    raise DownloadCancelled(url)
+                if chunk:
+                    fp.write(chunk)
+                    for h in hashes.values(): h.update(chunk)
+                    if on_chunk: on_chunk(len(chunk))
+        resp_headers = r.headers
+
+    size = os.path.getsize(tmp)
+    if total is not None and size < total:
+        raise DownloadError(f"받다가 끊겼습니다 ({size:,}/{total:,} bytes).", retry=True)
+    bad = []
+    if "size" in want and size != want["size"]:
+        bad.append(f"크기 {size:,} ≠ {want['size']:,}")
+    bad += [f"{k} 불일치" for k, h in hashes.items() if h.hexdigest() != want[k]]
+    if total is not None and size != total:
+        bad.append(f"크기 {size:,} ≠ {total:,}")
+    if bad:
+        discard_partial(path)
+        raise DownloadError(f"받은 파일 검증 실패: {', '.join(bad)}", retry=True)
+    os.replace(tmp, path)
+    discard_partial(path)
+    return resp_headers
+
+def _retryable(e: Exception) -> bool:
+    import requests
+    if isinstance(e, DownloadError):
+        return e.retry
+    if isinstance(e, requests.HTTPError):
+        return e.response is not None and e.response.status_code in RETRY_STATUS
+    return isinstance(e, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+def stream_download(session, url: str, path: str, headers=None, timeout=DOWNLOAD_TIMEOUT, chunk_size: int = DOWNLOAD_CHUNK,
+                    on_chunk=None, cancel=None, expect=None, retries: int = DOWNLOAD_RETRIES):
+    """본문을 chunk 단위로 path + ".part"에 쓰고, 검증이 끝나면 path로 바꿔 놓는다.
+    304(변경 없음)이면 None, 아니면 응답 헤더를 돌려준다.
+    끊기거나 5xx/429면 지수 백오프로 다시 시도하면서 .part에 이미 받은 곳부터 Range로 이어받는다
+    (실패한 동기화의 .part도 다음 동기화에서 이어받는다). expect(manifest 항목)에 size/md5/sha256이 있으면 확인한다.
+    on_chunk(n)은 chunk마다 호출되고, cancel(threading.Event)이 설정되면 DownloadCancelled를 던진다."""
+    want = _expected(expect)
+    for attempt in range(retries + 1):
+        try:
+            return _download_once(session, url, path, headers, timeout, chunk_size, on_chunk, cancel, want)
+        except DownloadCancelled:
+            raise
+        except Exception as e:
+            if attempt >= retries or not _retryable(e):
+                raise
+            wait = min(DOWNLOAD_BACKOFF * 2 ** attempt, DOWNLOAD_BACKOFF_MAX) * random.uniform(0.5, 1.0)
+            if cancel is not None:
+                if cancel.wait(wait):
+                    raise DownloadCancelled(url)
+            else:
+                time.sleep(wait)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from .config import DEFAULT_VIEW_COLS, STREAM_MEMORY_MB
+from .index import PlaceIndex
+
+class LazyEngine:
+    """CACHE_DIR의 shard 파일 위에서 바로 조회하는 엔진 (PlaceIndex와 같은 조회 메서드를 가진다).
+    업체ID/기간 조건을 dataset 필터로 넘기므로 parquet 통계상 맞을 수 없는 row group은 읽지 않고,
+    조건에 맞는 행만 pandas로 만든다."""
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.dataset = ds.dataset(self.paths, format="parquet") if self.paths else None
+        names = self.dataset.schema.names if self.dataset is not None else []
+        self.columns = [c for c in DEFAULT_VIEW_COLS if c in names]
+        self._all_ids = None
+
+    @property
+    def empty(self) -> bool:
+        return self.dataset is None or "place_id" not in self.columns
+
+    @property
+    def all_ids(self) -> set:
+        if self._all_ids is None:
+            col = self.dataset.to_table(columns=["place_id"]).column("place_id")
+            self._all_ids = {str(v) for v in pc.unique(col).to_pylist() if v is not None}
+        return self._all_ids
+
+    def _filter(self, ids, sdt=None, edt=None):
+        t = self.dataset.schema.field("place_id").type
+        if pa.types.is_dictionary(t):
+            t = t.value_type  # pandas Categorical로 쓴 shard: 값 목록은 dictionary의 값 타입으로 비교한다
+        if pa.types.is_integer(t):
+            vals = [int(i) for i in map(str, ids) if i.lstrip("-").isdigit()]
+        else:
+            vals = [str(i) for i in ids]
+        expr = ds.field("place_id").isin(pa.array(vals, type=t))
+        dt = self.dataset.schema.field("pub_date").type if "pub_date" in self.columns else None
+        if dt is not None and pa.types.is_timestamp(dt) and not dt.tz:
+            if sdt is not None:
+                expr &= ds.field("pub_date") >= pa.scalar(pd.Timestamp(sdt), type=dt)
+            if edt is not None:
+                expr &= ds.field("pub_date") <= pa.scalar(pd.Timestamp(edt), type=dt)
+        return expr
+
+    def _frame(self, table) -> pd.DataFrame:
+        from .sync import conform, compact_table
+        from .cache import table_to_frame
+        return table_to_frame(compact_table(conform(table)))
+
+    def _read(self, columns, ids, sdt=None, edt=None) -> pd.DataFrame:
+        return self._frame(self.dataset.to_table(columns=columns, filter=self._filter(ids, sdt, edt)))
+
+    def row_bytes(self) -> float:
+        """parquet 메타데이터로 어림한 한 행의 크기(압축 풀린 크기, 조회 컬럼만)."""
+        import pyarrow.parquet as pq
+        size = rows = 0
+        for path in self.paths:
+            meta = pq.ParquetFile(path).metadata
+            names = [meta.schema.column(i).name for i in range(meta.num_columns)]
+            for g in range(meta.num_row_groups):
+                rg = meta.row_group(g)
+                rows += rg.num_rows
+                size += sum(rg.column(i).total_uncompressed_size for i, n in enumerate(names) if n in self.columns)
+        return size / rows if rows else 0.0
+
+    def iter_select(self, ids, sdt=None, edt=None, max_mb: float = STREAM_MEMORY_MB, columns=None):
+        """select()와 같은 조건의 행을 row group 단위 batch로 나눠 pandas frame으로 하나씩 내보낸다.
+        한 번에 메모리에 올라가는 것은 batch 몇 개뿐이라 데이터 전체보다 메모리가 작아도 된다.
+        순서는 파일 순서."""
+        ids = list(ids)
+        if not ids or self.empty:
+            return
+        columns = columns or self.columns
+        # batch 하나(Arrow + pandas 변환본, 행 크기의 약 6배)가 max_mb의 1/4을 넘지 않게
+        batch_rows = int(max(1000, min(1 << 20, max_mb * 1e6 / max(1.0, self.row_bytes() * 6) / 4)))
+        scanner = self.dataset.scanner(columns=columns, filter=self._filter(ids, sdt, edt), batch_size=batch_rows,
+                                       batch_readahead=1, fragment_readahead=1)
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                df = PlaceIndex(self._frame(pa.Table.from_batches([batch]))).select(ids, sdt, edt)
+                if len(df):
+                    yield df.reset_index(drop=True)
+
+    def select(self, ids, sdt=None, edt=None) -> pd.DataFrame:
+        ids = list(ids)
+        if not ids:
+            return pd.DataFrame(columns=self.columns)
+        # 문자열 pub_date처럼 필터로 못 넘긴 조건은 PlaceIndex가 결과 안에서 마저 처리한다
+        return PlaceIndex(self._read(self.columns, ids, sdt, edt)).select(ids, sdt, edt)
+
+    def companies(self, ids) -> list:
+        ids = list(ids)
+        if not ids or "company_name" not in self.columns:
+            return []
+        return PlaceIndex(self._read(["place_id", "company_name"], ids)).companies(ids)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import os, csv, time, multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+
+from .config import BULK_EXPORT_WORKERS
+from .helpers import write_excel, sanitize_component
+from .index import PlaceIndex
+
+def for_excel(df: pd.DataFrame) -> pd.DataFrame:
+    if "pub_date" in df.columns and pd.api.types.is_datetime64_any_dtype(df["pub_date"]):
+        return df.assign(pub_date=df["pub_date"].dt.strftime("%Y-%m-%d"))
+    return df
+
+def date_span_text(df: pd.DataFrame, sdt=None, edt=None):
+    """파일명에 쓸 (시작, 끝) 문자열. 조회 기간이 비어 있으면 데이터의 최소/최대 발행일."""
+    if not sdt or not edt:
+        try:
+            p = df["pub_date"]
+            if not sdt: sdt = p.min().date() if p.notna().any() else None
+            if not edt: edt = p.max().date() if p.notna().any() else None
+        except:
+            pass
+    s_txt = (sdt.strftime("%Y-%m-%d") if sdt else "시작없음")
+    e_txt = (edt.strftime("%Y-%m-%d") if edt else "마감없음")
+    return s_txt, e_txt
+
+def report_title(df: pd.DataFrame, ids=None, all_ids=None) -> str:
+    try:
+        if ids and all_ids and set(ids) == all_ids:
+            return "전체"
+        if "company_name" in df.columns:
+            names = [x for x in df["company_name"].dropna().astype(str).unique() if x.strip()]
+        else:
+            names = [x for x in df["place_id"].astype(str).unique()]
+        if len(names) == 0:
+            return "선택"
+        if len(names) == 1:
+            return names[0]
+        return f"{names[0]}외"
+    except:
+        return "선택"
+
+def report_filename(title: str, s_txt: str, e_txt: str, prefix: str = "애드민_리포트") -> str:
+    return f"{prefix}_{sanitize_component(title)}_{s_txt}_{e_txt}.xlsx"
+
+def _write_one(df: pd.DataFrame, path: str):
+    t = time.perf_counter()
+    write_excel(for_excel(df), path)
+    return len(df), time.perf_counter() - t
+
+def bulk_export(index, ids, out_dir: str, sdt=None, edt=None, workers: int | None = BULK_EXPORT_WORKERS, on_file=None):
+    """ids·기간으로 한 번 조회한 결과를 place_id별로 나눠 업체마다 엑셀 한 개씩 프로세스 풀에서 쓴다.
+    반환값은 파일별 요약 dict 목록 (place_id, company_name, file, rows, seconds)."""
+    df = index.select(ids, sdt, edt)
+    parts = PlaceIndex(df, presorted=True)
+    jobs, used = [], set()
+    for pid, (a, b) in parts.ranges.items():
+        part = df.iloc[a:b]
+        title = parts.names.get(pid) or pid
+        fname = report_filename(title, *date_span_text(part, sdt, edt))
+        if fname in used:
+            fname = report_filename(f"{title}_{pid}", *date_span_text(part, sdt, edt))
+        used.add(fname)
+        jobs.append((pid, str(parts.names.get(pid) or ""), part, os.path.join(out_dir, fname)))
+
+    os.makedirs(out_dir, exist_ok=True)
+    summary = []
+    # Tk 프로세스의 백그라운드 스레드에서 시작하므로 fork(리눅스 기본)로 잡힌 잠금을 물려받지 않게 spawn으로 띄운다 (Windows와 같음)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+        futures = {ex.submit(_write_one, part, path): (pid, name, path) for pid, name, part, path in jobs}
+        for fut in as_completed(futures):
+            pid, name, path = futures[fut]
+            try:
+                rows, secs = fut.result()
+                row = {"place_id": pid, "company_name": name, "file": os.path.basename(path),
+                       "rows": rows, "seconds": round(secs, 3), "error": ""}
+            except Exception as e:
+                row = {"place_id": pid, "company_name": name, "file": os.path.basename(path),
+                       "rows": 0, "seconds": 0, "error": str(e)}
+            summary.append(row)
+            if on_file: on_file(row, len(jobs))
+    summary.sort(key=lambda r: r["file"])
+    return summary
+
+def write_summary(summary: list, path: str):
+    with open(path, "w", encoding="utf-8-sig", newline="") as fp:
+        w = csv.DictWriter(fp, fieldnames=["place_id", "company_name", "file", "rows", "seconds", "error"])
+        w.writeheader()
+        w.writerows(summary)
@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 import re
-from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
+from itertools import chain
+
+from .perf import NO_TRACE
+
+EXCEL_CHUNK_ROWS = 20000
 
 def autosize_excel(path: str):
+    from openpyxl import load_workbook
+    from openpyxl.utils import get_column_letter
     wb = load_workbook(path)
     ws = wb.active
     for col in ws.columns:
@@ -20,6 +25,66 @@ def autosize_excel(path: str):
     ws.freeze_panes = "A2"
     wb.save(path)
 
+def excel_column_widths(df) -> list:
+    """autosize_excel과 같은 규칙(가장 긴 값 + 2, 최대 60)을 DataFrame에서 벡터 연산으로 계산한다."""
+    widths = []
+    for c in df.columns:
+        lens = df[c].astype("string").str.len()
+        max_len = max(len(str(c)), int(lens.max()) if lens.notna().any() else 0)
+        widths.append(min(max_len + 2, 60))
+    return widths
+
+def write_excel(df, path: str, chunk_rows: int = EXCEL_CHUNK_ROWS, trace=NO_TRACE):
+    """write-only 모드로 한 번에 쓴다. 열 너비와 A2 틀 고정도 같은 패스에서 지정한다."""
+    with trace.phase("column_widths"):
+        widths = excel_column_widths(df)
+    chunks = (df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows))
+    return write_excel_chunks(chunks, path, columns=list(df.columns), widths=widths, trace=trace)
+
+def write_excel_chunks(chunks, path: str, columns=None, widths=None, trace=NO_TRACE) -> int:
+    """DataFrame chunk를 받는 대로 써서 전체를 메모리에 두지 않는다. 쓴 행 수를 돌려준다.
+    write-only 시트는 열 너비를 첫 행보다 먼저 정해야 하므로 widths가 없으면 첫 chunk로 계산한다."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+    from openpyxl.utils import get_column_letter
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if columns is None:
+        columns = list(first.columns) if first is not None else []
+    if widths is None:
+        with trace.phase("column_widths"):
+            widths = excel_column_widths(first) if first is not None else [len(str(c)) + 2 for c in columns]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for i, w in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = w
+    ws.freeze_panes = "A2"
+
+    thin = Side(style="thin")
+    header = []
+    for c in columns:
+        cell = WriteOnlyCell(ws, value=str(c))
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal="center", vertical="top")
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        header.append(cell)
+    ws.append(header)
+
+    rows = 0
+    with trace.phase("write_rows") as ph:
+        for chunk in chain([first] if first is not None else [], chunks):
+            chunk = chunk.astype(object)
+            chunk = chunk.where(chunk.notna(), None)
+            for row in chunk.itertuples(index=False, name=None):
+                ws.append(row)
+            rows += len(chunk)
+        ph["rows"] = rows
+    with trace.phase("save"):
+        wb.save(path)
+    return rows
+
 def parse_id_list(text: str):
     if not text:
         return []
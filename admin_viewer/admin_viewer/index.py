@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+_NAT = np.iinfo(np.int64).min
+
+def sort_layout(df: pd.DataFrame):
+    """(place_id, pub_date) 순으로 정렬한 df와 문자열 place_id 키를 돌려준다. NaT는 업체 구간 맨 앞에 온다."""
+    by = ["__key"] + (["pub_date"] if "pub_date" in df.columns else [])
+    out = df.assign(__key=df["place_id"].astype(str)).sort_values(by, na_position="first", kind="stable")
+    keys = out.pop("__key")
+    return out.reset_index(drop=True), keys.to_numpy()
+
+class PlaceIndex:
+    """동기화 때 한 번 만드는 place_id(문자열) 색인.
+    df를 (place_id, pub_date) 순으로 정렬해 두고 업체별 [시작, 끝) 구간을 기억하므로,
+    업체+기간 조회는 업체마다 searchsorted 두 번으로 연속 구간을 잘라낸다."""
+
+    def __init__(self, df: pd.DataFrame, presorted: bool = False):
+        self.df = df
+        self.ranges = {}
+        self.names = {}
+        self._dates = None
+        if df.empty or "place_id" not in df.columns:
+            return
+        if presorted and isinstance(df["place_id"].dtype, pd.CategoricalDtype):
+            # 정렬돼 있으면 같은 업체가 붙어 있으므로 category 코드를 그대로 구간 경계로 쓴다
+            codes = df["place_id"].cat.codes.to_numpy()
+            uniques = np.asarray(df["place_id"].cat.categories.astype(str), dtype=object)
+        else:
+            if presorted:
+                keys = df["place_id"].astype(str).to_numpy()
+            else:
+                self.df, keys = sort_layout(df)
+                df = self.df
+            codes, uniques = pd.factorize(keys)
+        bounds = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = np.r_[0, bounds]
+        ends = np.r_[bounds, len(df)]
+        for a, b in zip(starts.tolist(), ends.tolist()):
+            if codes[a] >= 0:
+                self.ranges[uniques[codes[a]]] = (a, b)
+
+        if "company_name" in df.columns:
+            names = df["company_name"].to_numpy()
+            for pid, (a, b) in self.ranges.items():
+                for v in names[a:b]:
+                    if pd.notna(v):
+                        self.names[pid] = v
+                        break
+
+        if "pub_date" in df.columns and pd.api.types.is_datetime64_any_dtype(df["pub_date"]):
+            self._dates = df["pub_date"].to_numpy("datetime64[ns]").view("i8")
+
+    @property
+    def empty(self) -> bool:
+        return self.df.empty
+
+    @property
+    def columns(self) -> list:
+        return list(self.df.columns)
+
+    @property
+    def all_ids(self) -> set:
+        return set(self.ranges)
+
+    def _ts(self, d) -> int:
+        return pd.Timestamp(d).value
+
+    def slices(self, ids, sdt=None, edt=None) -> list:
+        """ids의 [시작, 끝) 구간 목록. sdt/edt가 있으면 pub_date >= sdt, <= edt 로 좁힌다."""
+        out = []
+        dated = self._dates is not None and (sdt is not None or edt is not None)
+        lo_key = self._ts(sdt) if sdt is not None else _NAT + 1
+        for pid in set(map(str, ids)):
+            r = self.ranges.get(pid)
+            if not r:
+                continue
+            a, b = r
+            if dated:
+                seg = self._dates[a:b]
+                lo = a + int(np.searchsorted(seg, lo_key, "left"))
+                hi = a + int(np.searchsorted(seg, self._ts(edt), "right")) if edt is not None else b
+                a, b = lo, max(lo, hi)
+            if b > a:
+                out.append((a, b))
+        out.sort()
+        return out
+
+    def row_positions(self, ids, sdt=None, edt=None) -> np.ndarray:
+        parts = [np.arange(a, b) for a, b in self.slices(ids, sdt, edt)]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(parts)
+
+    def select(self, ids, sdt=None, edt=None) -> pd.DataFrame:
+        sl = self.slices(ids, sdt, edt)
+        if len(sl) == 1:
+            return self.df.iloc[sl[0][0]:sl[0][1]]
+        return self.df.take(self.row_positions(ids, sdt, edt))
+
+    def companies(self, ids) -> list:
+        """ids 중 데이터에 있는 업체의 (place_id, company_name), 데이터 순서대로."""
+        found = [i for i in set(map(str, ids)) if i in self.names]
+        found.sort(key=lambda i: self.ranges[i][0])
+        return [(i, self.names[i]) for i in found]
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+작업(동기화·조회·정렬·엑셀 저장)별 단계 시간 측정.
+
+    trace = Trace("apply_filter")
+    with trace.phase("select"):
+        ...
+    trace.finish(rows=123)      # CACHE_DIR/perf.log 에 JSON 한 줄 추가
+    status.set(trace.summary())
+
+request_profile()를 호출하면 다음에 시작하는 작업 하나를 cProfile로 감싸
+CACHE_DIR/profile_<작업>_<시각>.prof(+ .txt)로 남긴다. 사용자에게 이 파일을 받아 분석한다.
+
+cProfile은 켠 스레드만 잰다. 작업 일부를 다른 스레드(shard 받기·읽기 worker, 지연 조회 stream 등)에서 돌리면
+그 안을 trace.worker()로 감싼다 — 프로파일 중이면 스레드마다 따로 재고 finish 때 합친다.
+    with trace.worker():
+        ...
+다른 프로세스(업체별 일괄 저장 worker)는 잡히지 않는다. Python 3.12부터는 한 번에 프로파일러 하나만 켤 수 있어
+worker 프로파일러는 켜지 않고, 대신 처음 켠 프로파일러가 모든 스레드의 호출을 함께 받는다.
+"""
+import os, io, json, time, threading, logging
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from .config import CACHE_DIR, PERF_LOG_PATH, PERF_LOG_BYTES, PERF_LOG_BACKUPS
+from .version import __version__
+
+_logger = None
+_logger_lock = threading.Lock()
+_profile_requested = threading.Event()
+
+def _perf_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            logger = logging.getLogger("adminviewer.perf")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            handler = RotatingFileHandler(PERF_LOG_PATH, maxBytes=PERF_LOG_BYTES, backupCount=PERF_LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            _logger = logger
+        return _logger
+
+def request_profile():
+    _profile_requested.set()
+
+def profile_requested() -> bool:
+    return _profile_requested.is_set()
+
+class Trace:
+    def __init__(self, op: str):
+        self.op = op
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.phases = []
+        self.profile_path = None
+        self._lock = threading.Lock()
+        self._profiler = None
+        self._workers = []
+        if _profile_requested.is_set():
+            _profile_requested.clear()
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def add(self, name: str, seconds: float, **fields):
+        with self._lock:
+            self.phases.append(dict(name=name, seconds=round(seconds, 6), **fields))
+
+    @contextmanager
+    def worker(self):
+        """다른 스레드에서 도는 이 작업의 일부를 감싼다. 프로파일 중이면 그 스레드도 cProfile로 재서 finish 때 합친다.
+        finish보다 먼저 끝나야 결과에 들어간다."""
+        prof = None
+        if self._profiler is not None:
+            import cProfile
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+            except ValueError:
+                prof = None  # 3.12+: 이미 켠 프로파일러가 이 스레드도 받는다
+        try:
+            yield
+        finally:
+            if prof is not None:
+                prof.disable()
+                with self._lock:
+                    self._workers.append(prof)
+
+    @contextmanager
+    def phase(self, name: str, **fields):
+        t = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.add(name, time.perf_counter() - t, **fields)
+
+    def totals(self) -> list:
+        """단계 이름별 (이름, 합계 초, 횟수), 오래 걸린 순."""
+        agg = {}
+        with self._lock:
+            for p in self.phases:
+                s, n = agg.get(p["name"], (0.0, 0))
+                agg[p["name"]] = (s + p["seconds"], n + 1)
+        return sorted(((k, s, n) for k, (s, n) in agg.items()), key=lambda x: -x[1])
+
+    def summary(self, top: int = 4) -> str:
+        total = self.seconds if self.seconds is not None else time.perf_counter() - self.started
+        parts = [f"{name} {_fmt(s)}" + (f"×{n}" if n > 1 else "") for name, s, n in self.totals()[:top]]
+        return f"소요 {_fmt(total)}" + (f" ({', '.join(parts)})" if parts else "")
+
+    def finish(self, **fields) -> dict:
+        self.seconds = time.perf_counter() - self.started
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.profile_path = self._dump_profile()
+        record = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "op": self.op,
+            "seconds": round(self.seconds, 6),
+            "version": __version__,
+            "totals": [{"name": k, "seconds": round(s, 6), "count": n} for k, s, n in self.totals()],
+            "phases": self.phases[:200],
+            **fields,
+        }
+        if self.profile_path:
+            record["profile"] = self.profile_path
+        try:
+            _perf_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+        except Exception:
+            pass
+        return record
+
+    def _dump_profile(self):
+        import pstats
+        try:
+            path = os.path.join(CACHE_DIR, f"profile_{self.op}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof")
+            buf = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=buf)
+            with self._lock:
+                for prof in self._workers:
+                    stats.add(prof)
+            stats.dump_stats(path)
+            stats.sort_stats("cumulative").print_stats(60)
+            with open(path[:-5] + ".txt", "w", encoding="utf-8") as fp:
+                fp.write(buf.getvalue())
+            return path
+        except Exception:
+            return None
+
+class _NoTrace:
+    """trace 인자를 생략했을 때 쓰는 아무 일도 하지 않는 Trace."""
+
+    def add(self, name: str, seconds: float, **fields):
+        pass
+
+    @contextmanager
+    def phase(self, name: str, **fields):
+        yield fields
+
+    @contextmanager
+    def worker(self):
+        yield
+
+NO_TRACE = _NoTrace()
+
+def _fmt(seconds: float) -> str:
+    return f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.1f}s"
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+동기화 때 미리 계산해 두는 업체별 집계.
+
+  daily     : place_id, day, posts                          (업체·날짜별 글 수)
+  companies : place_id, company_name, first, last, posts     (업체별 첫/마지막 발행일, 전체 글 수)
+
+보통은 중복 글을 뺀 df_all(merge_tables 결과 표)로 계산해 표·엑셀과 같은 행을 센다 (source "snapshot").
+이때도 행마다 남은 원본 shard(SNAPSHOT_SHARD_COL)별로 나눠 snap-* 파일로 두고, 다음 동기화에서는 다시 읽은 shard와
+중복 제거로 행 수가 달라진 shard만 다시 계산한다.
+lazy 엔진은 shard 파일을 그대로 보여 주므로 shard마다 계산해 ROLLUP_DIR에 두고(파일 크기·수정 시각이 같으면
+다시 쓰지 않음) 합친다 (source "shards"). 합친 결과는 어느 쪽이든 저장하고, 기간별 요약 조회는 이 표만 읽는다.
+"""
+import os, json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .config import ROLLUP_DIR, ROLLUP_VERSION, SNAPSHOT_SHARD_COL
+from .cache import file_key
+from .helpers import sanitize_component
+from .perf import NO_TRACE
+
+ROLLUP_COLS = ["place_id", "company_name", "pub_date"]
+
+def _codes(col):
+    """dictionary 컬럼은 (정수 코드, dictionary)로 나눠 문자열을 풀지 않고 묶는다. 그 밖에는 (컬럼, None)."""
+    if not pa.types.is_dictionary(col.type):
+        return col, None
+    col = pa.table({"c": col}).unify_dictionaries()["c"]
+    values = col.chunk(0).dictionary if col.num_chunks else pa.array([], col.type.value_type)
+    return pa.chunked_array([c.indices for c in col.chunks], col.type.index_type), values
+
+def _values(col, values):
+    col = col if values is None else values.take(col)
+    return col.to_pandas().astype("string")
+
+def shard_rollup(table):
+    """Arrow 표(read_shard로 읽은 shard 또는 merge_tables 결과)의 (daily, companies).
+    Arrow group_by로 집계하고 작은 결과만 pandas로 바꾼다. dictionary 컬럼은 코드로 묶고 결과만 값으로 바꾼다."""
+    n = table.num_rows
+    cols = table.column_names
+    pid, pid_values = _codes(table["place_id"])
+    name, name_values = _codes(table["company_name"]) if "company_name" in cols else (pa.nulls(n, pa.large_string()), None)
+    frame = pa.table({
+        "place_id": pid,
+        "company_name": name,
+        "pub_date": table["pub_date"] if "pub_date" in cols else pa.nulls(n, pa.timestamp("us")),
+    })
+    frame = frame.filter(pc.is_valid(frame["place_id"]))
+    dated = frame.filter(pc.is_valid(frame["pub_date"]))
+    daily = (pa.table({"place_id": dated["place_id"], "day": pc.floor_temporal(dated["pub_date"], unit="day")})
+             .group_by(["place_id", "day"]).aggregate([([], "count_all")]))
+    companies = frame.group_by("place_id", use_threads=False).aggregate(
+        [("company_name", "last"), ("pub_date", "min"), ("pub_date", "max"), ([], "count_all")])
+    daily = pd.DataFrame({"place_id": _values(daily["place_id"], pid_values), "day": daily["day"].to_pandas(),
+                          "posts": daily["count_all"].to_pandas()})
+    companies = pd.DataFrame({"place_id": _values(companies["place_id"], pid_values),
+                              "company_name": _values(companies["company_name_last"], name_values),
+                              "first": companies["pub_date_min"].to_pandas(), "last": companies["pub_date_max"].to_pandas(),
+                              "posts": companies["count_all"].to_pandas()})
+    return daily, companies
+
+def _sum_daily(d):
+    """(place_id, day)가 같은 행의 posts를 더하고 업체·날짜 순으로 정렬한다.
+    업체 순번과 날짜를 정수 키 하나로 묶어 문자열 groupby·정렬 없이 np.unique 한 번으로 끝낸다."""
+    codes, ids = pd.factorize(d["place_id"], sort=True)
+    days = d["day"].to_numpy("datetime64[D]").view(np.int64)
+    lo = days.min()
+    span = days.max() - lo + 1
+    keys, inv = np.unique(codes.astype(np.int64) * span + (days - lo), return_inverse=True)
+    posts = np.bincount(inv, weights=d["posts"].to_numpy(np.float64), minlength=len(keys)).astype(np.int64)
+    return pd.DataFrame({"place_id": ids.take(keys // span),
+                         "day": (keys % span + lo).astype("datetime64[D]").astype(d["day"].dtype), "posts": posts})
+
+def combine(parts):
+    """shard별 (daily, companies)를 합친다. 같은 업체·날짜가 여러 shard에 있으면 더한다."""
+    dailies = [d for d, _ in parts if len(d)]
+    comps = [c for _, c in parts if len(c)]
+    if dailies:
+        daily = _sum_daily(pd.concat(dailies, ignore_index=True))
+    else:
+        daily = pd.DataFrame({"place_id": pd.Series(dtype="string"), "day": pd.Series(dtype="datetime64[ns]"),
+                              "posts": pd.Series(dtype="int64")})
+    if comps:
+        companies = pd.concat(comps, ignore_index=True).groupby("place_id", observed=True).agg(
+            company_name=("company_name", "last"), first=("first", "min"), last=("last", "max"),
+            posts=("posts", "sum")).reset_index()
+    else:
+        companies = pd.DataFrame(columns=["place_id", "company_name", "first", "last", "posts"])
+    return daily, companies
+
+def _read_meta(path: str) -> dict:
+    try:
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as fp:
+            meta = json.load(fp)
+        return meta if meta.get("version") == ROLLUP_VERSION else {}
+    except:
+        return {}
+
+def _read_local(local: str):
+    from .sync import read_shard
+    return read_shard(local, ROLLUP_COLS)
+
+def _save(path: str, daily, companies, source: str, shards=None, groups=None):
+    """합친 집계와 meta를 쓴다. shards(lazy용 shard 파일별)·groups(스냅샷 shard별) 기록은 None이면 지난 값을 둔다."""
+    old = _read_meta(path)
+    daily.to_parquet(os.path.join(path, "daily.parquet.tmp"), index=False)
+    companies.to_parquet(os.path.join(path, "companies.parquet.tmp"), index=False)
+    os.replace(os.path.join(path, "daily.parquet.tmp"), os.path.join(path, "daily.parquet"))
+    os.replace(os.path.join(path, "companies.parquet.tmp"), os.path.join(path, "companies.parquet"))
+    meta = {"version": ROLLUP_VERSION, "source": source,
+            "shards": old.get("shards", {}) if shards is None else shards,
+            "groups": old.get("groups", {}) if groups is None else groups,
+            "saved_at": datetime.now().isoformat(timespec="seconds")}
+    with open(os.path.join(path, "meta.json.tmp"), "w", encoding="utf-8") as fp:
+        json.dump(meta, fp, ensure_ascii=False, indent=2)
+    os.replace(os.path.join(path, "meta.json.tmp"), os.path.join(path, "meta.json"))
+
+def _read_part(stem: str):
+    try:
+        return pd.read_parquet(stem + ".daily.parquet"), pd.read_parquet(stem + ".companies.parquet")
+    except Exception:
+        return None
+
+def _write_part(stem: str, part):
+    part[0].to_parquet(stem + ".daily.parquet", index=False)
+    part[1].to_parquet(stem + ".companies.parquet", index=False)
+
+def _cleanup(path: str, prefix: str, names):
+    live = {f"{prefix}{sanitize_component(n)}.{kind}.parquet" for n in names for kind in ("daily", "companies")}
+    for f in os.listdir(path):
+        if f.startswith(prefix) and f not in live:
+            try:
+                os.remove(os.path.join(path, f))
+            except OSError:
+                pass
+
+class Rollups:
+    """업체별 집계 표. 기간·업체 조건 요약은 daily/companies만으로 계산한다."""
+
+    def __init__(self, daily: pd.DataFrame, companies: pd.DataFrame):
+        self.daily = daily
+        self.companies = companies
+        self._names = dict(zip(companies["place_id"].astype(str), companies["company_name"]))
+        keys = daily["place_id"].astype(str).to_numpy()
+        codes, uniques = pd.factorize(keys)
+        bounds = np.flatnonzero(codes[1:] != codes[:-1]) + 1 if len(codes) else np.empty(0, dtype=np.int64)
+        starts = np.r_[0, bounds] if len(codes) else bounds
+        ends = np.r_[bounds, len(codes)] if len(codes) else bounds
+        self._ranges = {uniques[codes[a]]: (a, b) for a, b in zip(starts.tolist(), ends.tolist())}
+        self._days = daily["day"].to_numpy("datetime64[ns]")
+
+    @property
+    def empty(self) -> bool:
+        return self.companies.empty
+
+    @classmethod
+    def from_table(cls, table, path: str = ROLLUP_DIR, trace=NO_TRACE, keys=None, changed=()):
+        """중복을 뺀 합친 표(merge_tables 결과 또는 스냅샷 표)로 집계하고 저장한다. (Rollups, 다시 계산한 shard 수).
+        SNAPSHOT_SHARD_COL이 있으면 원본 shard별로 집계해 두고, 지난번과 파일(keys: 이름 → file_key)·행 수가 같고
+        changed(이번에 다시 읽은 shard)가 아닌 shard는 저장된 집계를 쓴다. 다시 읽지 않은 shard는 중복 제거로 행이 빠지기만
+        하므로 행 수가 같으면 행도 같다. shard별 집계 파일(lazy용)은 그대로 둔다."""
+        os.makedirs(path, exist_ok=True)
+        if SNAPSHOT_SHARD_COL not in table.column_names:
+            with trace.phase("rollup_table", rows=table.num_rows):
+                daily, companies = combine([shard_rollup(table)])
+            _save(path, daily, companies, "snapshot", groups={})
+            _cleanup(path, "snap-", [])
+            return cls(daily, companies), 1
+        old, keys, changed = _read_meta(path).get("groups", {}), keys or {}, set(changed)
+        idx, names = _codes(table[SNAPSHOT_SHARD_COL])
+        idx = pc.fill_null(idx, -1).to_numpy().astype(np.int64)
+        names = names.to_pylist()
+        counts = np.bincount(idx[idx >= 0], minlength=len(names))
+        groups, parts, todo = {}, {}, []
+        for i, name in enumerate(names):
+            if not counts[i]:
+                continue
+            groups[name] = {"file": keys.get(name), "rows": int(counts[i])}
+            if name not in changed and groups[name]["file"] is not None and old.get(name) == groups[name]:
+                parts[name] = _read_part(os.path.join(path, "snap-" + sanitize_component(name)))
+            if parts.get(name) is None:
+                todo.append(i)
+        if todo:
+            with trace.phase("rollup_table", rows=int(counts[todo].sum()), shards=len(todo)):
+                # 다시 계산할 shard의 행만 shard 순으로 모은다 (안정 정렬이라 shard 안에서는 업체·날짜 순 그대로)
+                rows = np.flatnonzero(np.isin(idx, todo))
+                rows = rows[np.argsort(idx[rows], kind="stable")]
+                sub = table.select([c for c in ROLLUP_COLS if c in table.column_names]).take(rows)
+                start = 0
+                for i in todo:
+                    part = shard_rollup(sub.slice(start, int(counts[i])))
+                    _write_part(os.path.join(path, "snap-" + sanitize_component(names[i])), part)
+                    parts[names[i]] = part
+                    start += int(counts[i])
+        with trace.phase("rollup_combine"):
+            daily, companies = combine([parts[n] for n in names if n in parts])
+        _save(path, daily, companies, "snapshot", groups=groups)
+        _cleanup(path, "snap-", groups)
+        return cls(daily, companies), len(todo)
+
+    @classmethod
+    def build(cls, shards, path: str = ROLLUP_DIR, trace=NO_TRACE):
+        """lazy 엔진용. shards: (이름, 로컬 파일 경로, 읽어 둔 Arrow 표 또는 None) 목록.
+        지난번과 파일이 같은 shard는 저장된 집계를 쓰고, 바뀐 shard만 다시 계산한다. (Rollups, 다시 계산한 shard 수)."""
+        os.makedirs(path, exist_ok=True)
+        old = _read_meta(path).get("shards", {})
+        keep, parts, rebuilt = {}, [], 0
+        for name, local, table in shards:
+            key = file_key(local)
+            stem = os.path.join(path, "shard-" + sanitize_component(name))
+            part = _read_part(stem) if old.get(name) == key else None
+            if part is None:
+                with trace.phase("rollup_shard", shard=name):
+                    part = shard_rollup(table if table is not None else _read_local(local))
+                    _write_part(stem, part)
+                rebuilt += 1
+            keep[name] = key
+            parts.append(part)
+        with trace.phase("rollup_combine"):
+            daily, companies = combine(parts)
+        _save(path, daily, companies, "shards", shards=keep)
+        _cleanup(path, "shard-", keep)
+        return cls(daily, companies), rebuilt
+
+    @classmethod
+    def load(cls, path: str = ROLLUP_DIR, source: str | None = None):
+        """저장된 합친 집계. 없거나 버전(또는 주어진 source)이 다르면 None."""
+        meta = _read_meta(path)
+        if not meta or (source is not None and meta.get("source") != source):
+            return None
+        try:
+            return cls(pd.read_parquet(os.path.join(path, "daily.parquet")),
+                       pd.read_parquet(os.path.join(path, "companies.parquet")))
+        except Exception:
+            return None
+
+    def _slice(self, ids=None, sdt=None, edt=None) -> pd.DataFrame:
+        """daily에서 ids(없으면 전체)·기간에 해당하는 행. 업체마다 searchsorted로 자른다."""
+        keys = self._ranges if not ids else [str(i) for i in ids]
+        lo_key = np.datetime64(pd.Timestamp(sdt), "ns") if sdt is not None else None
+        hi_key = np.datetime64(pd.Timestamp(edt), "ns") if edt is not None else None
+        parts = []
+        for pid in keys:
+            r = self._ranges.get(pid)
+            if not r:
+                continue
+            a, b = r
+            seg = self._days[a:b]
+            lo = a + int(np.searchsorted(seg, lo_key, "left")) if lo_key is not None else a
+            hi = a + int(np.searchsorted(seg, hi_key, "right")) if hi_key is not None else b
+            if hi > lo:
+                parts.append(np.arange(lo, hi))
+        rows = np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+        return self.daily.take(np.sort(rows))
+
+    def periods(self, ids=None, sdt=None, edt=None, freq: str = "D") -> pd.DataFrame:
+        """업체 × 기간(D 일, W ISO 주, M 월)별 글 수."""
+        d = self._slice(ids, sdt, edt)
+        day = d["day"]
+        if freq == "M":
+            period = day.dt.strftime("%Y-%m")
+        elif freq == "W":
+            iso = day.dt.isocalendar()
+            period = iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)
+        else:
+            period = day.dt.strftime("%Y-%m-%d")
+        out = (pd.DataFrame({"place_id": d["place_id"].astype(str), "period": period, "posts": d["posts"]})
+               .groupby(["place_id", "period"], sort=True)["posts"].sum().reset_index())
+        out.insert(1, "company_name", out["place_id"].map(self._names))
+        return out
+
+    def totals(self, ids=None, sdt=None, edt=None) -> pd.DataFrame:
+        """업체별 글 수와 첫/마지막 발행일. 기간이 없으면 전체(발행일 없는 글 포함) 기준."""
+        if sdt is None and edt is None:
+            c = self.companies
+            if ids:
+                c = c[c["place_id"].astype(str).isin({str(i) for i in ids})]
+            out = pd.DataFrame({"place_id": c["place_id"].astype(str), "company_name": c["company_name"],
+                                "posts": c["posts"], "first": pd.to_datetime(c["first"]).dt.strftime("%Y-%m-%d"),
+                                "last": pd.to_datetime(c["last"]).dt.strftime("%Y-%m-%d")})
+        else:
+            d = self._slice(ids, sdt, edt)
+            out = d.assign(place_id=d["place_id"].astype(str)).groupby("place_id").agg(
+                posts=("posts", "sum"), first=("day", "min"), last=("day", "max")).reset_index()
+            out["first"] = out["first"].dt.strftime("%Y-%m-%d")
+            out["last"] = out["last"].dt.strftime("%Y-%m-%d")
+            out.insert(1, "company_name", out["place_id"].map(self._names))
+        return out.sort_values("place_id", ignore_index=True)[["place_id", "company_name", "posts", "first", "last"]]
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+import os, json, unicodedata
+from bisect import bisect_left
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .config import SEARCH_LIMIT, TITLE_INDEX_DIR, TITLE_INDEX_VERSION, TITLE_INDEX_MAX_SEGMENTS
+
+def normalize(text) -> str:
+    """검색용 정규화: NFC(맥에서 온 자모 분리 한글 포함) + casefold."""
+    return unicodedata.normalize("NFC", str(text)).casefold()
+
+def char_grams(text: str) -> set:
+    """글자 하나짜리와 두 글자짜리 조각. 공백도 한 글자로 본다."""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+class CompanySearch:
+    """입력 중 업체 찾기용 색인. 동기화 때 한 번 만든다.
+    업체ID는 정렬된 목록에서 앞부분 일치를 이분 탐색으로, 업체명은 글자/두 글자 조각 → 업체 위치 목록으로
+    후보를 좁힌 다음 부분 문자열인지 확인한다."""
+
+    def __init__(self, companies):
+        pairs = sorted((str(pid), "" if name is None else str(name)) for pid, name in companies)
+        self.ids = [p for p, _ in pairs]
+        self.names = [n for _, n in pairs]
+        self._norm = [normalize(n) for n in self.names]
+        self._known = set(self.ids)
+        grams = {}
+        for i, name in enumerate(self._norm):
+            for g in char_grams(name):
+                grams.setdefault(g, []).append(i)
+        self._grams = {g: np.asarray(v, dtype=np.int32) for g, v in grams.items()}
+
+    @classmethod
+    def from_index(cls, index):
+        """PlaceIndex/LazyEngine에서 (place_id, company_name) 목록을 받아 만든다."""
+        names = dict(index.companies(index.all_ids)) if "company_name" in index.columns else {}
+        return cls((pid, names.get(pid)) for pid in index.all_ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def has(self, pid) -> bool:
+        return str(pid) in self._known
+
+    def _by_id(self, q: str) -> range:
+        lo = bisect_left(self.ids, q)
+        hi = bisect_left(self.ids, q + "\U0010ffff", lo)
+        return range(lo, hi)
+
+    def _by_name(self, q: str):
+        q = normalize(q)
+        keys = [q] if len(q) == 1 else [q[i:i + 2] for i in range(len(q) - 1)]
+        posts = [self._grams.get(k) for k in keys]
+        if any(p is None for p in posts):
+            return []
+        posts.sort(key=len)
+        cand = posts[0]
+        for p in posts[1:]:
+            cand = np.intersect1d(cand, p, assume_unique=True)
+            if not len(cand):
+                return []
+        if len(q) <= 2:
+            return cand.tolist()
+        return [i for i in cand.tolist() if q in self._norm[i]]
+
+    def search(self, text: str, limit: int | None = SEARCH_LIMIT) -> list:
+        """업체ID 앞부분이 맞는 업체를 먼저, 그다음 업체명에 text가 들어 있는 업체를 (place_id, company_name)으로."""
+        q = text.strip()
+        if not q:
+            return []
+        seen, out = set(), []
+        by_id = self._by_id(q)
+        if limit is not None:
+            by_id = by_id[:limit]
+        for i in list(by_id) + self._by_name(q):
+            if i not in seen:
+                seen.add(i)
+                out.append((self.ids[i], self.names[i]))
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
+
+_EMPTY_IDS = np.empty(0, dtype=np.int32)
+
+def _normalize_all(texts: list) -> list:
+    """normalize()를 제목마다 부르지 않고 한 번에. \\x00이 없는 제목만 온다."""
+    if not texts:
+        return []
+    out = normalize("\x00".join(texts)).split("\x00")
+    return out if len(out) == len(texts) else [normalize(t) for t in texts]
+
+def _gram_key(a: str, b: str = "\x00") -> np.uint64:
+    return np.uint64((ord(a) << 32) | (ord(b) if b else 0))
+
+def bigram_postings(texts: list, base: int = 0):
+    """정규화된 제목 목록의 (두 글자 키, 제목 번호) 색인을 CSR(keys, offsets, ids)로 만든다.
+    키는 앞 글자 << 32 | 뒤 글자. 제목 끝 글자는 (글자, 0)으로 넣어 한 글자 검색도 키 범위 하나로 끝난다."""
+    if not texts:
+        return np.empty(0, dtype=np.uint64), np.zeros(1, dtype=np.int64), _EMPTY_IDS
+    c = np.frombuffer(("\x00".join(texts) + "\x00").encode("utf-32-le"), dtype=np.uint32)
+    lens = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    tid = np.repeat(np.arange(base, base + len(texts), dtype=np.int32), lens + 1)
+    ok = c[:-1] != 0
+    keys = (c[:-1][ok].astype(np.uint64) << np.uint64(32)) | c[1:][ok].astype(np.uint64)
+    ids = tid[:-1][ok]
+    order = np.argsort(keys, kind="stable")  # ids는 이미 오름차순이라 같은 키 안에서도 정렬된다
+    keys, ids = keys[order], ids[order]
+    new_key = np.r_[True, keys[1:] != keys[:-1]]
+    keep = new_key | np.r_[True, ids[1:] != ids[:-1]]
+    keys, ids, new_key = keys[keep], ids[keep], new_key[keep]
+    starts = np.flatnonzero(new_key)
+    return keys[starts], np.r_[starts, len(keys)].astype(np.int64), ids
+
+class TitleIndex:
+    """포스팅제목 전문 검색 색인. 서로 다른 제목마다 번호를 주고 두 글자 조각 → 제목 번호 목록을 segment로 쌓는다.
+    동기화 때는 처음 보는 제목만 새 segment로 색인해 TITLE_INDEX_DIR에 덧붙여 저장하고,
+    행 → 제목 번호(codes)는 현재 df에 붙일 때마다 새로 계산하므로 행 순서가 바뀌어도 색인은 그대로 쓴다."""
+
+    def __init__(self):
+        self.titles = []
+        self._norm = []
+        self.segments = []
+        self.codes = None
+        self.rows = 0
+        self._files = []
+        self._sizes = []
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def _add(self, titles: list):
+        titles = [t for t in titles if "\x00" not in t]
+        if not titles:
+            return
+        norm = _normalize_all(titles)
+        self.segments.append(bigram_postings(norm, base=len(self.titles)))
+        self._files.append(None)
+        self._sizes.append(len(titles))
+        self.titles.extend(titles)
+        self._norm.extend(norm)
+
+    def _rebuild(self, titles: list):
+        self.titles, self._norm, self.segments, self._files, self._sizes = [], [], [], [], []
+        self._add(titles)
+
+    def attach(self, titles) -> int:
+        """현재 데이터의 title 열과 연결한다. 처음 보는 제목은 새 segment로 색인하고 그 수를 돌려준다."""
+        codes, uniques = pd.factorize(pd.Series(titles), use_na_sentinel=True)
+        uniques = pd.Index(uniques).astype(str)
+        gid = pd.Index(self.titles).get_indexer(uniques) if self.titles else np.full(len(uniques), -1)
+        new = uniques[gid < 0].tolist()
+        if len(self.titles) + len(new) > 2 * len(uniques) + 1000 or len(self.segments) >= TITLE_INDEX_MAX_SEGMENTS:
+            # 더는 없는 제목이 너무 많이 쌓였거나 segment가 많으면 지금 있는 제목만으로 다시 만든다
+            self._rebuild(uniques.tolist())
+            gid = pd.Index(self.titles).get_indexer(uniques)
+        else:
+            miss, base = np.flatnonzero(gid < 0), len(self.titles)
+            self._add(new)
+            if len(self.titles) - base == len(miss):
+                gid[miss] = np.arange(base, len(self.titles))
+            else:
+                gid = pd.Index(self.titles).get_indexer(uniques)
+        self.codes = np.r_[gid, -1].astype(np.int32)[codes]
+        self.rows = len(self.codes)
+        return len(new)
+
+    def _segment_match(self, seg, q: str) -> np.ndarray:
+        keys, offsets, ids = seg
+        if len(q) == 1:
+            lo = np.searchsorted(keys, _gram_key(q))
+            hi = np.searchsorted(keys, np.uint64((ord(q) + 1) << 32))
+            return np.unique(ids[offsets[lo]:offsets[hi]])
+        posts = []
+        for g in {q[i:i + 2] for i in range(len(q) - 1)}:
+            k = _gram_key(g[0], g[1])
+            j = int(np.searchsorted(keys, k))
+            if j >= len(keys) or keys[j] != k:
+                return _EMPTY_IDS
+            posts.append(ids[offsets[j]:offsets[j + 1]])
+        posts.sort(key=len)
+        cand = posts[0]
+        for p in posts[1:]:
+            cand = np.intersect1d(cand, p, assume_unique=True)
+            if not len(cand):
+                break
+        return cand
+
+    def match(self, text: str) -> np.ndarray:
+        """text가 들어 있는 제목 번호(정렬됨)."""
+        q = normalize(text.strip())
+        if not q or "\x00" in q:
+            return _EMPTY_IDS
+        parts = [self._segment_match(seg, q) for seg in self.segments]
+        cand = np.concatenate(parts) if parts else _EMPTY_IDS
+        if len(q) > 2 and len(cand):
+            cand = cand[np.fromiter((q in self._norm[i] for i in cand.tolist()), dtype=bool, count=len(cand))]
+        return cand
+
+    def row_mask(self, text: str, rows: np.ndarray) -> np.ndarray:
+        """attach한 df의 행 위치 rows 중 제목에 text가 들어 있는 행의 bool mask."""
+        hit = np.zeros(len(self.titles) + 1, dtype=bool)
+        hit[self.match(text)] = True
+        return hit[self.codes[rows]]
+
+    def save(self, path: str = TITLE_INDEX_DIR):
+        """새로 만든 segment만 파일로 쓰고 meta를 바꾼다. meta에 없는 이전 segment 파일은 지운다."""
+        os.makedirs(path, exist_ok=True)
+        base = 0
+        for i, (seg, name, count) in enumerate(zip(self.segments, self._files, self._sizes)):
+            if name is None:
+                name = f"seg-{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{i}.npz"
+                blob = np.frombuffer("\x00".join(self.titles[base:base + count]).encode("utf-8"), dtype=np.uint8)
+                keys, offsets, ids = seg
+                with open(os.path.join(path, name + ".tmp"), "wb") as fp:
+                    np.savez(fp, keys=keys, offsets=offsets, ids=ids, blob=blob, count=np.int64(count))
+                os.replace(os.path.join(path, name + ".tmp"), os.path.join(path, name))
+                self._files[i] = name
+            base += count
+        meta = {"version": TITLE_INDEX_VERSION, "titles": len(self.titles), "segments": self._files,
+                "saved_at": datetime.now().isoformat(timespec="seconds")}
+        tmp = os.path.join(path, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(meta, fp, ensure_ascii=False, indent=2)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+        for old in os.listdir(path):
+            if old.startswith("seg-") and old not in self._files:
+                try:
+                    os.remove(os.path.join(path, old))
+                except OSError:
+                    pass
+
+    @classmethod
+    def load(cls, path: str = TITLE_INDEX_DIR):
+        """저장된 색인을 읽는다. 없거나 버전이 다르거나 깨졌으면 빈 색인."""
+        self = cls()
+        try:
+            with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as fp:
+                meta = json.load(fp)
+            if meta.get("version") != TITLE_INDEX_VERSION:
+                return self
+            for name in meta.get("segments", []):
+                with np.load(os.path.join(path, name)) as z:
+                    count = int(z["count"])
+                    titles = z["blob"].tobytes().decode("utf-8").split("\x00") if count else []
+                    if len(titles) != count:
+                        return cls()
+                    self.segments.append((z["keys"], z["offsets"], z["ids"]))
+                self._files.append(name)
+                self._sizes.append(count)
+                self.titles.extend(titles)
+            if len(self.titles) != meta.get("titles"):
+                return cls()
+            self._norm = _normalize_all(self.titles)
+        except Exception:
+            return cls()
+        return self
+
+def title_mask(df, text: str) -> np.ndarray:
+    """색인 없이 df의 제목에 text가 들어 있는지 (지연 조회·스트리밍용)."""
+    q = normalize(text.strip())
+    return df["title"].fillna("").map(normalize).str.contains(q, regex=False).to_numpy(dtype=bool)
+
+def select_titles(index, titles, text: str, ids=None, sdt=None, edt=None):
+    """제목에 text가 들어 있는 행을 업체ID·기간 조건과 함께 고른다. ids가 비어 있으면 모든 업체.
+    titles(TitleIndex)가 index.df에 붙어 있지 않으면(지연 조회 등) 조회 결과 안에서 문자열로 찾는다."""
+    ids = list(ids) if ids else list(index.all_ids)
+    if titles is None or titles.codes is None or getattr(index, "df", None) is None or titles.rows != len(index.df):
+        df = index.select(ids, sdt, edt)
+        if df.empty or "title" not in df.columns:
+            return df
+        return df[title_mask(df, text)]
+    rows = index.row_positions(ids, sdt, edt)
+    return index.df.take(rows[titles.row_mask(text, rows)])
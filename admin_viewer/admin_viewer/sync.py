@@ -0,0 +1,558 @@
+# -*- coding: utf-8 -*-
+import os, time, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .config import CACHE_DIR, DEFAULT_VIEW_COLS, DOWNLOAD_WORKERS, CATEGORY_COLS, ARROW_STRING_COLS, SNAPSHOT_SHARD_COL
+from .helpers import is_url
+from .drive import (drive_download_url, extract_drive_file_id, file_matches, make_session, stream_download, DownloadCancelled,
+                    DownloadError)
+from .cache import (CacheIndex, ManifestCache, file_key, manifest_fingerprint, load_snapshot_table, save_snapshot,
+                    table_to_frame, update_snapshot_meta)
+from .index import PlaceIndex
+from .perf import Trace, NO_TRACE
+
+class SyncError(Exception):
+    def __init__(self, message: str, level: str = "error"):
+        super().__init__(message)
+        self.level = level
+
+class SyncCancelled(Exception):
+    pass
+
+def extract_manifest_id(payload: dict):
+    if not isinstance(payload, dict):
+        return None
+    for k in ("manifest_file_id", "manifest_id", "file_id", "id"):
+        if isinstance(payload.get(k), str) and payload[k].strip():
+            return payload[k].strip()
+    data = payload.get("data", {})
+    if isinstance(data, dict):
+        for k in ("manifest_file_id", "manifest_id", "file_id", "id"):
+            if isinstance(data.get(k), str) and data[k].strip():
+                return data[k].strip()
+    return None
+
+def _get_json(session, url: str, trace=NO_TRACE, check: bool = False, cache=None):
+    """cache(ManifestCache)에 지난 응답이 있으면 조건부 요청을 보내고, 304면 그 본문을 쓴다."""
+    with trace.phase("manifest_request", url=url) as f:
+        resp = session.get(url, headers=cache.validators(url) if cache else None, timeout=60)
+        if resp.status_code == 304 and cache is not None and cache.body(url) is not None:
+            f["not_modified"] = True
+            return cache.body(url)
+        if check:
+            resp.raise_for_status()
+        payload = resp.json()
+    if cache is not None:
+        cache.store(url, payload, resp.headers)
+    return payload
+
+def resolve_manifest(raw: str, session, trace=NO_TRACE, cache=None) -> dict:
+    """API 주소·Drive 링크·manifest id에서 manifest를 얻는다. cache가 있으면 조건부 요청으로 받고 결과를 기억한다."""
+    mid = None
+    if is_url(raw):
+        mid = extract_drive_file_id(raw)
+        if not mid:
+            payload = _get_json(session, raw, trace, True, cache)
+            if isinstance(payload, dict) and "files" in payload:
+                manifest = payload
+            else:
+                mid = extract_manifest_id(payload)
+                if not mid:
+                    raise ValueError("API 응답에서 manifest_file_id를 찾지 못했습니다.")
+        if mid:
+            manifest = _get_json(session, drive_download_url(mid), trace, cache=cache)
+    else:
+        mid = raw
+        manifest = _get_json(session, drive_download_url(raw), trace, cache=cache)
+    if cache is not None and isinstance(manifest, dict) and manifest.get("files"):
+        cache.remember(raw, mid, manifest)
+    return manifest
+
+def arrow_dates(col):
+    """pub_date를 timestamp[us]로. ISO 문자열은 Arrow에서 바로 바꾸고, 못 읽는 값이 섞여 있으면 pandas(errors=coerce)로 읽는다."""
+    t = col.type
+    if not pa.types.is_timestamp(t) and not pa.types.is_date(t):
+        try:
+            col = pc.cast(col, pa.timestamp("us"))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            col = pa.chunked_array([pa.Array.from_pandas(pd.to_datetime(col.to_pandas(), errors="coerce"))])
+        t = col.type
+    target = pa.timestamp("us", getattr(t, "tz", None))
+    return col if t == target else col.cast(target, safe=False)
+
+def conform(table):
+    """view 컬럼만 DEFAULT_VIEW_COLS 순서로 남기고 shard마다 다를 수 있는 타입을 맞춘다.
+    문자열 컬럼(dictionary·숫자 ID 포함)은 large_string, pub_date는 timestamp[us]. 스냅샷의 SNAPSHOT_SHARD_COL은 맨 뒤에 그대로 둔다."""
+    cols, names = [], []
+    for c in DEFAULT_VIEW_COLS:
+        if c not in table.column_names:
+            continue
+        col = table[c]
+        if c == "pub_date":
+            col = arrow_dates(col)
+        elif c in CATEGORY_COLS + ARROW_STRING_COLS and col.type != pa.large_string():
+            col = col.cast(pa.large_string())
+        cols.append(col)
+        names.append(c)
+    if SNAPSHOT_SHARD_COL in table.column_names:
+        cols.append(table[SNAPSHOT_SHARD_COL])
+        names.append(SNAPSHOT_SHARD_COL)
+    return pa.table(cols, names=names)
+
+def read_shard(path: str, columns=DEFAULT_VIEW_COLS):
+    """shard에서 columns만 여러 스레드로 읽어 conform한 Arrow 표."""
+    import pyarrow.parquet as pq
+    names = pq.read_schema(path).names
+    return conform(pq.read_table(path, columns=[c for c in columns if c in names], use_threads=True))
+
+def sorted_codes(col):
+    """정렬된 고유값과 행마다의 순번(null은 -1). 해시 조회 한 번으로 정렬·중복 제거·dictionary 코드에 같이 쓴다.
+    dictionary가 값 순서라 pandas category를 코드로 정렬해도 가나다(문자열) 순이 된다."""
+    values = pc.drop_null(pc.unique(col))
+    values = values.take(pc.sort_indices(values))
+    return values, pc.fill_null(pc.index_in(col, value_set=values), -1).to_numpy()
+
+def last_posts(codes, urls, ranks=None):
+    """(place_id, post_url)이 같은 글 중 마지막 행만 True인 mask. post_url은 해시 한 번으로 정수 코드로 바꿔 비교하고,
+    post_url이 없는 글은 모두 남긴다. 겹치는 글이 없으면 None.
+    ranks(행마다 shard 순번)가 있으면 행 위치보다 shard 순번이 먼저다 — 뒤 shard의 글이 남는다."""
+    enc = pc.dictionary_encode(urls)
+    if not enc.num_chunks or len(enc.chunk(0).dictionary) == len(urls) - urls.null_count:
+        return None
+    url = pc.fill_null(pa.chunked_array([c.indices for c in enc.chunks]), -1).to_numpy().astype(np.int64)
+    key = codes.astype(np.int64) * (len(enc.chunk(0).dictionary) + 1) + url
+    n = len(key)
+    prio = np.arange(n, dtype=np.int64) if ranks is None else ranks.astype(np.int64) * n + np.arange(n)
+    last = pa.table({"key": key, "prio": prio}).group_by("key").aggregate([("prio", "max")])["prio_max"]
+    keep = url < 0
+    keep[last.to_numpy() % n] = True
+    return None if keep.all() else keep
+
+def sort_order(codes, dates=None):
+    """(place_id 순번, pub_date) 순 행 번호, NaT는 업체 구간 맨 앞 — index.sort_layout과 같은 배치 (안정 정렬)."""
+    if dates is None:
+        return np.argsort(codes, kind="stable")
+    return np.lexsort((pc.fill_null(dates.cast(pa.int64()), np.iinfo(np.int64).min).to_numpy(), codes))
+
+def compact_table(table, values=None, codes=None):
+    """place_id/company_name을 값 순으로 정렬된 dictionary로 바꾼다 (pandas에서는 category, 헤더 정렬이 가나다 순).
+    sorted_codes 결과가 있으면 place_id는 그대로 코드로 쓴다."""
+    for c in CATEGORY_COLS:
+        if c not in table.column_names:
+            continue
+        v, k = (values, codes) if c == "place_id" and codes is not None else sorted_codes(table[c])
+        col = pa.DictionaryArray.from_arrays(pa.array(k.astype(np.int32), mask=k < 0), v)
+        table = table.set_column(table.column_names.index(c), c, col)
+    return table.unify_dictionaries()
+
+def _shard_column(ranks, order):
+    return pa.DictionaryArray.from_arrays(pa.array(ranks, pa.int32()), pa.array(order, pa.large_string()))
+
+def tag_shards(tables: dict, order, base=None):
+    """shard별 표에 원본 shard 컬럼(SNAPSHOT_SHARD_COL, order 안 순번의 dictionary)을 붙여 이어 붙일 목록과 행마다의 순번을 만든다.
+    base(이전 스냅샷 표)에서는 tables로 다시 읽은 shard와 order에 없는 shard의 행을 버린다 — 바뀐 shard의 예전 행이 남지 않는다."""
+    order = list(order)
+    pos = {n: i for i, n in enumerate(order)}
+    parts, ranks = [], []
+    if base is not None:
+        base = conform(base)
+        live = pa.array([n for n in order if n not in tables], pa.large_string())
+        names = base[SNAPSHOT_SHARD_COL].cast(pa.large_string())
+        rank = pc.index_in(names, value_set=pa.array(order, pa.large_string()))
+        rows = pc.is_in(names, value_set=live)
+        base, rank = base.filter(rows), rank.filter(rows).to_numpy()
+        parts.append(base.set_column(base.column_names.index(SNAPSHOT_SHARD_COL), SNAPSHOT_SHARD_COL, _shard_column(rank, order)))
+        ranks.append(rank)
+    for name, table in tables.items():
+        rank = np.full(table.num_rows, pos[name], dtype=np.int32)
+        parts.append(table.append_column(SNAPSHOT_SHARD_COL, _shard_column(rank, order)))
+        ranks.append(rank)
+    return parts, np.concatenate(ranks) if ranks else np.empty(0, dtype=np.int32)
+
+def merge_tables(tables, trace=NO_TRACE, base=None, order=None):
+    """read_shard로 읽은 shard 표들을 복사 없이 이어 붙이고 Arrow에서 중복 제거·정렬·압축한 뒤, pandas로는 마지막에 한 번만 바꿔 색인을 붙인다.
+    tables가 이름별 dict면 행마다 원본 shard를 남기고(tag_shards), 겹치는 글은 order(manifest의 shard 순서)상 뒤 shard의 것이 남는다.
+    base(이전 스냅샷 표)는 다시 읽지 않은 shard의 행만 쓴다. (PlaceIndex, 스냅샷으로 저장할 표)."""
+    ranks = None
+    with trace.phase("concat", shards=len(tables)):
+        if isinstance(tables, dict):
+            parts, ranks = tag_shards(tables, order if order is not None else list(tables), base)
+        else:
+            parts = list(tables)
+        table = pa.concat_tables(parts, promote_options="default")
+        table = table.select([c for c in DEFAULT_VIEW_COLS + [SNAPSHOT_SHARD_COL] if c in table.column_names])
+    values = codes = None
+    if "place_id" in table.column_names:
+        with trace.phase("dedupe") as f:
+            values, codes = sorted_codes(table["place_id"])
+            keep = last_posts(codes, table["post_url"], ranks) if "post_url" in table.column_names else None
+            rows = np.flatnonzero(keep) if keep is not None else None
+            f["dropped"] = 0 if rows is None else table.num_rows - len(rows)
+        with trace.phase("sort", rows=table.num_rows):
+            dates = table["pub_date"] if "pub_date" in table.column_names else None
+            if rows is None:
+                perm = sort_order(codes, dates)
+            else:
+                perm = rows[sort_order(codes[rows], dates.take(rows) if dates is not None else None)]
+            table, codes = table.take(perm), codes[perm]
+    with trace.phase("compact"):
+        table = compact_table(table, values, codes)
+    with trace.phase("to_pandas"):
+        df = table_to_frame(table)
+    with trace.phase("index", rows=len(df)):
+        return PlaceIndex(df, presorted=True), table
+
+def _day(ts):
+    ts = ts.as_py() if isinstance(ts, pa.Scalar) else ts
+    return None if ts is None else pd.Timestamp(ts).strftime("%Y-%m-%d")
+
+def shard_entry(f: dict, table=None, prev=None) -> dict:
+    """스냅샷 meta에 남길 shard 정보. 날짜 범위는 manifest 항목에 있으면 그것을, 없으면 읽은 데이터(또는 지난 기록)를 쓴다.
+    file에는 스냅샷에 반영한 로컬 파일의 file_key를 남긴다."""
+    entry = {"fileId": f.get("fileId"), "fingerprint": manifest_fingerprint(f),
+             "file": file_key(os.path.join(CACHE_DIR, f["name"]))}
+    if table is not None:
+        span = pc.min_max(table["pub_date"]) if "pub_date" in table.column_names else {"min": None, "max": None}
+        entry.update(rows=table.num_rows, min_date=_day(span["min"]), max_date=_day(span["max"]))
+    elif prev:
+        entry.update({k: prev.get(k) for k in ("rows", "min_date", "max_date")})
+    for k in ("min_date", "max_date"):
+        if f.get(k):
+            entry[k] = str(f[k])[:10]
+    return entry
+
+def in_snapshot(entry, local_path: str) -> bool:
+    """스냅샷 shard 기록(entry)이 지금 로컬 파일로 만든 것인지. 받기만 하고 스냅샷에 넣지 못한 파일
+    (중단된 동기화, manifest가 바뀌어 다시 맞춘 첫 번째 받기 등)은 캐시 적중이어도 False라 다시 읽힌다."""
+    return bool(entry) and entry.get("file") == file_key(local_path)
+
+def plan_delta(files, meta: dict) -> set:
+    """이전 스냅샷에 이미 들어 있어 다시 확인할 필요가 없는 shard 이름들. 스냅샷을 이어 쓸 수 없으면 None.
+    같은 fileId이면서 manifest fingerprint가 같거나, fingerprint가 없어도 지난 동기화 마지막 날짜(view_range
+    max_date)보다 앞선 날짜만 담은 shard(이미 닫힌 기간)는 건너뛴다. manifest에서 빠진 shard가 있으면 None(전체 재구성)."""
+    prev = meta.get("shards") or {}
+    names = {f["name"] for f in files if f.get("fileId") and f.get("name")}
+    if not prev or set(prev) - names:
+        return None
+    last = str((meta.get("view_range") or {}).get("max_date") or "")[:10]
+    skip = set()
+    for f in files:
+        p = prev.get(f.get("name"))
+        if not p or p.get("fileId") != f.get("fileId") or not in_snapshot(p, os.path.join(CACHE_DIR, f["name"])):
+            continue
+        fp = manifest_fingerprint(f)
+        closed = bool(last and p.get("max_date") and p["max_date"] < last)
+        if (fp and fp == p.get("fingerprint")) or (not fp and closed):
+            skip.add(f["name"])
+    return skip
+
+def fetch_shard(session, cache, f: dict, on_chunk=None, cancel=None, decode=True, trace=NO_TRACE, reuse=None):
+    """shard 하나를 (필요하면) 받아서 읽는다. (frame, 캐시적중여부) — decode=False면 frame 대신 파일 경로.
+    reuse(이름별 스냅샷 shard 기록)의 파일과 지금 로컬 파일이 같으면 읽지 않고 frame 자리에 None을 돌려준다."""
+    name = f["name"]
+    local_path = os.path.join(CACHE_DIR, name)
+    hit = cache.is_fresh(f, local_path)
+    if not hit:
+        headers = cache.conditional_headers(f, local_path)
+        old = cache.recorded(f, local_path)
+        cache.forget(name)
+        url = drive_download_url(f["fileId"])
+        with trace.phase("download", shard=name) as ph:
+            resp_headers = stream_download(session, url, local_path, headers=headers, on_chunk=on_chunk, cancel=cancel, expect=f)
+            if resp_headers is None and not file_matches(local_path, f):
+                # 304인데 남아 있는 파일이 manifest의 크기·체크섬과 다르면 조건 없이 다시 받는다
+                resp_headers = stream_download(session, url, local_path, on_chunk=on_chunk, cancel=cancel, expect=f)
+                if resp_headers is None:
+                    raise DownloadError("서버가 변경 없음(304)이라고 했지만 로컬 파일이 manifest와 다릅니다.")
+            ph["bytes"] = 0 if resp_headers is None else os.path.getsize(local_path)
+        hit = resp_headers is None
+        if hit:
+            # 304는 파일이 지난번 그대로라는 뜻이므로 지난번 fingerprint를 그대로 남긴다
+            cache.record(f, local_path, {"ETag": headers.get("If-None-Match"), "Last-Modified": headers.get("If-Modified-Since")},
+                         fingerprint=old.get("fingerprint") or {})
+        else:
+            cache.record(f, local_path, resp_headers)
+    if cancel is not None and cancel.is_set():
+        raise DownloadCancelled(name)
+    if not decode:
+        return local_path, hit
+    if hit and in_snapshot((reuse or {}).get(name), local_path):
+        return None, hit
+    with trace.phase("read_parquet", shard=name):
+        return read_shard(local_path), hit
+
+def fetch_shards(files, cache, session, workers: int = DOWNLOAD_WORKERS, on_chunk=None, cancel=None, decode=True,
+                 trace=NO_TRACE, reuse=None):
+    """shard를 병렬로 받고, 끝나는 순서대로 (순번, f, frame, hit, error)를 내보낸다."""
+    jobs = [(i, f) for i, f in enumerate(files) if f.get("fileId") and f.get("name")]
+    if not jobs:
+        return
+    def work(f):
+        with trace.worker():
+            return fetch_shard(session, cache, f, on_chunk, cancel, decode, trace, reuse)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as ex:
+        futures = {ex.submit(work, f): (i, f) for i, f in jobs}
+        try:
+            for fut in as_completed(futures):
+                i, f = futures[fut]
+                try:
+                    frame, hit = fut.result()
+                    yield i, f, frame, hit, None
+                except Exception as e:
+                    cache.forget(f["name"])
+                    yield i, f, None, False, e
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+class SyncJob:
+    """manifest 조회 → shard 받기 → 합치기를 백그라운드 스레드에서 수행한다.
+    진행 상황은 snapshot()으로 읽고, 끝나면 result 또는 error가 채워진다."""
+
+    def __init__(self, raw: str, lazy: bool = False):
+        self.raw = raw
+        self.lazy = lazy
+        self.stage = "manifest"
+        self.total = 0
+        self.done = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.kept = 0
+        self.appended = 0
+        self.warnings = []
+        self.manifest = None
+        self.result = None
+        self.index = None
+        self.search = None
+        self.titles = None
+        self.rollups = None
+        self.trace = None
+        self.memory_bytes = 0
+        self.error = None
+        self.started = time.monotonic()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run_safe, name="adminviewer-sync", daemon=True)
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-6)
+            return {"stage": self.stage, "done": self.done, "total": self.total, "bytes": self.bytes,
+                    "mbps": self.bytes / elapsed / 1e6, "elapsed": elapsed}
+
+    @property
+    def counts(self) -> str:
+        text = f"캐시 재사용 {self.hits} · 새로 받음 {self.misses}"
+        return text + (f" · 지난 기간 건너뜀 {self.kept}" if self.kept else "")
+
+    def _add_bytes(self, n: int):
+        with self._lock:
+            self.bytes += n
+
+    def _check_cancel(self):
+        if self._cancel.is_set():
+            raise SyncCancelled()
+
+    def _run_safe(self):
+        try:
+            self.result = self.run()
+        except (SyncCancelled, DownloadCancelled):
+            self.error = SyncCancelled()
+        except Exception as e:
+            self.error = e
+
+    def run(self) -> pd.DataFrame:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self.trace = Trace("sync")
+        error = None
+        try:
+            return self._sync()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.trace.finish(lazy=self.lazy, shards=self.total, hits=self.hits, misses=self.misses, kept=self.kept,
+                              appended=self.appended, bytes=self.bytes,
+                              rows=0 if self.index is None or self.lazy else len(self.index.df),
+                              error=None if error is None else type(error).__name__)
+
+    def _sync(self) -> pd.DataFrame:
+        trace = self.trace
+        session = make_session()
+        manifests = ManifestCache()
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            cached, fresh = manifests.lookup(self.raw)
+            pending = None
+            if cached is not None and not fresh:
+                # 저장된 manifest로 바로 받기 시작하고, 그동안 바뀌었는지 조건부 요청으로 확인한다.
+                pending = pool.submit(self._resolve, session, manifests, trace)
+            self.manifest = cached if cached is not None else self._resolve(session, manifests, trace)
+            self._check_cancel()
+            files, parts, skip, prev, snap = self._download(session, trace)
+            if pending is not None:
+                try:
+                    with trace.phase("manifest_wait"):
+                        latest = pending.result()
+                except SyncError as e:
+                    self.warnings.append(f"manifest 확인 실패, 저장된 manifest 사용: {e}")
+                    latest = self.manifest
+                if latest != self.manifest:
+                    # 바뀌었으면 새 manifest로 다시 맞춘다. 이미 받은 shard는 캐시에서 바로 나온다.
+                    self.manifest = latest
+                    with self._lock:
+                        self.done = self.hits = self.misses = 0
+                    files, parts, skip, prev, snap = self._download(session, trace)
+        finally:
+            pool.shutdown(wait=False)
+            manifests.save()
+            session.close()
+
+        skipped = skip or set()
+        if not parts and not skipped:
+            raise SyncError("가져온 데이터가 없습니다.", "warning")
+        order = [f["name"] for f in files if f.get("name") in parts or f.get("name") in skipped]
+
+        if self.lazy:
+            self._build_rollups(trace, shards=[(n, os.path.join(CACHE_DIR, n), None) for n in order])
+            self._check_cancel()
+            from .engine import LazyEngine
+            self.index = LazyEngine([parts[n] for n in order])
+            self._build_search(trace)
+            self._check_cancel()
+            return pd.DataFrame(columns=self.index.columns)
+
+        fresh = {n: t for n, t in parts.items() if t is not None}
+        by_name = {f["name"]: f for f in files if f.get("name")}
+        shards = {n: prev[n] if n in skipped else shard_entry(by_name[n], fresh.get(n), prev.get(n)) for n in order}
+        shards.update({n: p for n, p in prev.items() if n not in shards})
+        # 이전 스냅샷에서 다시 읽은 shard의 행을 빼고 새 행을 더한다. 스냅샷의 shard가 모두 다시 읽혔으면 처음부터 합친다.
+        base = snap[0] if skip is not None and set(prev) - set(fresh) else None
+        tables = {n: fresh[n] for n in order if n in fresh}
+
+        with self._lock:
+            self.stage = "merge"
+        if base is not None and not tables:
+            with trace.phase("to_pandas"):
+                self.index, table = PlaceIndex(table_to_frame(base), presorted=True), None
+        else:
+            self.appended = sum(t.num_rows for t in tables.values())
+            self.index, table = merge_tables(tables, trace, base, [f["name"] for f in files if f.get("name")])
+        self.memory_bytes = int(self.index.df.memory_usage(deep=True).sum())
+        # 다운로드 뒤 단계마다 취소를 확인해, 취소한 동기화가 스냅샷을 덮어쓰지 않게 한다
+        self._check_cancel()
+        # 집계는 중복을 뺀 합친 표로 한다. 바뀐 shard가 없으면 저장된 집계를, 있으면 그 shard의 집계만 다시 계산한다.
+        self._build_rollups(trace, table=table if table is not None else base, reuse=table is None,
+                            keys={n: e.get("file") for n, e in shards.items()}, changed=tables)
+        self._check_cancel()
+        self._build_search(trace)
+        self._check_cancel()
+        try:
+            with trace.phase("snapshot"):
+                if table is None:
+                    update_snapshot_meta(view_range=self.manifest.get("view_range") or {}, shards=shards)
+                else:
+                    save_snapshot(table, self.manifest.get("view_range"), shards)
+        except Exception as e:
+            self.warnings.append(f"로컬 스냅샷 저장 실패: {e}")
+        return self.index.df
+
+    def _resolve(self, session, manifests, trace):
+        try:
+            return resolve_manifest(self.raw, session, trace, manifests)
+        except Exception as e:
+            raise SyncError(f"API 호출 실패\n{e}")
+
+    def _download(self, session, trace):
+        """manifest의 shard를 받고(바뀐 것만) 읽는다. (files, 이름별 frame, 건너뛴 shard, 스냅샷 shard 기록, 스냅샷)."""
+        files = self.manifest.get("files", []) if isinstance(self.manifest, dict) else []
+        if not files:
+            raise SyncError("manifest에 files가 없습니다.", "warning")
+
+        cache = CacheIndex()
+        snap = None if self.lazy else self._load_base()
+        skip = plan_delta(files, snap[1]) if snap is not None else None
+        prev = snap[1].get("shards", {}) if skip is not None else {}
+        skipped = skip or set()
+        todo = [f for f in files if f.get("name") not in skipped]
+        with self._lock:
+            self.stage = "download"
+            self.total = sum(1 for f in todo if f.get("fileId") and f.get("name"))
+            self.kept = len(skipped)
+        parts = {}
+        try:
+            for i, f, frame, hit, err in fetch_shards(todo, cache, session, on_chunk=self._add_bytes, cancel=self._cancel,
+                                                     decode=not self.lazy, trace=trace, reuse=prev):
+                self._check_cancel()
+                with self._lock:
+                    self.done += 1
+                if err is not None:
+                    self.warnings.append(f"{f.get('name')} 받기 실패: {err}")
+                    continue
+                parts[f["name"]] = frame
+                if hit: self.hits += 1
+                else: self.misses += 1
+        finally:
+            cache.save()
+        return files, parts, skip, prev, snap
+
+    def _load_base(self):
+        """delta 동기화의 바탕이 될 이전 스냅샷 (Arrow 표, meta). 없으면 None."""
+        try:
+            return load_snapshot_table()
+        except Exception:
+            return None
+
+    def _build_rollups(self, trace, shards=None, table=None, reuse=False, keys=None, changed=()):
+        """lazy면 shards(shard 파일별 집계를 합침), 아니면 합친 표 table로 집계한다. reuse면 저장된 표 기준 집계가 있을 때 그것을 쓴다.
+        keys·changed는 Rollups.from_table로 넘긴다 (원본 shard별 집계 재사용)."""
+        from .rollups import Rollups
+        with self._lock:
+            self.stage = "rollups"
+        try:
+            with trace.phase("rollups") as f:
+                if shards is not None:
+                    self.rollups, f["rebuilt"] = Rollups.build(shards, trace=trace)
+                else:
+                    self.rollups, f["rebuilt"] = Rollups.load(source="snapshot") if reuse else None, 0
+                    if self.rollups is None:
+                        self.rollups, f["rebuilt"] = Rollups.from_table(table, trace=trace, keys=keys, changed=changed)
+        except Exception as e:
+            self.warnings.append(f"업체별 집계 실패: {e}")
+
+    def _build_search(self, trace):
+        from .search import CompanySearch, TitleIndex
+        with self._lock:
+            self.stage = "search"
+        with trace.phase("company_search"):
+            self.search = CompanySearch.from_index(self.index)
+        if self.lazy or "title" not in self.index.columns:
+            return
+        with trace.phase("title_index") as f:
+            titles = TitleIndex.load()
+            f["new_titles"] = titles.attach(self.index.df["title"])
+        try:
+            with trace.phase("title_index_save"):
+                titles.save()
+        except Exception as e:
+            self.warnings.append(f"제목 검색 색인 저장 실패: {e}")
+        self.titles = titles
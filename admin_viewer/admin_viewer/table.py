@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+from tkinter import ttk
+
+from .config import VIRTUAL_BUFFER_ROWS
+
+HEADER_PX = 26
+WHEEL_ROWS = 3
+
+def format_rows(df, start: int = 1) -> list:
+    """df의 각 행을 Treeview values(맨 앞 No 포함, 모두 문자열)로 바꾼다."""
+    import pandas as pd
+    cols = [[str(i) for i in range(start, start + len(df))]]
+    for c in df.columns:
+        s = df[c]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            cols.append(s.dt.strftime("%Y-%m-%d").fillna("").tolist())
+        else:
+            cols.append(["" if v is None or v is pd.NA or (isinstance(v, float) and v != v) else str(v)
+                         for v in s.tolist()])
+    return [list(r) for r in zip(*cols)]
+
+def sort_positions(df, col: str, reverse: bool = False):
+    """정렬 후 각 자리에 올 df 행 위치(numpy 배열). pub_date가 아닌 컬럼은 pub_date를 보조 키로 쓴다."""
+    by = [col, "pub_date"] if col != "pub_date" and "pub_date" in df.columns else [col]
+    keys = df[by].reset_index(drop=True)
+    return keys.sort_values(by=by, ascending=[not reverse] + [True] * (len(by) - 1),
+                            na_position='last', kind="stable").index.to_numpy()
+
+def sort_frame(df, col: str, reverse: bool = False):
+    """헤더 클릭 정렬. pub_date가 아닌 컬럼은 pub_date를 보조 키로 쓴다."""
+    return df.take(sort_positions(df, col, reverse))
+
+class SortOrders:
+    """한 조회 결과에 대한 (컬럼, 방향)별 정렬 순서를 기억한다.
+    반대 방향은 이미 구한 순서를 뒤집어 만든다(빈 값은 계속 맨 뒤). 그래서 같은 값끼리는 발행일도 거꾸로 놓인다."""
+
+    def __init__(self, df):
+        self.df = df
+        self._orders = {}
+
+    def positions(self, col: str, reverse: bool = False):
+        import numpy as np
+        key = (col, reverse)
+        if key not in self._orders:
+            other = self._orders.get((col, not reverse))
+            if other is None:
+                self._orders[key] = sort_positions(self.df, col, reverse)
+            else:
+                n = len(other) - int(self.df[col].isna().sum())
+                self._orders[key] = np.concatenate([other[:n][::-1], other[n:]])
+        return self._orders[key]
+
+class VirtualTable:
+    """Treeview에는 화면에 보이는 행(+여유분)만 넣고, 스크롤하면 창 위치만 옮겨 다시 채운다.
+    행 수와 관계없이 그리는 비용이 일정하다. 채운 값(rows)은 기억해 두어 칸 값을 Tk에 묻지 않고 읽는다.
+    generation은 다시 채울 때마다 늘어나므로 화면 위치에 딸린 캐시(마우스 오버 칸 등)를 무효화하는 데 쓴다."""
+
+    def __init__(self, tree: ttk.Treeview, vscroll: ttk.Scrollbar, buffer_rows: int = VIRTUAL_BUFFER_ROWS):
+        self.tree = tree
+        self.vscroll = vscroll
+        self.buffer_rows = buffer_rows
+        self.df = None
+        self.order = None
+        self.offset = 0
+        self.rows = []
+        self.generation = 0
+        self._iids = []
+        self._pos = {}
+        self._row_height = None
+        self._wheel_steps = 0
+        self._wheel_pending = False
+        self._last_height = 0
+        vscroll.configure(command=self.yview)
+        tree.bind("<Configure>", self._on_configure, add="+")
+
+    @property
+    def total(self) -> int:
+        return 0 if self.df is None else len(self.df)
+
+    def show(self, df, order=None):
+        self.df = df
+        self.order = order
+        self.offset = 0
+        self.refresh()
+
+    def update(self, df, order=None):
+        """행이 늘어난 df(정렬해 둔 상태면 그 순서 order)로 바꾸되 스크롤 위치는 그대로 둔다(스트리밍 조회 중)."""
+        self.df = df
+        self.order = order
+        self.offset = max(0, min(self.offset, len(df) - self.page_size()))
+        self.refresh()
+
+    def reorder(self, order):
+        """같은 df를 order(행 위치 배열) 순서로 다시 보여준다. 컬럼·헤더는 그대로 두고 보이는 행만 다시 채운다."""
+        self.order = order
+        self.offset = 0
+        self.refresh()
+
+    def frame(self):
+        """화면에 보이는 순서대로의 df."""
+        if self.df is None or self.order is None:
+            return self.df
+        return self.df.take(self.order)
+
+    def clear(self):
+        self.df = None
+        self.order = None
+        self.offset = 0
+        if self._iids:
+            self.tree.delete(*self._iids)
+        self._iids = []
+        self._pos = {}
+        self.rows = []
+        self.generation += 1
+        self.vscroll.set(0, 1)
+
+    def page_size(self) -> int:
+        if self._row_height is None:
+            try:
+                self._row_height = int(ttk.Style(self.tree).lookup("Treeview", "rowheight") or 20)
+            except:
+                self._row_height = 20
+        return max(1, (self.tree.winfo_height() - HEADER_PX) // self._row_height)
+
+    def row_at(self, iid) -> int | None:
+        """화면의 item id가 df에서 몇 번째 행(위치)인지."""
+        i = self._pos.get(iid)
+        return None if i is None else self.offset + i
+
+    def value(self, iid, index: int) -> str | None:
+        """화면 행 iid의 index번째 값(No 포함, 문자열). 마지막으로 채운 값에서 읽으므로 Tk 호출이 없다."""
+        i = self._pos.get(iid)
+        if i is None or i >= len(self.rows) or not 0 <= index < len(self.rows[i]):
+            return None
+        return self.rows[i][index]
+
+    def refresh(self):
+        if self.df is None or self.df.empty:
+            self.clear()
+            return
+        n = min(self.page_size() + self.buffer_rows, self.total - self.offset)
+        if self.order is None:
+            window = self.df.iloc[self.offset:self.offset + n]
+        else:
+            window = self.df.take(self.order[self.offset:self.offset + n])
+        rows = format_rows(window, start=self.offset + 1)
+        while len(self._iids) < n:
+            self._iids.append(self.tree.insert("", "end"))
+        if len(self._iids) > n:
+            self.tree.delete(*self._iids[n:])
+            del self._iids[n:]
+        for iid, vals in zip(self._iids, rows):
+            self.tree.item(iid, values=vals)
+        self.rows = rows
+        self._pos = {iid: i for i, iid in enumerate(self._iids)}
+        self.generation += 1
+        self._update_scrollbar()
+
+    def scroll_to(self, offset: int):
+        offset = max(0, min(int(offset), self.total - self.page_size()))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def yview(self, *args):
+        if not args or not self.total:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * self.total))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.page_size()
+            self.scroll_to(self.offset + step)
+
+    def on_wheel(self, event):
+        if getattr(event, "state", 0) & 0x1:
+            return None  # Shift+휠은 Treeview 기본 바인딩(가로 스크롤)에 맡긴다
+        if getattr(event, "num", None) == 4:
+            step = -WHEEL_ROWS
+        elif getattr(event, "num", None) == 5:
+            step = WHEEL_ROWS
+        else:
+            step = -WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS
+        # 빠르게 굴리면 이벤트가 몰려오므로 쌓아 두었다가 한가할 때 한 번만 다시 채운다
+        self._wheel_steps += step
+        if not self._wheel_pending:
+            self._wheel_pending = True
+            self.tree.after_idle(self._flush_wheel)
+        return "break"
+
+    def _flush_wheel(self):
+        step, self._wheel_steps, self._wheel_pending = self._wheel_steps, 0, False
+        self.scroll_to(self.offset + step)
+
+    def _update_scrollbar(self):
+        if not self.total:
+            self.vscroll.set(0, 1)
+            return
+        self.vscroll.set(self.offset / self.total, min(1.0, (self.offset + self.page_size()) / self.total))
+
+    def _on_configure(self, _evt=None):
+        h = self.tree.winfo_height()
+        if h != self._last_height:
+            self._last_height = h
+            if self.total:
+                self.offset = max(0, min(self.offset, self.total - self.page_size()))
+                self.refresh()
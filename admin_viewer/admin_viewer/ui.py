@@ -1,15 +1,23 @@
 # -*- coding: utf-8 -*-
 import tkinter as tk
 from tkinter import ttk
+from datetime import datetime
+
+from .config import SUMMARY_MODES
+from .table import VirtualTable
 
 def build_ui(app):
     top = ttk.Frame(app); top.pack(fill="x", padx=10, pady=8)
 
-    ttk.Button(top, text="시작", command=app._prompt_api_then_sync).pack(side="left", padx=4)
+    app.sync_btn = ttk.Button(top, text="시작", command=app._prompt_api_then_sync)
+    app.sync_btn.pack(side="left", padx=4)
 
-    ttk.Label(top, text="업체ID:").pack(side="left", padx=(20,0))
+    ttk.Label(top, text="업체ID/이름:").pack(side="left", padx=(20,0))
     app.search_var = tk.StringVar()
-    ttk.Entry(top, textvariable=app.search_var, width=18).pack(side="left", padx=4)
+    app.search_entry = ttk.Entry(top, textvariable=app.search_var, width=18)
+    app.search_var.trace_add("write", lambda *_: app.on_search_key())
+    app.search_entry.bind("<Return>", app.on_search_enter)
+    app.search_entry.pack(side="left", padx=4)
 
     ttk.Button(top, text="업체 일괄 등록", command=app.prompt_id_list).pack(side="left", padx=(10,4))
 
@@ -19,34 +27,50 @@ def build_ui(app):
     app.combo.bind("<<ComboboxSelected>>", app.on_combo_select)
     app.combo.pack(side="left", padx=4)
 
+    ttk.Label(top, text="제목:").pack(side="left", padx=(14,0))
+    app.title_var = tk.StringVar()
+    title_entry = ttk.Entry(top, textvariable=app.title_var, width=16)
+    title_entry.bind("<Return>", lambda _e: app.apply_filter())
+    title_entry.pack(side="left", padx=4)
+
     ttk.Label(top, text="시작:").pack(side="left", padx=(20,0))
-    try:
-        from tkcalendar import DateEntry
-        app.start_cal = DateEntry(top, date_pattern="yyyy-mm-dd", width=12)
-        app.start_cal.pack(side="left", padx=4)
-        app.end_cal = DateEntry(top, date_pattern="yyyy-mm-dd", width=12)
-        ttk.Label(top, text="끝:").pack(side="left", padx=(10,0))
-        app.end_cal.pack(side="left", padx=4)
-        app._use_calendar = True
-    except Exception:
-        app._use_calendar = False
-        app.start_var = tk.StringVar()
-        app.end_var = tk.StringVar()
-        ttk.Entry(top, textvariable=app.start_var, width=12).pack(side="left", padx=4)
-        ttk.Label(top, text="끝:").pack(side="left", padx=(10,0))
-        ttk.Entry(top, textvariable=app.end_var, width=12).pack(side="left", padx=4)
+    # tkcalendar(babel)는 import가 느려서, 창을 먼저 띄우고 install_calendars()에서 달력으로 바꾼다
+    app._date_box = ttk.Frame(top); app._date_box.pack(side="left")
+    app._use_calendar = False
+    app.start_var = tk.StringVar()
+    app.end_var = tk.StringVar()
+    ttk.Entry(app._date_box, textvariable=app.start_var, width=12).pack(side="left", padx=4)
+    ttk.Label(app._date_box, text="끝:").pack(side="left", padx=(10,0))
+    ttk.Entry(app._date_box, textvariable=app.end_var, width=12).pack(side="left", padx=4)
 
     ttk.Button(top, text="조회하기", command=app.apply_filter).pack(side="left", padx=8)
     ttk.Button(top, text="엑셀 저장", command=app.export_excel).pack(side="left", padx=4)
+    ttk.Button(top, text="업체별 일괄 저장", command=app.bulk_export_dialog).pack(side="left", padx=4)
 
     app.status = tk.StringVar(value="[시작]을 눌러 API(또는 manifest 파일 ID/공유링크)를 입력하고 데이터를 동기화하세요.")
     ttk.Label(top, textvariable=app.status).pack(side="left", padx=8, fill="x", expand=True)
 
+    bar = ttk.Frame(app); bar.pack(fill="x", padx=10)
+    app.progress = ttk.Progressbar(bar, orient="horizontal", mode="determinate", length=260)
+    app.progress.pack(side="left", padx=4)
+    app.cancel_btn = ttk.Button(bar, text="취소", command=app.cancel_sync, state="disabled")
+    app.cancel_btn.pack(side="left", padx=4)
+    ttk.Checkbutton(bar, text="지연 조회·스트리밍(대용량, 다음 동기화부터)", variable=app.lazy_var,
+                    command=app._save_settings).pack(side="left", padx=(14,4))
+    ttk.Checkbutton(bar, text="시작할 때 새로 동기화", variable=app.refresh_on_start,
+                    command=app._save_settings).pack(side="left", padx=4)
+    ttk.Button(bar, text="다음 작업 프로파일", command=app.request_profile).pack(side="right", padx=4)
+    ttk.Button(bar, text="요약 보기", command=app.show_summary).pack(side="right", padx=4)
+    app.summary_var = tk.StringVar(value=next(iter(SUMMARY_MODES)))
+    ttk.Combobox(bar, textvariable=app.summary_var, values=list(SUMMARY_MODES), width=10,
+                 state="readonly").pack(side="right", padx=4)
+
     frame = ttk.Frame(app); frame.pack(fill="both", expand=True, padx=10, pady=8)
     app.tree = ttk.Treeview(frame, columns=(), show="headings", selectmode="none")
     vs = ttk.Scrollbar(frame, orient="vertical", command=app.tree.yview)
     hs = ttk.Scrollbar(frame, orient="horizontal", command=app.tree.xview)
-    app.tree.configure(yscrollcommand=vs.set, xscrollcommand=hs.set)
+    app.tree.configure(xscrollcommand=hs.set)
+    app.table = VirtualTable(app.tree, vs)
     app.tree.pack(side="left", fill="both", expand=True)
     vs.pack(side="right", fill="y")
     hs.pack(side="bottom", fill="x")
@@ -62,7 +86,30 @@ def build_ui(app):
     app.tree.bind("<Motion>", app._on_tree_motion)
     app.tree.bind("<Leave>", app._on_tree_leave)
     app.tree.bind("<Button-1>", app._on_tree_click_any)
-    app.tree.bind("<Configure>", lambda e: app._hide_overlay())
-    app.tree.bind("<MouseWheel>", lambda e: app._hide_overlay())
-    app.tree.bind("<Button-4>",  lambda e: app._hide_overlay())
-    app.tree.bind("<Button-5>",  lambda e: app._hide_overlay())
+    app.tree.bind("<ButtonRelease-1>", app._on_tree_click_any, add="+")
+    app.tree.bind("<Configure>", lambda e: app._reset_hover(), add="+")
+    app.tree.bind("<MouseWheel>", app._on_tree_wheel)
+    app.tree.bind("<Button-4>",  app._on_tree_wheel)
+    app.tree.bind("<Button-5>",  app._on_tree_wheel)
+
+def install_calendars(app):
+    try:
+        from tkcalendar import DateEntry
+    except Exception:
+        return
+    box = app._date_box
+    raws = (app.start_var.get().strip(), app.end_var.get().strip())
+    for w in box.winfo_children():
+        w.destroy()
+    app.start_cal = DateEntry(box, date_pattern="yyyy-mm-dd", width=12)
+    app.start_cal.pack(side="left", padx=4)
+    app.end_cal = DateEntry(box, date_pattern="yyyy-mm-dd", width=12)
+    ttk.Label(box, text="끝:").pack(side="left", padx=(10,0))
+    app.end_cal.pack(side="left", padx=4)
+    for cal, raw in zip((app.start_cal, app.end_cal), raws):
+        if raw:
+            try:
+                cal.set_date(datetime.strptime(raw, "%Y-%m-%d").date())
+            except Exception:
+                pass
+    app._use_calendar = True
@@ -1,17 +1,27 @@
 # -*- coding: utf-8 -*-
-import os, json, platform, shutil, webbrowser
+import os, json, time, queue, platform, shutil, threading, importlib, webbrowser
 from datetime import datetime
-import pandas as pd
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 import tkinter.font as tkfont
 
 from .version import __version__
-from .config import APP_TITLE, CACHE_DIR, SETTINGS_PATH, DEFAULT_VIEW_COLS, HEADER_LABELS
-from .helpers import autosize_excel, parse_id_list, sanitize_component, is_url
-from .drive import drive_download_url, extract_drive_file_id
+from .config import APP_TITLE, CACHE_DIR, SETTINGS_PATH, HEADER_LABELS, SYNC_POLL_MS, WARM_MODULES, STARTUP_PROBE_ENV, SEARCH_DEBOUNCE_MS, SEARCH_LIMIT, STREAM_MEMORY_MB, STREAM_RESORT_FACTOR, SUMMARY_MODES, HOVER_THROTTLE_MS
+from .helpers import parse_id_list
+from .cache import load_snapshot
+from .table import SortOrders
+from .perf import Trace, request_profile
 from . import ui
 
+def _warm_imports(done: threading.Event):
+    """창이 뜬 뒤 무거운 모듈(pandas/pyarrow/requests/openpyxl/tkcalendar)을 백그라운드에서 미리 import한다."""
+    for name in WARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+    done.set()
+
 class ViewerApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -22,8 +32,20 @@ class ViewerApp(tk.Tk):
             self.geometry("1280x760")
 
         self.api_input = tk.StringVar()
-        self.df_all = pd.DataFrame()
-        self.last_filtered = pd.DataFrame()
+        self.lazy_var = tk.BooleanVar(value=False)
+        self.refresh_on_start = tk.BooleanVar(value=False)
+        self.memory_cap_mb = STREAM_MEMORY_MB
+        self.df_all = None
+        self.index = None
+        self.company_search = None
+        self.title_index = None
+        self.rollups = None
+        self.summary_mode = None
+        self._search_after = None
+        self.last_filtered = None
+        self.sort_orders = None
+        self.view_order = None
+        self.sort_key = None
         self.selected_ids = []
         self.combo_items = []
         self.combo_map = {}
@@ -31,15 +53,93 @@ class ViewerApp(tk.Tk):
         self.last_ids = set()
         self.last_sdt = None
         self.last_edt = None
+        self._sync_job = None
+        self._bulk_thread = None
+        self._stream = None
+        self._ids_note = ""
 
         self._overlay = None
         self._overlay_font = None
         self._overlay_url = None
+        self._url_col = None
+        self._hover_after = None
+        self._hover_xy = (0, 0)
+        self._hover_cell = None
 
         os.makedirs(CACHE_DIR, exist_ok=True)
         self._load_settings()
 
+        self._probe = os.environ.get(STARTUP_PROBE_ENV)
+        self._warm = threading.Event()
+        threading.Thread(target=_warm_imports, args=(self._warm,), name="adminviewer-warm", daemon=True).start()
+
         ui.build_ui(self)
+        if self._probe:
+            self.after_idle(lambda: self._probe_mark("window"))
+        self.after(50, self._after_warm)
+
+    def _probe_mark(self, event: str):
+        try:
+            with open(self._probe, "a", encoding="utf-8") as fp:
+                fp.write(json.dumps({"event": event, "t": time.time()}) + "\n")
+        except:
+            pass
+
+    def _after_warm(self):
+        if not self._warm.is_set():
+            self.after(50, self._after_warm)
+            return
+        ui.install_calendars(self)
+        self._warm_start()
+        if self._probe:
+            self._probe_mark("ready")
+            self.after_idle(self.destroy)
+
+    def _has_data(self) -> bool:
+        return self.index is not None and not self.index.empty
+
+    def _has_result(self) -> bool:
+        return self.last_filtered is not None and not self.last_filtered.empty
+
+    def _result_frame(self):
+        """조회 결과를 화면에서 정렬한 순서대로."""
+        if self.view_order is None:
+            return self.last_filtered
+        return self.last_filtered.take(self.view_order)
+
+    def _warm_start(self):
+        from .index import PlaceIndex
+        from .search import CompanySearch
+        from .rollups import Rollups
+        try:
+            snap = load_snapshot()
+        except Exception:
+            snap = None
+        if snap is not None:
+            df, meta = snap
+            self.df_all = df
+            self.index = PlaceIndex(df, presorted=True)
+            self.company_search = CompanySearch.from_index(self.index)
+            self.rollups = Rollups.load()
+            threading.Thread(target=self._load_title_index, args=(self.index,), name="adminviewer-titles", daemon=True).start()
+            vr = meta.get("view_range", {})
+            self.status.set(f"저장된 데이터 {len(df):,}행 불러옴: 기간 {vr.get('min_date')} ~ {vr.get('max_date')} (동기화 {meta.get('saved_at')})")
+        if self.refresh_on_start.get() and self.api_input.get().strip():
+            self.sync_data()
+
+    def _load_title_index(self, index):
+        """저장된 제목 검색 색인을 스냅샷 데이터에 붙인다(백그라운드). 처음 보는 제목이 있으면 덧붙여 저장한다."""
+        from .search import TitleIndex
+        if "title" not in index.columns:
+            return
+        try:
+            titles = TitleIndex.load()
+            if titles.attach(index.df["title"]):
+                titles.save()
+        except Exception:
+            return
+        if self.index is index:
+            self.title_index = titles
 
     def _load_settings(self):
         try:
@@ -47,13 +147,18 @@ class ViewerApp(tk.Tk):
                 with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
                     cfg = json.load(f)
                 self.api_input.set(cfg.get("last_api", ""))
+                self.lazy_var.set(bool(cfg.get("lazy_engine", False)))
+                self.refresh_on_start.set(bool(cfg.get("refresh_on_start", False)))
+                self.memory_cap_mb = float(cfg.get("memory_cap_mb") or STREAM_MEMORY_MB)
         except:
             pass
 
     def _save_settings(self):
         try:
             with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-                json.dump({"last_api": self.api_input.get().strip()}, f, ensure_ascii=False, indent=2)
+                json.dump({"last_api": self.api_input.get().strip(), "lazy_engine": self.lazy_var.get(),
+                           "refresh_on_start": self.refresh_on_start.get(), "memory_cap_mb": self.memory_cap_mb},
+                          f, ensure_ascii=False, indent=2)
         except:
             pass
 
@@ -72,100 +177,122 @@ class ViewerApp(tk.Tk):
         self.sync_data()
 
     def sync_data(self):
-        import requests
         raw = self.api_input.get().strip()
         if not raw:
             messagebox.showwarning("경고", "API 또는 manifest 파일 ID/공유링크를 입력하세요.")
             return
-        try:
-            manifest = None
-            if is_url(raw):
-                fid = extract_drive_file_id(raw)
-                if fid:
-                    manifest = requests.get(drive_download_url(fid), timeout=60).json()
-                else:
-                    resp = requests.get(raw, timeout=60)
-                    resp.raise_for_status()
-                    payload = resp.json()
-                    if isinstance(payload, dict) and "files" in payload:
-                        manifest = payload
-                    else:
-                        mid = self._extract_manifest_id(payload)
-                        if not mid:
-                            raise ValueError("API 응답에서 manifest_file_id를 찾지 못했습니다.")
-                        manifest = requests.get(drive_download_url(mid), timeout=60).json()
-            else:
-                manifest = requests.get(drive_download_url(raw), timeout=60).json()
-        except Exception as e:
-            messagebox.showerror("에러", f"API 호출 실패\n{e}")
+        if self._sync_job is not None:
             return
-
-        files = manifest.get("files", []) if isinstance(manifest, dict) else []
-        if not files:
-            messagebox.showwarning("경고","manifest에 files가 없습니다.")
+        from .sync import SyncJob
+        job = SyncJob(raw, lazy=self.lazy_var.get())
+        self._sync_job = job
+        self.sync_btn.configure(state="disabled")
+        self.cancel_btn.configure(state="normal")
+        self.progress.configure(mode="indeterminate", value=0)
+        self.progress.start(15)
+        self.status.set("동기화 중: manifest 확인…")
+        job.start()
+        self.after(SYNC_POLL_MS, self._poll_sync)
+
+    def cancel_sync(self):
+        if self._sync_job is not None:
+            self._sync_job.cancel()
+            self.cancel_btn.configure(state="disabled")
+            self.status.set("동기화 취소 중…")
+
+    def _poll_sync(self):
+        job = self._sync_job
+        if job is None:
             return
-
-        frames=[]
-        for f in files:
-            fid = f.get("fileId"); name = f.get("name")
-            if not fid or not name:
-                continue
-            try:
-                local_path = os.path.join(CACHE_DIR, name)
-                r = requests.get(drive_download_url(fid), timeout=120)
-                r.raise_for_status()
-                with open(local_path, "wb") as fp:
-                    fp.write(r.content)
-                frames.append(pd.read_parquet(local_path))
-            except Exception as e:
-                messagebox.showwarning("알림", f"{name} 받기 실패: {e}")
-
-        if not frames:
-            messagebox.showwarning("경고","가져온 데이터가 없습니다.")
+        p = job.snapshot()
+        if p["stage"] == "download" and p["total"]:
+            if str(self.progress.cget("mode")) != "determinate":
+                self.progress.stop()
+                self.progress.configure(mode="determinate", maximum=p["total"])
+            self.progress.configure(value=p["done"])
+            if not job.cancelled:
+                self.status.set(f"동기화 중: {p['done']}/{p['total']}개 · {p['bytes']/1e6:.1f}MB · {p['mbps']:.1f}MB/s")
+        elif p["stage"] == "merge" and not job.cancelled:
+            self.status.set(f"동기화 중: 데이터 합치는 중… ({p['total']}개)")
+        elif p["stage"] == "rollups" and not job.cancelled:
+            self.status.set("동기화 중: 업체별 집계 중…")
+        elif p["stage"] == "search" and not job.cancelled:
+            self.status.set("동기화 중: 업체 검색 색인 만드는 중…")
+        if job.is_alive():
+            self.after(SYNC_POLL_MS, self._poll_sync)
+            return
+        self._finish_sync(job)
+
+    def _finish_sync(self, job):
+        from .sync import SyncError, SyncCancelled
+        self._sync_job = None
+        self.progress.stop()
+        self.progress.configure(mode="determinate", value=0)
+        self.sync_btn.configure(state="normal")
+        self.cancel_btn.configure(state="disabled")
+
+        if job.warnings:
+            messagebox.showwarning("알림", "\n".join(job.warnings[:20]))
+        if isinstance(job.error, SyncCancelled) or job.cancelled:
+            # 취소 뒤에 끝난 동기화의 결과도 버린다
+            self.status.set("동기화가 취소되었습니다. 기존 데이터는 그대로 유지됩니다.")
+            return
+        if isinstance(job.error, SyncError):
+            if job.error.level == "warning":
+                messagebox.showwarning("경고", str(job.error))
+            else:
+                messagebox.showerror("에러", str(job.error))
+            self.status.set("동기화 실패")
+            return
+        if job.error is not None:
+            messagebox.showerror("에러", f"동기화 실패\n{job.error}")
+            self.status.set("동기화 실패")
             return
 
-        df = pd.concat(frames, ignore_index=True)
-        if "pub_date" in df.columns:
-            df["pub_date"] = pd.to_datetime(df["pub_date"], errors="coerce")
-
-        view_cols = [c for c in DEFAULT_VIEW_COLS if c in df.columns]
-        self.df_all = df[view_cols].copy()
-
-        self.render_table(pd.DataFrame())
-        self.last_filtered = pd.DataFrame()
+        self._cancel_stream()
+        self.df_all = job.result
+        self.index = job.index
+        self.company_search = job.search
+        self.title_index = job.titles
+        self.rollups = job.rollups
+        self.render_table(None)
+        self.last_filtered = None
         self.selected_ids.clear()
         self.last_ids = set()
         self.last_sdt = None
         self.last_edt = None
         self._reset_combo()
 
-        vr = manifest.get("view_range", {})
-        self.status.set(f"동기화 완료: 기간 {vr.get('min_date')} ~ {vr.get('max_date')}")
-
-    def _extract_manifest_id(self, payload: dict):
-        if not isinstance(payload, dict):
-            return None
-        for k in ("manifest_file_id", "manifest_id", "file_id", "id"):
-            if isinstance(payload.get(k), str) and payload[k].strip():
-                return payload[k].strip()
-        data = payload.get("data", {})
-        if isinstance(data, dict):
-            for k in ("manifest_file_id", "manifest_id", "file_id", "id"):
-                if isinstance(data.get(k), str) and data[k].strip():
-                    return data[k].strip()
-        return None
-
-    def render_table(self, df: pd.DataFrame):
-        self.tree.delete(*self.tree.get_children())
-        self._hide_overlay()
-
-        if df.empty:
+        vr = job.manifest.get("view_range", {})
+        mem_txt = "지연 조회" if job.lazy else f"메모리 {job.memory_bytes/1e6:.1f}MB"
+        self._report(job.trace, f"동기화 완료: 기간 {vr.get('min_date')} ~ {vr.get('max_date')} / {job.counts} / {mem_txt}")
+
+    def _report(self, trace, text: str):
+        """상태줄에 결과와 단계별 소요 시간을 함께 표시한다. 프로파일을 받았으면 파일 위치를 알려준다."""
+        self.status.set(f"{text} / {trace.summary()}" if trace is not None else text)
+        if trace is not None and trace.profile_path:
+            messagebox.showinfo("프로파일 저장", f"프로파일을 저장했습니다. 이 파일을 보내 주세요:\n{trace.profile_path}")
+
+    def request_profile(self):
+        request_profile()
+        self.status.set("다음 작업(동기화/조회/정렬/엑셀 저장) 한 번을 프로파일합니다.")
+
+    def render_table(self, df):
+        self._reset_hover()
+        self._url_col = None
+        self.sort_orders = None
+        self.view_order = None
+        self.sort_key = None
+
+        if df is None or df.empty:
+            self.table.clear()
             self.tree["columns"] = ()
             return
 
         data_cols = list(df.columns)
         cols = ["No"] + data_cols
         self.tree["columns"] = cols
+        self._url_col = cols.index("post_url") if "post_url" in cols else None
 
         for c in cols:
             head = HEADER_LABELS.get(c, c)
@@ -185,29 +312,27 @@ class ViewerApp(tk.Tk):
                     w = 120; anchor = "w"
             self.tree.column(c, width=w, anchor=anchor)
 
-        for no, row in enumerate(df.itertuples(index=False), start=1):
-            vals = [str(no)]
-            for v in row:
-                if isinstance(v, pd.Timestamp):
-                    vals.append(v.strftime("%Y-%m-%d"))
-                else:
-                    vals.append("" if (pd.isna(v) if isinstance(v, float) else v is None) else str(v))
-            self.tree.insert("", "end", values=vals)
+        self.table.show(df)
 
     def sort_by_column(self, col: str):
-        if self.last_filtered.empty or col == "No":
+        if not self._has_result() or col == "No":
             return
         reverse = self.sort_reverse.get(col, False)
-        if col != "pub_date" and "pub_date" in self.last_filtered.columns:
-            self.last_filtered = self.last_filtered.sort_values(
-                by=[col, "pub_date"], ascending=[not reverse, True], na_position='last'
-            )
-        else:
-            self.last_filtered = self.last_filtered.sort_values(
-                by=col, ascending=not reverse, na_position='last'
-            )
+        trace = Trace("sort_by_column")
+        if self.sort_orders is None or self.sort_orders.df is not self.last_filtered:
+            self.sort_orders = SortOrders(self.last_filtered)
+        with trace.phase("sort", column=col):
+            self.view_order = self.sort_orders.positions(col, reverse)
         self.sort_reverse[col] = not reverse
-        self.render_table(self.last_filtered)
+        self.sort_key = (col, reverse)
+        with trace.phase("reorder"):
+            if self.table.df is self.last_filtered:
+                self.table.reorder(self.view_order)
+            else:
+                # 스트리밍 중 아직 표에 걸지 않은 행까지 포함해 정렬했다
+                self.table.show(self.last_filtered, self.view_order)
+        trace.finish(column=col, reverse=reverse, rows=len(self.last_filtered))
+        self._report(trace, f"정렬: {HEADER_LABELS.get(col, col)} {'내림차순' if reverse else '오름차순'}")
 
     def _reset_combo(self):
         self.combo_items = []
@@ -229,59 +354,84 @@ class ViewerApp(tk.Tk):
             return
         self.selected_ids = ids
 
-        if self.df_all.empty or "place_id" not in self.df_all.columns:
+        if not self._has_data() or "place_id" not in self.index.columns:
             self._reset_combo()
             return
 
-        df_ids = self.df_all[self.df_all["place_id"].astype(str).isin(ids)].copy()
-        if "company_name" in df_ids.columns:
-            items = ["전체(선택된)"]
-            mapping = {}
-            for pid, cname in (
-                df_ids[["place_id","company_name"]]
-                .dropna()
-                .drop_duplicates(subset=["place_id"])
-                .itertuples(index=False)
-            ):
-                label = f"{pid} - {cname}"
-                items.append(label)
-                mapping[label] = str(pid)
-            self.combo_items = items
-            self.combo_map = mapping
-            self.combo.configure(state="readonly", values=items)
-            self.combo_var.set("전체(선택된)")
+        if "company_name" in self.index.columns:
+            self._fill_combo(self.index.companies(ids), "전체(선택된)")
         else:
-            items = ["전체(선택된)"] + [str(x) for x in ids]
-            mapping = {str(x): str(x) for x in ids}
-            self.combo_items = items
-            self.combo_map = mapping
-            self.combo.configure(state="readonly", values=items)
-            self.combo_var.set("전체(선택된)")
+            self._fill_combo([(str(x), None) for x in ids], "전체(선택된)")
+
+    def _fill_combo(self, companies, all_label: str):
+        items = [all_label]
+        mapping = {}
+        for pid, cname in companies:
+            label = f"{pid} - {cname}" if cname is not None else str(pid)
+            items.append(label)
+            mapping[label] = pid
+        self.combo_items = items
+        self.combo_map = mapping
+        self.combo.configure(state="readonly", values=items)
+        self.combo_var.set(all_label)
+
+    def on_search_key(self, _evt=None):
+        """입력칸 글자가 바뀔 때마다 바로 찾지 않고 SEARCH_DEBOUNCE_MS 동안 입력이 멈추면 한 번 찾는다."""
+        self._cancel_search()
+        self._search_after = self.after(SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def on_search_enter(self, _evt=None):
+        """Enter는 바로 조회한다. 아직 돌지 않은 검색이 조회 결과를 덮어쓰지 않도록 취소한다."""
+        self._cancel_search()
+        self.apply_filter()
+
+    def _cancel_search(self):
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
+
+    def _run_search(self):
+        self._search_after = None
+        if self.company_search is None:
+            return
+        q = self.search_var.get().strip()
+        if not q or len(parse_id_list(q)) > 1:
+            # 비웠거나 업체ID 여러 개를 붙여 넣은 경우: 일괄 등록 목록으로 되돌린다
+            if self.selected_ids and self._has_data() and "company_name" in self.index.columns:
+                self._fill_combo(self.index.companies(self.selected_ids), "전체(선택된)")
+            elif not self.selected_ids:
+                self._reset_combo()
+            return
+        t = time.perf_counter()
+        found = self.company_search.search(q)
+        ms = (time.perf_counter() - t) * 1000
+        if not found:
+            self._reset_combo()
+            self.status.set(f"'{q}'에 맞는 업체가 없습니다.")
+            return
+        more = "+" if len(found) >= SEARCH_LIMIT else ""
+        self._fill_combo(found, f"전체(검색된 {len(found)}{more}개)")
+        if len(found) == 1:
+            self.apply_filter(force_sel=self.combo_items[1])
+            return
+        how = "[업체 선택]에서 고르세요" if q.isdigit() else "[업체 선택]에서 고르거나 [조회하기]로 모두 조회"
+        self.status.set(f"'{q}' 검색: 업체 {len(found)}{more}개 ({ms:.1f}ms) — {how}")
+
+    def _input_ids(self, q: str) -> tuple:
+        """업체ID 입력칸 해석 → (업체ID 목록, 상태줄에 덧붙일 설명).
+        숫자가 아닌 단어 하나는 업체명 검색 결과 전체로 넓히고 그 사실을 설명에 적는다. 숫자는 입력한 업체ID 그대로 쓴다."""
+        ids = parse_id_list(q)
+        if len(ids) == 1 and not ids[0].isdigit() and self.company_search is not None and not self.company_search.has(ids[0]):
+            found = self.company_search.search(q, limit=None)
+            if found:
+                return [pid for pid, _ in found], f" ('{q}' 검색 결과 업체 {len(found):,}곳)"
+        return ids, ""
 
     def on_combo_select(self, _evt=None):
         sel = self.combo_var.get().strip()
         self.apply_filter(force_sel=sel)
 
-    def apply_filter(self, force_sel: str | None = None):
-        if self.df_all.empty:
-            return
-
-        df = self.df_all.copy()
-
-        ids_from_button = set(self.selected_ids) if self.selected_ids else set()
-        q = self.search_var.get().strip()
-        ids_from_input = set(parse_id_list(q)) if q else set()
-
-        if ids_from_input:
-            ids = ids_from_input
-        else:
-            ids = ids_from_button
-            sel = force_sel or self.combo_var.get().strip()
-            if sel and sel != "전체(선택된)":
-                pid = self.combo_map.get(sel)
-                if pid:
-                    ids = {pid}
-
+    def _read_dates(self):
         sdt = edt = None
         try:
             if getattr(self, "_use_calendar", False):
@@ -294,85 +444,223 @@ class ViewerApp(tk.Tk):
                 edt = datetime.strptime(e_raw, "%Y-%m-%d").date() if e_raw else None
         except:
             pass
+        return sdt, edt
 
-        if not ids:
-            self.last_filtered = pd.DataFrame()
+    def _query_ids(self, force_sel: str | None = None) -> set:
+        """조회할 업체ID: [업체 선택]에서 고른 업체 > 업체ID 입력칸 > 일괄 등록 목록(또는 콤보에서 고른 업체)."""
+        ids_from_button = set(self.selected_ids) if self.selected_ids else set()
+        q = self.search_var.get().strip()
+        ids_from_input, note = self._input_ids(q) if q else ([], "")
+        ids_from_input = set(ids_from_input)
+        self._ids_note = ""
+        forced = self.combo_map.get(force_sel) if force_sel else None
+
+        if forced:
+            ids = {forced}
+        elif ids_from_input:
+            ids = ids_from_input
+            self._ids_note = note
+        else:
+            ids = ids_from_button
+            sel = force_sel or self.combo_var.get().strip()
+            if sel and sel != "전체(선택된)":
+                pid = self.combo_map.get(sel)
+                if pid:
+                    ids = {pid}
+        return ids
+
+    def apply_filter(self, force_sel: str | None = None):
+        if not self._has_data():
+            return
+        self.summary_mode = None
+        ids = self._query_ids(force_sel)
+        sdt, edt = self._read_dates()
+
+        title_q = self.title_var.get().strip()
+
+        if not ids and not title_q:
+            self.last_filtered = None
             self.last_ids = set()
             self.last_sdt = sdt
             self.last_edt = edt
             self.render_table(self.last_filtered)
-            self.status.set("업체 ID를 지정해야 조회할 수 있습니다.")
+            self.status.set("업체 ID나 제목 검색어를 지정해야 조회할 수 있습니다.")
             return
 
-        df = df[df["place_id"].astype(str).isin(ids)]
-        if "pub_date" in df.columns:
-            if sdt:
-                df = df[df["pub_date"] >= pd.to_datetime(sdt)]
-            if edt:
-                df = df[df["pub_date"] <= pd.to_datetime(edt)]
+        self._cancel_stream()
+        if hasattr(self.index, "iter_select"):
+            self._start_stream(ids, sdt, edt, title_q)
+            return
+
+        trace = Trace("apply_filter")
+        with trace.phase("select", ids=len(ids), title=bool(title_q)):
+            if title_q:
+                from .search import select_titles
+                df = select_titles(self.index, self.title_index, title_q, ids, sdt or None, edt or None)
+            else:
+                df = self.index.select(ids, sdt or None, edt or None)
 
         self.last_filtered = df
         self.last_ids = set(ids)
         self.last_sdt = sdt
         self.last_edt = edt
-        self.render_table(df)
+        with trace.phase("render_table"):
+            self.render_table(df)
+        trace.finish(ids=len(ids), rows=len(df), dated=bool(sdt or edt), title=bool(title_q))
 
         range_txt = ""
         if sdt or edt:
             s_txt = sdt.strftime("%Y-%m-%d") if sdt else "…"
             e_txt = edt.strftime("%Y-%m-%d") if edt else "…"
             range_txt = f" / 기간 {s_txt} ~ {e_txt}"
-        ids_txt = f" / 업체ID {', '.join(sorted(map(str, ids)))[:80]}..." if ids else ""
-        self.status.set(f"조회 조건 적용{range_txt}{ids_txt}")
+        ids_txt = f" / 업체ID {', '.join(sorted(map(str, ids)))[:80]}...{self._ids_note}" if ids else " / 전체 업체"
+        title_txt = f" / 제목 '{title_q}'" if title_q else ""
+        self._report(trace, f"조회 조건 적용 {len(df):,}건{range_txt}{ids_txt}{title_txt}")
+
+    def show_summary(self):
+        """동기화 때 만든 업체별 집계로 요약을 표에 보여준다. 업체ID를 지정하지 않으면 전체 업체."""
+        if self.rollups is None or self.rollups.empty:
+            messagebox.showwarning("경고", "업체별 집계가 없습니다. 먼저 [시작]으로 데이터를 동기화해 주세요.")
+            return
+        mode = self.summary_var.get()
+        ids = self._query_ids()
+        sdt, edt = self._read_dates()
+        trace = Trace("summary")
+        with trace.phase("rollup_query", mode=mode):
+            if SUMMARY_MODES.get(mode) is None:
+                df = self.rollups.totals(ids, sdt, edt)
+            else:
+                df = self.rollups.periods(ids, sdt, edt, SUMMARY_MODES[mode])
+        self._cancel_stream()
+        self.last_filtered = df
+        self.last_ids = set(ids) or set(df["place_id"])
+        self.last_sdt = sdt
+        self.last_edt = edt
+        with trace.phase("render_table"):
+            self.render_table(df)
+        self.summary_mode = mode
+        trace.finish(mode=mode, ids=len(ids), rows=len(df))
+        companies = df["place_id"].nunique() if len(df) else 0
+        self._report(trace, f"요약({mode}): 업체 {companies:,}곳 · 글 {int(df['posts'].sum()) if len(df) else 0:,}건{self._ids_note}")
+
+    def _cancel_stream(self):
+        if self._stream is not None:
+            self._stream["cancel"].set()
+            self._stream = None
+
+    def _start_stream(self, ids, sdt, edt, title_q):
+        """지연 조회 엔진에서는 결과를 batch 단위로 받아 오는 대로 표에 붙인다.
+        표에 잡아 두는 행은 memory_cap_mb까지이고 그 뒤로는 건수만 센다. 엑셀 저장은 원본에서 다시 흘려 쓴다."""
+        ids = list(ids) or sorted(self.index.all_ids)
+        state = {"query": (ids, sdt or None, edt or None, title_q), "queue": queue.Queue(maxsize=4),
+                 "cancel": threading.Event(), "held": 0, "rows": 0, "truncated": False, "done": False,
+                 "error": None, "trace": Trace("apply_filter_stream"), "note": self._ids_note, "grown": False, "resort_at": 0.0}
+        self._stream = state
+        self.last_filtered = None
+        self.last_ids = set(ids)
+        self.last_sdt = sdt
+        self.last_edt = edt
+        self.render_table(None)
+        self.status.set("조회 중…")
+        threading.Thread(target=self._stream_worker, args=(state,), name="adminviewer-stream", daemon=True).start()
+        self.after(SYNC_POLL_MS, lambda: self._poll_stream(state))
+
+    def _stream_chunks(self, query):
+        from .search import title_mask
+        ids, sdt, edt, title_q = query
+        for chunk in self.index.iter_select(ids, sdt, edt, max_mb=self.memory_cap_mb):
+            if title_q:
+                chunk = chunk[title_mask(chunk, title_q)]
+            if len(chunk):
+                yield chunk
+
+    def _stream_worker(self, state):
+        try:
+            with state["trace"].worker():
+                for chunk in self._stream_chunks(state["query"]):
+                    while not state["cancel"].is_set():
+                        try:
+                            state["queue"].put(chunk, timeout=0.2)
+                            break
+                        except queue.Full:
+                            pass
+                    if state["cancel"].is_set():
+                        return
+        except Exception as e:
+            state["error"] = e
+        finally:
+            state["done"] = True
+
+    def _poll_stream(self, state):
+        if state is not self._stream:
+            return
+        import pandas as pd
+        finished = state["done"]
+        fresh = []
+        while True:
+            try:
+                chunk = state["queue"].get_nowait()
+            except queue.Empty:
+                break
+            state["rows"] += len(chunk)
+            if state["held"] < self.memory_cap_mb * 1e6:
+                fresh.append(chunk)
+                state["held"] += int(chunk.memory_usage(deep=True).sum())
+            else:
+                state["truncated"] = True
+        if fresh:
+            first = self.last_filtered is None
+            self.last_filtered = pd.concat(([] if first else [self.last_filtered]) + fresh, ignore_index=True)
+            if first:
+                state["trace"].add("first_rows", time.perf_counter() - state["trace"].started)
+                self.render_table(self.last_filtered)
+            else:
+                state["grown"] = True
+        if state["grown"] and (finished or time.perf_counter() >= state["resort_at"]):
+            self._show_grown(state)
+        if not finished:
+            self.status.set(f"조회 중: {state['rows']:,}건…")
+            self.after(SYNC_POLL_MS, lambda: self._poll_stream(state))
+            return
+        trace = state["trace"]
+        trace.finish(rows=state["rows"], held_bytes=state["held"], truncated=state["truncated"], stream=True,
+                     error=type(state["error"]).__name__ if state["error"] else None)
+        if state["error"] is not None:
+            messagebox.showerror("에러", f"조회 실패\n{state['error']}")
+            self.status.set("조회 실패")
+            return
+        shown = 0 if self.last_filtered is None else len(self.last_filtered)
+        cut = f" (메모리 한도 {self.memory_cap_mb:,.0f}MB로 {shown:,}건만 표시, 엑셀 저장은 전체)" if state["truncated"] else ""
+        self._report(trace, f"조회 조건 적용 {state['rows']:,}건{state['note']}{cut}")
+
+    def _show_grown(self, state):
+        """스트리밍으로 늘어난 결과를 표에 건다. 헤더로 정렬해 두었으면 같은 기준(sort_key)으로 다시 정렬한다.
+        매번 전체를 다시 정렬하므로 다음 반영은 이번 정렬에 걸린 시간의 STREAM_RESORT_FACTOR배 뒤로 미루고
+        (그동안 표는 지난 정렬 그대로), 조회가 끝나면 바로 한다."""
+        state["grown"] = False
+        if self.sort_key is None:
+            self.sort_orders = None
+            self.view_order = None
+            self.table.update(self.last_filtered)
+            return
+        t = time.perf_counter()
+        self.sort_orders = SortOrders(self.last_filtered)
+        self.view_order = self.sort_orders.positions(*self.sort_key)
+        state["resort_at"] = time.perf_counter() + (time.perf_counter() - t) * STREAM_RESORT_FACTOR
+        self.table.update(self.last_filtered, self.view_order)
 
     def export_excel(self):
-        if self.last_filtered.empty:
+        if not self._has_result():
             messagebox.showwarning("경고","저장할 조회 결과가 없습니다. 먼저 [조회하기]를 실행해 주세요.")
             return
+        from .helpers import write_excel, write_excel_chunks
+        from .export import for_excel, date_span_text, report_title, report_filename
 
-        df = self.last_filtered.copy()
-        if "pub_date" in df.columns:
-            df["pub_date"] = pd.to_datetime(df["pub_date"], errors="coerce").dt.strftime("%Y-%m-%d")
-
-        sdt = self.last_sdt
-        edt = self.last_edt
-        if not sdt or not edt:
-            try:
-                p = pd.to_datetime(self.last_filtered["pub_date"], errors="coerce")
-                if not sdt: sdt = p.min().date() if not p.isna().all() else None
-                if not edt: edt = p.max().date() if not p.isna().all() else None
-            except:
-                pass
-        s_txt = (sdt.strftime("%Y-%m-%d") if sdt else "시작없음")
-        e_txt = (edt.strftime("%Y-%m-%d") if edt else "마감없음")
-
-        title_name = ""
-        try:
-            all_ids = set(self.df_all["place_id"].astype(str).unique()) if "place_id" in self.df_all.columns else set()
-            ids = self.last_ids
-            if ids and all_ids and ids == all_ids:
-                title_name = "전체"
-            else:
-                if "company_name" in self.last_filtered.columns:
-                    names = [x for x in self.last_filtered["company_name"].dropna().astype(str).unique() if x.strip()]
-                    if len(names) == 0:
-                        title_name = "선택"
-                    elif len(names) == 1:
-                        title_name = names[0]
-                    else:
-                        title_name = f"{names[0]}외"
-                else:
-                    pids = [x for x in self.last_filtered["place_id"].astype(str).unique()]
-                    if len(pids) == 0:
-                        title_name = "선택"
-                    elif len(pids) == 1:
-                        title_name = pids[0]
-                    else:
-                        title_name = f"{pids[0]}외"
-        except:
-            title_name = "선택"
+        s_txt, e_txt = date_span_text(self.last_filtered, self.last_sdt, self.last_edt)
+        title_name = report_title(self.last_filtered, self.last_ids, self.index.all_ids)
 
-        fname = f"애드민_리포트_{sanitize_component(title_name)}_{s_txt}_{e_txt}.xlsx"
+        prefix = f"애드민_요약_{self.summary_mode}" if self.summary_mode else "애드민_리포트"
+        fname = report_filename(title_name, s_txt, e_txt, prefix)
         f = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
             filetypes=[("Excel","*.xlsx")],
@@ -381,58 +669,125 @@ class ViewerApp(tk.Tk):
         if not f:
             return
 
-        df.to_excel(f, index=False)
+        trace = Trace("export_excel")
+        stream = self._stream
         try:
-            autosize_excel(f)
-        except:
-            pass
+            if stream is not None and (stream["truncated"] or not stream["done"]):
+                # 표에 다 올리지 못한 결과: 원본을 batch로 다시 읽으며 바로 쓴다 (파일 순서)
+                self.status.set("엑셀 저장 중…")
+                self.update_idletasks()
+                rows = write_excel_chunks((for_excel(c) for c in self._stream_chunks(stream["query"])), f, trace=trace)
+            else:
+                with trace.phase("prepare"):
+                    df = for_excel(self._result_frame())
+                rows = write_excel(df, f, trace=trace)
+        except Exception as e:
+            trace.finish(rows=len(self.last_filtered), error=type(e).__name__)
+            messagebox.showerror("에러", f"엑셀 저장 실패\n{e}")
+            return
+        trace.finish(rows=rows, stream=stream is not None)
+        self._report(trace, f"엑셀 저장 완료: {os.path.basename(f)}")
         messagebox.showinfo("완료", f"엑셀 저장 완료:\n{os.path.basename(f)}")
 
-    def _on_tree_double_click(self, event):
-        region = self.tree.identify("region", event.x, event.y)
-        if region != "cell":
+    def bulk_export_dialog(self):
+        from .export import bulk_export
+        if not self._has_data():
+            messagebox.showwarning("경고", "먼저 [시작]으로 데이터를 동기화해 주세요.")
             return
-        col_id = self.tree.identify_column(event.x)
-        row_id = self.tree.identify_row(event.y)
-        if not col_id or not row_id:
+        if self._bulk_thread is not None:
             return
-        try:
-            col_index = int(col_id.replace('#','')) - 1
-        except:
+        txt = simpledialog.askstring(
+            "업체별 일괄 저장",
+            "업체별로 엑셀을 따로 저장할 업체ID를 입력하세요.\n(기간은 위의 시작/끝 날짜를 사용합니다)",
+            initialvalue=" ".join(self.selected_ids),
+            parent=self
+        )
+        if txt is None:
             return
-        cols = list(self.tree["columns"])
-        if not (0 <= col_index < len(cols)) or cols[col_index] != "post_url":
+        ids = parse_id_list(txt)
+        if not ids:
+            messagebox.showwarning("경고", "인식된 업체ID가 없습니다.")
             return
-        url = str(self.tree.item(row_id).get("values", [])[col_index]).strip()
-        if url.lower().startswith("http"):
-            self._open_in_chrome(url)
+        out_dir = filedialog.askdirectory(title="저장할 폴더 선택", parent=self)
+        if not out_dir:
+            return
+        sdt, edt = self._read_dates()
 
-    def _on_tree_motion(self, event):
-        region = self.tree.identify("region", event.x, event.y)
-        col_id = self.tree.identify_column(event.x)
-        row_id = self.tree.identify_row(event.y)
-        if region != "cell" or not col_id or not row_id:
-            self._hide_overlay(); return
-        try:
-            col_index = int(col_id.replace('#','')) - 1
-        except:
-            self._hide_overlay(); return
+        state = {"done": 0, "total": 0, "summary": None, "error": None, "started": time.perf_counter()}
+        def on_file(_row, total):
+            state["done"] += 1; state["total"] = total
+        def work():
+            try:
+                state["summary"] = bulk_export(self.index, ids, out_dir, sdt, edt, on_file=on_file)
+            except Exception as e:
+                state["error"] = e
+        self._bulk_thread = threading.Thread(target=work, name="adminviewer-bulk", daemon=True)
+        self._bulk_thread.start()
+        self.after(SYNC_POLL_MS, lambda: self._poll_bulk(state, out_dir, sdt, edt))
+
+    def _poll_bulk(self, state, out_dir, sdt, edt):
+        if self._bulk_thread.is_alive():
+            self.status.set(f"업체별 저장 중: {state['done']}/{state['total'] or '?'}개")
+            self.after(SYNC_POLL_MS, lambda: self._poll_bulk(state, out_dir, sdt, edt))
+            return
+        from .export import write_summary
+        self._bulk_thread = None
+        if state["error"] is not None:
+            messagebox.showerror("에러", f"업체별 저장 실패\n{state['error']}")
+            return
+        summary = state["summary"] or []
+        if not summary:
+            messagebox.showwarning("경고", "조건에 맞는 데이터가 없습니다.")
+            return
+        s_txt = sdt.strftime("%Y-%m-%d") if sdt else "시작없음"
+        e_txt = edt.strftime("%Y-%m-%d") if edt else "마감없음"
+        write_summary(summary, os.path.join(out_dir, f"애드민_리포트_요약_{s_txt}_{e_txt}.csv"))
+        elapsed = time.perf_counter() - state["started"]
+        failed = [r for r in summary if r["error"]]
+        lines = [f"{r['file']}: {r['rows']:,}행 {r['seconds']:.1f}초" for r in summary[:15]]
+        if len(summary) > 15:
+            lines.append(f"… 외 {len(summary) - 15}개")
+        self.status.set(f"업체별 저장 완료: {len(summary)}개 파일 / {elapsed:.1f}초")
+        messagebox.showinfo("완료", f"{len(summary) - len(failed)}개 저장 완료 ({elapsed:.1f}초)"
+                            + (f", 실패 {len(failed)}개" if failed else "") + "\n\n" + "\n".join(lines))
 
-        cols = list(self.tree["columns"])
-        if not (0 <= col_index < len(cols)) or cols[col_index] != "post_url":
-            self._hide_overlay(); return
+    def _on_tree_double_click(self, event):
+        row_id = self.tree.identify_row(event.y)
+        url = self._cell_url(row_id, self.tree.identify_column(event.x)) if row_id else None
+        if url:
+            self._open_in_chrome(url)
 
-        values = self.tree.item(row_id).get("values", [])
-        if col_index >= len(values):
-            self._hide_overlay(); return
-        url = str(values[col_index]).strip()
-        if not url.lower().startswith("http"):
-            self._hide_overlay(); return
+    def _cell_url(self, row_id, col_id):
+        """row_id·col_id 칸이 post_url 칸이면 그 URL. 값은 화면을 채울 때 기억해 둔 것(table.value)에서 읽는다."""
+        if self._url_col is None or col_id != f"#{self._url_col + 1}":
+            return None
+        url = str(self.table.value(row_id, self._url_col) or "").strip()
+        return url if url.lower().startswith("http") else None
 
-        bbox = self.tree.bbox(row_id, col_id)
+    def _on_tree_motion(self, event):
+        # 마우스가 같은 칸 안에서 움직이는 동안은 아무 일도 하지 않고,
+        # 칸을 벗어나면 HOVER_THROTTLE_MS에 한 번만 위치를 계산한다
+        self._hover_xy = (event.x, event.y)
+        cell = self._hover_cell
+        if cell and cell[4] == self.table.generation and cell[0] <= event.x < cell[2] and cell[1] <= event.y < cell[3]:
+            return
+        if self._hover_after is None:
+            self._hover_after = self.after(HOVER_THROTTLE_MS, self._update_hover)
+
+    def _update_hover(self):
+        self._hover_after = None
+        x, y = self._hover_xy
+        row_id = self.tree.identify_row(y)
+        col_id = self.tree.identify_column(x)
+        bbox = self.tree.bbox(row_id, col_id) if row_id and col_id else None
         if not bbox:
+            self._hover_cell = None
+            self._hide_overlay(); return
+        bx, by, w, h = bbox
+        self._hover_cell = (bx, by, bx + w, by + h, self.table.generation)
+        url = self._cell_url(row_id, col_id)
+        if not url:
             self._hide_overlay(); return
-        x, y, w, h = bbox
 
         if self._overlay is None:
             base_font = tkfont.nametofont("TkDefaultFont")
@@ -443,18 +798,37 @@ class ViewerApp(tk.Tk):
             self._overlay.bind("<Button-1>", lambda e: self._open_in_chrome(self._overlay_url))
             self._overlay.bind("<Double-1>", lambda e: self._open_in_chrome(self._overlay_url))
 
+        if self._overlay_url is None:
+            self.tree.configure(cursor="hand2")
         self._overlay_url = url
         self._overlay.configure(text=url)
-        self._overlay.place(x=x+2, y=y, width=w-4, height=h)
-        self.tree.configure(cursor="hand2")
+        self._overlay.place(x=bx+2, y=by, width=w-4, height=h)
 
-    def _on_tree_leave(self, _evt=None):
-        self._hide_overlay()
+    def _on_tree_wheel(self, event):
+        self._reset_hover()
+        return self.table.on_wheel(event)
+
+    def _on_tree_leave(self, event=None):
+        # 오버레이 라벨 위로 들어가도 Leave가 오므로 그때는 그대로 둔다
+        if event is not None and self._overlay is not None and self.tree.winfo_containing(event.x_root, event.y_root) is self._overlay:
+            return
+        self._reset_hover()
 
     def _on_tree_click_any(self, _evt=None):
+        self._reset_hover()
+
+    def _reset_hover(self):
+        """예약된 위치 계산을 취소하고 기억한 칸을 지운다. 스크롤·다시 그리기·열 너비 변경 때 부른다."""
+        if self._hover_after is not None:
+            self.after_cancel(self._hover_after)
+            self._hover_after = None
+        self._hover_cell = None
         self._hide_overlay()
 
     def _hide_overlay(self):
+        if self._overlay_url is None:
+            return
+        self._overlay_url = None
         if self._overlay is not None:
             self._overlay.place_forget()
         self.tree.configure(cursor="")
@@ -1,5 +1,18 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# Optional pandas/pyarrow backends and dev tooling the viewer never imports.
+# Keeping them out shrinks the module graph the one-file exe has to unpack at start-up.
+# Measure with: python -m benchmarks.startup --exe dist/admin_viewer_v1.0.0.exe
+EXCLUDED_MODULES = [
+    "matplotlib", "scipy", "IPython", "jupyter_client", "notebook", "ipykernel", "zmq", "tornado",
+    "PyQt5", "PyQt6", "PySide2", "PySide6", "sqlalchemy", "psycopg2", "pymysql",
+    "pytest", "_pytest", "hypothesis", "numexpr", "bottleneck", "numba", "tables",
+    "xlrd", "xlsxwriter", "odf", "pyxlsb", "python_calamine", "lxml", "bs4", "html5lib", "jinja2",
+    "fsspec", "gcsfs", "s3fs", "botocore", "boto3",
+    "pandas.tests", "numpy.tests", "pyarrow.tests", "openpyxl.tests", "tkinter.test",
+    "pandas.plotting._matplotlib", "pyarrow.cuda", "pyarrow.flight", "pyarrow.gandiva", "pyarrow.substrait",
+]
+
 
 a = Analysis(
     ['app.py'],
@@ -10,7 +23,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDED_MODULES,
     noarchive=False,
     optimize=0,
 )
@@ -2,11 +2,10 @@
 """
 Run with:
     python -m admin_viewer.app
+(this file is the PyInstaller entry point and just forwards to it)
 """
-from admin_viewer.viewer import ViewerApp
-
-def main():
-    ViewerApp().mainloop()
+import sys
+from admin_viewer.app import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the Drive download endpoint and the manifest API.
+
+  GET /uc?export=download&id=<fileId>  -> file from the data dir (manifest id "manifest" -> manifest.json)
+  GET /api/manifest                     -> {"data": {"manifest_file_id": "manifest"}}
+
+Like Drive, file downloads honour "Range: bytes=N-" (206, or the whole file when If-Range no longer matches
+Last-Modified), and fileIds listed in `confirm` first get the large-file confirm page. Every request's
+path and headers are appended to `log`.
+
+Point the viewer at it with ADMINVIEWER_DRIVE_BASE=http://127.0.0.1:<port>/uc
+"""
+import os, re, json, shutil, threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+CONFIRM_PAGE = """<!DOCTYPE html><html><body><p>Google Drive can't scan this file for viruses.</p>
+<form id="download-form" action="{action}" method="get">
+<input type="submit" value="Download anyway"/>
+<input type="hidden" name="id" value="{id}"><input type="hidden" name="export" value="download">
+<input type="hidden" name="confirm" value="t"><input type="hidden" name="uuid" value="0000-test">
+</form></body></html>"""
+
+class DriveHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, *args, files=None, confirm=None, log=None, **kwargs):
+        self.files = files or {}
+        self.confirm = confirm if confirm is not None else set()
+        self.log = log if log is not None else []
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        u = urlsplit(self.path)
+        self.log.append((self.path, dict(self.headers)))
+        if u.path == "/api/manifest":
+            body = json.dumps({"data": {"manifest_file_id": "manifest"}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if u.path == "/uc":
+            q = parse_qs(u.query)
+            fid = (q.get("id") or [""])[0]
+            name = self.files.get(fid)
+            if not name:
+                self.send_error(404)
+                return
+            if fid in self.confirm and "confirm" not in q:
+                return self._send_body(CONFIRM_PAGE.format(action=f"http://{self.headers['Host']}/uc", id=fid).encode(),
+                                       "text/html; charset=utf-8")
+            self.path = "/" + name
+            if self._send_range(self.translate_path(self.path)):
+                return
+        return super().do_GET()
+
+    def _send_body(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_range(self, path: str) -> bool:
+        """Answers "Range: bytes=N-" with 206. Returns False to fall back to the whole file."""
+        m = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if not m or not os.path.isfile(path):
+            return False
+        st = os.stat(path)
+        last = self.date_time_string(st.st_mtime)
+        if self.headers.get("If-Range") not in (None, last):
+            return False
+        start = int(m.group(1))
+        if start >= st.st_size:
+            self.send_error(416)
+            return True
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{st.st_size - 1}/{st.st_size}")
+        self.send_header("Content-Length", str(st.st_size - start))
+        self.send_header("Last-Modified", last)
+        self.end_headers()
+        with open(path, "rb") as fp:
+            fp.seek(start)
+            shutil.copyfileobj(fp, self.wfile)
+        return True
+
+def serve(data_dir: str, port: int = 0):
+    """백그라운드 스레드에서 서버를 띄우고 (server, base_url)을 돌려준다."""
+    with open(os.path.join(data_dir, "manifest.json"), "r", encoding="utf-8") as fp:
+        manifest = json.load(fp)
+    files = {f["fileId"]: f["name"] for f in manifest["files"]}
+    files["manifest"] = "manifest.json"
+    handler = partial(DriveHandler, files=files, confirm=set(), log=[], directory=data_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
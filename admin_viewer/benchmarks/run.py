@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmark on synthetic data served by a local Drive stand-in.
+
+    python -m benchmarks.run --companies 10000 --posts 1000000 --shards 20 --out bench.json
+    python -m benchmarks.run --posts 10000000 --shards 100 --date-type string
+
+Each stage is timed on its own (manifest, download, decode, merge, sync end-to-end,
+apply_filter, sort_by_column, render_table, export_excel) and the result is written as JSON,
+so runs from different versions can be diffed. render_table times the row formatting for one
+visible window; with --gui and a display it also times VirtualTable.show on a real Treeview.
+"""
+import os, sys, json, time, shutil, argparse, platform, statistics, tempfile
+from datetime import date, datetime, timedelta
+
+from .synth import generate
+from .drive_server import serve
+
+def _timed(fn, repeat: int = 1):
+    samples, out = [], None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn()
+        samples.append(time.perf_counter() - t)
+    return out, {"seconds": round(statistics.median(samples), 6), "min": round(min(samples), 6), "runs": repeat}
+
+def _data_dir(args) -> str:
+    params = {"companies": args.companies, "posts": args.posts, "shards": args.shards, "start": "2023-01-01",
+              "days": args.days, "date_type": args.date_type, "seed": args.seed}
+    d = args.data or os.path.join(tempfile.gettempdir(), "adminviewer_bench",
+                                  f"c{args.companies}_p{args.posts}_s{args.shards}_{args.date_type}_{args.seed}")
+    try:
+        with open(os.path.join(d, "params.json"), "r", encoding="utf-8") as fp:
+            if json.load(fp) == params:
+                return d
+    except OSError:
+        pass
+    shutil.rmtree(d, ignore_errors=True)
+    t = time.perf_counter()
+    generate(d, **params)
+    print(f"generated {args.posts:,} posts in {time.perf_counter() - t:.1f}s -> {d}", file=sys.stderr)
+    return d
+
+def run(args) -> dict:
+    data_dir = _data_dir(args)
+    server, base = serve(data_dir)
+    cache_dir = tempfile.mkdtemp(prefix="adminviewer_bench_cache_")
+    os.environ["ADMINVIEWER_DRIVE_BASE"] = base + "/uc"
+    os.environ["ADMINVIEWER_CACHE_DIR"] = cache_dir
+
+    # config는 import 시점에 환경변수를 읽으므로 위 설정 뒤에 import 한다
+    from admin_viewer.version import __version__
+    from admin_viewer.drive import make_session
+    from admin_viewer.cache import CacheIndex
+    from admin_viewer.sync import SyncJob, resolve_manifest, fetch_shards, read_shard, merge_tables
+    from admin_viewer.table import format_rows, sort_frame, SortOrders
+    from admin_viewer.helpers import write_excel
+    from admin_viewer.export import for_excel
+
+    stages = {}
+    api = base + "/api/manifest"
+    session = make_session()
+    manifest, stages["manifest"] = _timed(lambda: resolve_manifest(api, session), args.repeat)
+
+    cache = CacheIndex()
+    results, stages["download"] = _timed(lambda: list(fetch_shards(manifest["files"], cache, session, decode=False)))
+    cache.save()
+    paths = [p for _, _, p, _, err in sorted(results, key=lambda r: r[0]) if err is None]
+    stages["download"]["bytes"] = sum(os.path.getsize(p) for p in paths)
+    stages["download"]["mb_per_s"] = round(stages["download"]["bytes"] / 1e6 / stages["download"]["seconds"], 1)
+
+    tables, stages["decode"] = _timed(lambda: [read_shard(p) for p in paths])
+    (index, _), stages["merge"] = _timed(lambda: merge_tables(tables))
+    stages["merge"]["rows"] = len(index.df)
+    stages["merge"]["memory_mb"] = round(index.df.memory_usage(deep=True).sum() / 1e6, 1)
+    tables = None
+
+    job = SyncJob(api)
+    _, stages["sync_warm"] = _timed(job.run)
+    stages["sync_warm"]["cache_hits"] = job.hits
+    index = job.index
+
+    ids = sorted(index.all_ids)
+    one, hundred = ids[:1], ids[:100]
+    end = date(2023, 1, 1) + timedelta(days=args.days)
+    queries = {
+        "one_company": (one, None, None),
+        "one_company_30d": (one, end - timedelta(days=30), end),
+        "100_companies_90d": (hundred, end - timedelta(days=90), end),
+        "all_companies": (ids, None, None),
+    }
+    stages["apply_filter"] = {}
+    for name, (q_ids, sdt, edt) in queries.items():
+        res, st = _timed(lambda: index.select(q_ids, sdt, edt), args.repeat)
+        st["rows"] = len(res)
+        stages["apply_filter"][name] = st
+
+    result = index.select(hundred)
+    stages["sort_by_column"] = {}
+    for col in result.columns:
+        _, stages["sort_by_column"][col] = _timed(lambda: sort_frame(result, col, False), args.repeat)
+        stages["sort_by_column"][col]["rows"] = len(result)
+    stages["sort_flip"] = {}
+    for col in result.columns:
+        orders = SortOrders(result)
+        orders.positions(col, False)
+        _, stages["sort_flip"][col] = _timed(lambda: (orders._orders.pop((col, True), None), orders.positions(col, True)), args.repeat)
+
+    big = index.select(ids)
+    page = 40
+    _, stages["render_table"] = _timed(lambda: format_rows(big.iloc[len(big) // 2:len(big) // 2 + page]), args.repeat)
+    stages["render_table"]["rows_matched"] = len(big)
+    if args.gui:
+        stages["render_table_tk"] = _render_tk(big, args.repeat)
+
+    xlsx = os.path.join(cache_dir, "bench.xlsx")
+    _, stages["export_excel"] = _timed(lambda: write_excel(for_excel(result), xlsx))
+    stages["export_excel"]["rows"] = len(result)
+
+    server.shutdown()
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return {
+        "version": __version__,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": {"companies": args.companies, "posts": args.posts, "shards": args.shards,
+                   "days": args.days, "date_type": args.date_type, "seed": args.seed},
+        "stages": stages,
+    }
+
+def _render_tk(df, repeat: int) -> dict:
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        from admin_viewer.table import VirtualTable
+        root = tk.Tk()
+    except Exception as e:
+        return {"error": str(e)}
+    try:
+        root.geometry("1280x760")
+        tree = ttk.Treeview(root, columns=["No"] + list(df.columns), show="headings")
+        vs = ttk.Scrollbar(root, orient="vertical")
+        tree.pack(fill="both", expand=True)
+        table = VirtualTable(tree, vs)
+        root.update()
+        def show():
+            table.show(df)
+            root.update_idletasks()
+        _, st = _timed(show, repeat)
+        st["rows_matched"] = len(df)
+        return st
+    finally:
+        root.destroy()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--companies", type=int, default=10_000)
+    ap.add_argument("--posts", type=int, default=1_000_000)
+    ap.add_argument("--shards", type=int, default=20)
+    ap.add_argument("--days", type=int, default=730)
+    ap.add_argument("--date-type", choices=("timestamp", "string"), default="timestamp")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--data", help="synthetic data directory (reused when parameters match)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--gui", action="store_true", help="also time render_table on a real Tk Treeview")
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    args = ap.parse_args(argv)
+
+    result = run(args)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fp:
+            fp.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
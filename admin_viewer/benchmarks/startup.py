@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Import-time / startup benchmark.
+
+    python -m benchmarks.startup                      # source tree
+    python -m benchmarks.startup --exe dist/admin_viewer_v1.0.0.exe --runs 5
+
+Reports, as JSON:
+  - import_ms: cumulative `-X importtime` of admin_viewer.viewer and of each heavy module
+  - window_s / ready_s: seconds from process launch until the Tk window is idle and until
+    background warm-up (pandas, pyarrow, ...) and the snapshot load have finished.
+    Measured through the ADMINVIEWER_STARTUP_PROBE hook, so a display is required.
+"""
+import os, sys, json, time, argparse, statistics, subprocess, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("pandas", "pyarrow", "pyarrow.parquet", "requests", "openpyxl", "tkcalendar")
+PROBE_ENV = "ADMINVIEWER_STARTUP_PROBE"
+
+def import_ms(module: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        p = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                           cwd=ROOT, capture_output=True, text=True)
+        cum = None
+        for line in p.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                cum = int(parts[1]) / 1000
+        if cum is not None:
+            samples.append(cum)
+    return round(statistics.median(samples), 1) if samples else None
+
+def launch(cmd: list, runs: int, timeout: float = 60) -> dict:
+    window, ready, errors = [], [], []
+    for _ in range(runs):
+        fd, probe = tempfile.mkstemp(suffix=".jsonl"); os.close(fd)
+        env = dict(os.environ, **{PROBE_ENV: probe})
+        t0 = time.time()
+        try:
+            p = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+            with open(probe, "r", encoding="utf-8") as fp:
+                marks = {m["event"]: m["t"] - t0 for m in map(json.loads, fp.read().splitlines())}
+            if "window" in marks: window.append(marks["window"])
+            if "ready" in marks: ready.append(marks["ready"])
+            if not marks:
+                errors.append((p.stderr or "no probe output").strip().splitlines()[-1:])
+        except Exception as e:
+            errors.append(str(e))
+        finally:
+            os.remove(probe)
+    med = lambda xs: round(statistics.median(xs), 3) if xs else None
+    return {"cmd": cmd, "runs": runs, "window_s": med(window), "ready_s": med(ready), "errors": errors[:3]}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--exe", help="PyInstaller 빌드 결과 실행 파일")
+    ap.add_argument("--no-gui", action="store_true", help="import 시간만 측정")
+    args = ap.parse_args(argv)
+
+    out = {"python": sys.version.split()[0], "platform": sys.platform,
+           "import_ms": {m: import_ms(m, args.runs) for m in ("admin_viewer.viewer",) + HEAVY}}
+    if not args.no_gui:
+        out["source"] = launch([sys.executable, "-m", "admin_viewer.app"], args.runs)
+        if args.exe:
+            out["frozen"] = launch([os.path.abspath(args.exe)], args.runs)
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Synthetic manifests + parquet shards shaped like the real export (Korean titles/names)."""
+import os, json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+SYLLABLES = list("가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후민서준현지우하윤")
+WORDS = ["맛집", "후기", "방문", "추천", "카페", "데이트", "점심", "저녁", "메뉴", "가격", "분위기", "주차", "예약",
+         "신메뉴", "리뷰", "솔직", "재방문", "인생", "동네", "핫플", "디저트", "브런치", "가족", "모임", "코스"]
+
+def company_names(n: int, rng) -> np.ndarray:
+    idx = rng.integers(0, len(SYLLABLES), size=(n, 3))
+    syl = np.array(SYLLABLES)
+    suffix = np.array(["식당", "카페", "베이커리", "치킨", "한의원", "헤어", "필라테스", "병원"])[rng.integers(0, 8, n)]
+    return np.char.add(np.char.add(np.char.add(syl[idx[:, 0]], syl[idx[:, 1]]), syl[idx[:, 2]]), suffix)
+
+def make_shard(rows: int, companies: int, names: np.ndarray, rng, start: str, days: int, date_type: str) -> pa.Table:
+    cid = rng.integers(0, companies, rows)
+    place_id = pa.array((cid + 10_000_000).astype(str))
+    words = pa.array(WORDS)
+    title = pc.binary_join_element_wise(
+        pc.take(words, pa.array(rng.integers(0, len(WORDS), rows))),
+        pc.take(words, pa.array(rng.integers(0, len(WORDS), rows))),
+        pc.cast(pa.array(rng.integers(1, 10_000, rows)), pa.string()), " ")
+    post_id = rng.integers(10**11, 10**12, rows)
+    post_url = pc.binary_join_element_wise("https://blog.naver.com/user",
+                                           pc.cast(pa.array(cid), pa.string()), "/",
+                                           pc.cast(pa.array(post_id), pa.string()), "")
+    secs = rng.integers(0, days * 86400, rows)
+    dates = np.datetime64(start, "s").astype(np.int64) + secs
+    pub = pa.array(dates.astype("datetime64[s]"))
+    if date_type == "string":
+        pub = pc.strftime(pub, format="%Y-%m-%d %H:%M:%S")
+    return pa.table({"place_id": place_id, "company_name": pa.array(names[cid]), "pub_date": pub,
+                     "title": title, "post_url": post_url, "blog_id": pa.array(cid), "views": pa.array(rng.integers(0, 5000, rows))})
+
+def generate(out_dir: str, companies: int = 10_000, posts: int = 1_000_000, shards: int = 20,
+             start: str = "2023-01-01", days: int = 730, date_type: str = "timestamp", seed: int = 0) -> dict:
+    """out_dir에 shard parquet과 manifest.json을 만들고 manifest dict를 돌려준다."""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    names = company_names(companies, rng)
+    files = []
+    per = -(-posts // shards)
+    for k in range(shards):
+        rows = min(per, posts - k * per)
+        if rows <= 0:
+            break
+        name = f"posts_{k:04d}.parquet"
+        pq.write_table(make_shard(rows, companies, names, rng, start, days, date_type), os.path.join(out_dir, name),
+                       row_group_size=100_000)
+        files.append({"fileId": f"shard{k:04d}", "name": name, "size": os.path.getsize(os.path.join(out_dir, name))})
+    end = (pd.Timestamp(start) + pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+    manifest = {"files": files, "view_range": {"min_date": start, "max_date": end}}
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, ensure_ascii=False, indent=2)
+    with open(os.path.join(out_dir, "params.json"), "w", encoding="utf-8") as fp:
+        json.dump({"companies": companies, "posts": posts, "shards": shards, "start": start, "days": days,
+                   "date_type": date_type, "seed": seed}, fp)
+    return manifest
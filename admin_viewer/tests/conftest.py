@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+동기화 테스트 공통 준비. benchmarks.drive_server로 로컬 Drive를 띄우고 CACHE_DIR은 임시 폴더를 쓴다.
+
+    drive.publish({"a.parquet": df, ...})   # shard를 쓰고 manifest.json을 갱신 (fingerprint=False면 size/md5 없이)
+    drive.confirm.add("id-a.parquet")       # 이 파일은 먼저 큰 파일 확인 페이지를 보낸다
+    drive.log                               # 받은 요청 (경로, 헤더) 목록
+    SyncJob("manifest").run()
+"""
+import os, sys, json, time, shutil, hashlib, tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# config는 import 시점에 환경변수를 읽으므로 admin_viewer보다 먼저 설정한다
+os.environ["ADMINVIEWER_CACHE_DIR"] = tempfile.mkdtemp(prefix="adminviewer_test_cache_")
+
+from admin_viewer.config import CACHE_DIR
+from benchmarks.drive_server import serve
+
+class Drive:
+    def __init__(self, data_dir: str):
+        self.dir = data_dir
+        self.manifest = {"files": [], "view_range": {}}
+        self._version = int(time.time())
+        self._write_manifest()
+        self.server, self.base = serve(data_dir)
+        kw = self.server.RequestHandlerClass.keywords
+        self.files, self.confirm, self.log = kw["files"], kw["confirm"], kw["log"]
+
+    def _write_manifest(self):
+        with open(os.path.join(self.dir, "manifest.json"), "w", encoding="utf-8") as fp:
+            json.dump(self.manifest, fp, ensure_ascii=False)
+        # Last-Modified는 초 단위라 같은 초에 다시 쓴 manifest도 바뀐 것으로 보이도록 판마다 1초씩 늘린다
+        self._version += 1
+        os.utime(os.path.join(self.dir, "manifest.json"), (self._version, self._version))
+
+    def publish(self, shards: dict, fingerprint: bool = True, mtime=None, view_range=None):
+        """shards(이름 → DataFrame)를 parquet으로 쓰고 manifest를 그 목록으로 바꾼다. mtime을 주면 파일 수정 시각을 그 값으로 둔다."""
+        files = []
+        for name, df in shards.items():
+            path = os.path.join(self.dir, name)
+            df.to_parquet(path, index=False)
+            if mtime is not None:
+                os.utime(path, (mtime, mtime))
+            f = {"fileId": "id-" + name, "name": name}
+            if fingerprint:
+                with open(path, "rb") as fp:
+                    f.update(size=os.path.getsize(path), md5Checksum=hashlib.md5(fp.read()).hexdigest())
+            files.append(f)
+            self.files[f["fileId"]] = name
+        self.manifest = {"files": files, "view_range": view_range or {}}
+        self._write_manifest()
+
+@pytest.fixture
+def cache_dir():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    os.makedirs(CACHE_DIR)
+    yield CACHE_DIR
+
+@pytest.fixture
+def drive(tmp_path, cache_dir, monkeypatch):
+    import admin_viewer.drive, admin_viewer.cache
+    d = Drive(str(tmp_path))
+    monkeypatch.setattr(admin_viewer.drive, "DRIVE_DOWNLOAD_BASE", d.base + "/uc")
+    # manifest는 매번 다시 확인한다
+    monkeypatch.setattr(admin_viewer.cache, "MANIFEST_TTL", 0)
+    yield d
+    d.server.shutdown()
+    d.server.server_close()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import os, json, hashlib
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from admin_viewer.drive import (DownloadError, _is_html, drive_confirm_url, drive_download_url, file_matches,
+                                make_session, stream_download)
+from test_sync import posts
+
+def shard(drive, n=2000):
+    drive.publish({"a.parquet": posts([str(i % 7) for i in range(n)], [f"title-{i}" for i in range(n)])})
+    f = drive.manifest["files"][0]
+    with open(os.path.join(drive.dir, "a.parquet"), "rb") as fp:
+        return f, fp.read()
+
+def leave_partial(path, data, url, last_modified):
+    """중단된 받기처럼 .part와 그 meta를 남긴다."""
+    with open(path + ".part", "wb") as fp:
+        fp.write(data)
+    with open(path + ".part.json", "w", encoding="utf-8") as fp:
+        json.dump({"url": url, "etag": None, "last_modified": last_modified, "total": None}, fp)
+
+def download(drive, f, path, **kw):
+    got = []
+    headers = stream_download(make_session(), drive_download_url(f["fileId"]), path, on_chunk=got.append,
+                              expect=f, retries=0, **kw)
+    return headers, sum(got)
+
+def file_requests(drive):
+    return [h for p, h in drive.log if p.startswith("/uc") and "manifest" not in p]
+
+def test_resume_partial_with_range(drive, cache_dir):
+    f, data = shard(drive)
+    path = os.path.join(cache_dir, "a.parquet")
+    last = formatdate(os.path.getmtime(os.path.join(drive.dir, "a.parquet")), usegmt=True)
+    leave_partial(path, data[:1000], drive_download_url(f["fileId"]), last)
+    _, received = download(drive, f, path)
+    sent = file_requests(drive)[-1]
+    assert sent["Range"] == "bytes=1000-" and sent["If-Range"] == last
+    assert received == len(data) - 1000
+    assert open(path, "rb").read() == data and not os.path.exists(path + ".part")
+
+def test_changed_file_restarts_from_zero(drive, cache_dir):
+    # .part를 받은 뒤 파일이 바뀌었다: If-Range가 맞지 않아 서버가 200으로 전체를 보낸다
+    f, data = shard(drive)
+    path = os.path.join(cache_dir, "a.parquet")
+    leave_partial(path, b"x" * 1000, drive_download_url(f["fileId"]), "Mon, 01 Jan 2001 00:00:00 GMT")
+    _, received = download(drive, f, path)
+    assert file_requests(drive)[-1]["Range"] == "bytes=1000-"
+    assert received == len(data) and open(path, "rb").read() == data
+
+@pytest.mark.parametrize("key", ["md5Checksum", "sha256"])
+def test_checksum_mismatch_discards_partial(drive, cache_dir, key):
+    f, data = shard(drive)
+    path = os.path.join(cache_dir, "a.parquet")
+    bad = dict(f, **{key: hashlib.new("md5" if key == "md5Checksum" else "sha256", b"other").hexdigest()})
+    with pytest.raises(DownloadError, match="불일치"):
+        download(drive, bad, path)
+    assert not any(os.path.exists(p) for p in (path, path + ".part", path + ".part.json"))
+    assert not file_matches(os.path.join(drive.dir, "a.parquet"), bad)
+    assert file_matches(os.path.join(drive.dir, "a.parquet"), f)
+
+def test_confirm_page_is_followed(drive, cache_dir):
+    f, data = shard(drive)
+    drive.confirm.add(f["fileId"])
+    path = os.path.join(cache_dir, "a.parquet")
+    download(drive, f, path)
+    assert open(path, "rb").read() == data
+    follow = [p for p, _ in drive.log if "confirm=t" in p]
+    assert len(follow) == 1 and "uuid=0000-test" in follow[0] and f"id={f['fileId']}" in follow[0]
+
+def test_drive_confirm_url_forms():
+    url = "https://drive.google.com/uc?export=download&id=abc"
+    form = ('<form id="download-form" action="https://drive.usercontent.google.com/download" method="get">'
+            '<input type="hidden" name="id" value="abc"><input type="hidden" name="confirm" value="t">'
+            '<input type="hidden" name="at" value="a&amp;b"><input type="submit" name="go" value="x"></form>')
+    assert drive_confirm_url(form, url) == "https://drive.usercontent.google.com/download?id=abc&confirm=t&at=a%26b"
+    assert drive_confirm_url('<a href="/uc?export=download&amp;confirm=Xy_1-&amp;id=abc">', url) == url + "&confirm=Xy_1-"
+    assert drive_confirm_url("<html></html>", url, {"download_warning_123": "tok"}) == url + "&confirm=tok"
+    assert drive_confirm_url("<html></html>", url) is None
+
+def test_only_200_html_is_a_confirm_page():
+    page = lambda status: SimpleNamespace(status_code=status, headers={"Content-Type": "text/html; charset=utf-8"})
+    assert _is_html(page(200))
+    assert not _is_html(page(206)) and not _is_html(page(304))
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+from test_sync import posts, sync
+
+def test_lazy_engine_over_categorical_shard(drive):
+    # pandas Categorical로 쓴 parquet은 place_id·company_name이 dictionary 타입이다
+    a = posts(["1", "2", "1"], ["a1", "b1", "a2"], dates=["2024-01-01", "2024-01-02", "2024-01-03"])
+    a = a.astype({"place_id": "category", "company_name": "category"})
+    drive.publish({"a.parquet": a})
+    job, _ = sync(lazy=True)
+    engine = job.index
+    assert engine.all_ids == {"1", "2"}
+    assert engine.select(["1"])["title"].tolist() == ["a1", "a2"]
+    assert engine.select(["1"], sdt="2024-01-02")["title"].tolist() == ["a2"]
+    assert [t for df in engine.iter_select(["1", "2"]) for t in df["title"]] == ["a1", "a2", "b1"]
+    assert engine.companies(["2"]) == [("2", "업체2")]
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+import pstats
+import threading
+
+from admin_viewer.perf import Trace, request_profile
+
+def decode_in_worker():
+    return sum(i * i for i in range(1000))
+
+def test_profile_includes_worker_threads():
+    request_profile()
+    trace = Trace("test_profile")
+    def work():
+        with trace.worker():
+            decode_in_worker()
+    t = threading.Thread(target=work)
+    t.start()
+    t.join()
+    trace.finish()
+    assert trace.profile_path
+    names = {func for _, _, func in pstats.Stats(trace.profile_path).stats}
+    assert "decode_in_worker" in names
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+
+import admin_viewer.rollups
+from test_sync import full_sync, posts, sync
+
+def expected_totals(df):
+    d = df.assign(place_id=df["place_id"].astype(str))
+    return (d.groupby("place_id").agg(posts=("title", "size"), first=("pub_date", "min"), last=("pub_date", "max"))
+            .reset_index().sort_values("place_id", ignore_index=True))
+
+def check(rollups, df):
+    got = rollups.totals()
+    want = expected_totals(df)
+    assert got["place_id"].tolist() == want["place_id"].tolist()
+    assert got["posts"].tolist() == want["posts"].tolist()
+    assert got["first"].tolist() == want["first"].dt.strftime("%Y-%m-%d").tolist()
+    assert got["last"].tolist() == want["last"].dt.strftime("%Y-%m-%d").tolist()
+    daily = rollups.periods(freq="D")
+    want = (df.assign(place_id=df["place_id"].astype(str), period=df["pub_date"].dt.strftime("%Y-%m-%d"))
+            .groupby(["place_id", "period"]).size())
+    assert daily.set_index(["place_id", "period"])["posts"].to_dict() == want.to_dict()
+
+def overlapping():
+    # b에 a의 글 하나가 다시 들어 있고, a 안에도 같은 글이 두 번 있다
+    a = posts(["1", "1", "1", "2"], ["a1", "a1", "a2", "a3"],
+              ["https://blog/1/a1", "https://blog/1/a1", "https://blog/1/a2", "https://blog/2/a3"],
+              ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-03"])
+    b = posts(["1", "2"], ["a2", "b1"], ["https://blog/1/a2", "https://blog/2/b1"], ["2024-01-02", "2024-01-05"])
+    return a, b
+
+def test_rollups_match_deduped_rows(drive):
+    a, b = overlapping()
+    drive.publish({"a.parquet": a, "b.parquet": b})
+    job, df = sync()
+    assert len(df) == 4
+    check(job.rollups, df)
+    drive.publish({"a.parquet": a.iloc[:3], "b.parquet": b})
+    job, df = sync()
+    assert job.kept == 1
+    check(job.rollups, df)
+    job, df = sync()
+    check(job.rollups, df)
+
+def test_lazy_rollups_match_lazy_rows(drive):
+    a, b = overlapping()
+    drive.publish({"a.parquet": a, "b.parquet": b})
+    job, _ = sync(lazy=True)
+    df = job.index.select(job.index.all_ids)
+    assert len(df) == 6
+    check(job.rollups, df.assign(pub_date=pd.to_datetime(df["pub_date"])))
+
+def test_snapshot_rollups_recompute_only_changed_shards(drive, monkeypatch):
+    a, b = overlapping()
+    c = posts(["3"], ["c1"])
+    drive.publish({"a.parquet": a, "b.parquet": b, "c.parquet": c})
+    sync()
+    real, calls = admin_viewer.rollups.shard_rollup, []
+    def counted(table):
+        calls.append(table.num_rows)
+        return real(table)
+    monkeypatch.setattr(admin_viewer.rollups, "shard_rollup", counted)
+    # b만 바뀌었다: a·c의 집계는 그대로 쓴다
+    b = posts(["1", "2", "2"], ["a2", "b1", "b2"], ["https://blog/1/a2", "https://blog/2/b1", "https://blog/2/b2"],
+              ["2024-01-02", "2024-01-05", "2024-01-06"])
+    drive.publish({"a.parquet": a, "b.parquet": b, "c.parquet": c})
+    job, df = sync()
+    assert calls == [3]
+    check(job.rollups, df)
+    # 바뀐 b가 a의 글(a1)을 가져가면 a도 행 수가 줄어 다시 계산한다
+    calls.clear()
+    b = posts(["1", "1"], ["a1", "a2"], ["https://blog/1/a1", "https://blog/1/a2"], ["2024-01-01", "2024-01-02"])
+    drive.publish({"a.parquet": a, "b.parquet": b, "c.parquet": c})
+    job, df = sync()
+    assert sorted(calls) == [1, 2]
+    check(job.rollups, df)
+    check(job.rollups, full_sync()[1])
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import random
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from admin_viewer.search import TitleIndex, normalize, title_mask
+
+WORDS = ["강남", "맛집", "카페", "후기", "Cafe", "BRUNCH", "브런치", "강남역", "라떼", "a", "ab", "b", "🍰"]
+
+def titles(n, seed):
+    rnd = random.Random(seed)
+    out = [" ".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 4))) for _ in range(n)]
+    out[:4] = [None, "", unicodedata.normalize("NFD", "강남 맛집"), "CAFE 라떼"]
+    return out
+
+QUERIES = ["강", "집", "a", "B", "🍰", " ", "강남", "남맛", "cafe", "e 라", "맛집 후기", "강남역 카페", "없는말", "abab"]
+
+def baseline(series, q):
+    return series.fillna("").map(normalize).str.contains(normalize(q.strip()), regex=False).to_numpy(dtype=bool)
+
+def check(index, series):
+    rows = np.arange(len(series))
+    for q in QUERIES:
+        if not q.strip():
+            continue
+        assert (index.row_mask(q, rows) == baseline(series, q)).all(), q
+
+def test_title_index_matches_str_contains(tmp_path):
+    first = pd.Series(titles(3000, 1))
+    index = TitleIndex()
+    assert index.attach(first) == first.dropna().nunique()
+    check(index, first)
+    # 제목이 더해지고 행 순서가 바뀐 다음 동기화: 새 제목만 segment로 덧붙인다
+    second = pd.Series(titles(500, 2) + first.tolist()).sample(frac=1, random_state=0, ignore_index=True)
+    added = index.attach(second)
+    assert added == len(set(second.dropna()) - set(first.dropna())) and len(index.segments) == 2
+    check(index, second)
+    index.save(str(tmp_path))
+    loaded = TitleIndex.load(str(tmp_path))
+    assert loaded.titles == index.titles and len(loaded.segments) == 2
+    assert loaded.attach(second) == 0
+    check(loaded, second)
+
+def test_title_mask_matches_str_contains():
+    df = pd.DataFrame({"title": titles(1000, 3)})
+    for q in QUERIES:
+        if q.strip():
+            assert (title_mask(df, q) == baseline(df["title"], q)).all(), q
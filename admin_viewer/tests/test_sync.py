@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pandas as pd
+import pytest
+
+import admin_viewer.sync
+from admin_viewer.cache import CacheIndex, load_snapshot
+from admin_viewer.config import CACHE_DIR, DEFAULT_VIEW_COLS, SNAPSHOT_META_PATH
+from admin_viewer.drive import DownloadError, make_session
+from admin_viewer.sync import SyncCancelled, SyncJob, fetch_shard
+
+def posts(place_ids, titles, urls=None, dates=None):
+    n = len(place_ids)
+    return pd.DataFrame({"place_id": place_ids, "company_name": [f"업체{p}" for p in place_ids],
+                         "pub_date": pd.to_datetime(dates or ["2024-01-01"] * n),
+                         "title": titles, "post_url": urls or [f"https://blog/{p}/{t}" for p, t in zip(place_ids, titles)]})
+
+def sync(lazy=False):
+    job = SyncJob("manifest", lazy=lazy)
+    return job, job.run()
+
+def full_sync():
+    os.remove(SNAPSHOT_META_PATH)
+    return sync()
+
+def rows(df):
+    return sorted(map(tuple, df.astype(object).where(df.notna(), None).values.tolist()), key=repr)
+
+def test_changed_fingerprint_downloads_without_validators(drive):
+    # 같은 초에 다시 써서 Last-Modified가 같아도, manifest md5가 바뀌었으면 조건 없이 새로 받는다
+    drive.publish({"a.parquet": posts(["1"], ["OLD-CONTENT"])}, mtime=1_700_000_000)
+    sync()
+    drive.publish({"a.parquet": posts(["1"], ["NEW-CONTENT"])}, mtime=1_700_000_000)
+    job, df = sync()
+    assert df["title"].tolist() == ["NEW-CONTENT"]
+    job, df = sync()
+    assert job.misses == 0 and df["title"].tolist() == ["NEW-CONTENT"]
+
+def test_not_modified_is_checked_against_manifest(drive, monkeypatch):
+    drive.publish({"a.parquet": posts(["1"], ["OLD-CONTENT"])})
+    sync()
+    drive.publish({"a.parquet": posts(["1"], ["NEW-CONTENT"])})
+    f = drive.manifest["files"][0]
+    real, calls = admin_viewer.sync.stream_download, []
+    def stale(session, url, path, headers=None, **kw):
+        # 조건 없는 요청에도 처음 한 번은 304를 돌려주는 프록시
+        calls.append(headers)
+        return None if len(calls) == 1 else real(session, url, path, headers=headers, **kw)
+    monkeypatch.setattr(admin_viewer.sync, "stream_download", stale)
+    cache = CacheIndex()
+    table, hit = fetch_shard(make_session(), cache, f)
+    assert len(calls) == 2 and not hit and table["title"].to_pylist() == ["NEW-CONTENT"]
+    assert cache.is_fresh(f, os.path.join(CACHE_DIR, "a.parquet"))
+
+def test_not_modified_never_records_new_fingerprint(drive, monkeypatch):
+    drive.publish({"a.parquet": posts(["1"], ["OLD-CONTENT"])})
+    sync()
+    drive.publish({"a.parquet": posts(["1"], ["NEW-CONTENT"])})
+    f = drive.manifest["files"][0]
+    monkeypatch.setattr(admin_viewer.sync, "stream_download", lambda *a, **kw: None)
+    cache = CacheIndex()
+    with pytest.raises(DownloadError):
+        fetch_shard(make_session(), cache, f)
+    assert not cache.is_fresh(f, os.path.join(CACHE_DIR, "a.parquet"))
+
+def test_delta_replaces_rows_of_changed_shard(drive):
+    a = posts(["1", "1", "2"], ["a1", "a2", "a3"], ["https://blog/1/a1", None, "https://blog/2/a3"])
+    b = posts(["2", "3"], ["b1", "b2"])
+    drive.publish({"a.parquet": a, "b.parquet": b})
+    job, df = sync()
+    assert len(df) == 5
+    # a에서 글 하나가 지워지고 URL 없는 글은 제목만 바뀌었다
+    a = posts(["1", "2"], ["a2-edited", "a3"], [None, "https://blog/2/a3"])
+    drive.publish({"a.parquet": a, "b.parquet": b})
+    job, df = sync()
+    assert job.kept == 1 and len(df) == 4
+    _, full = full_sync()
+    assert rows(df) == rows(full)
+    job, df = sync()
+    assert len(df) == 4 and list(load_snapshot()[0].columns) == DEFAULT_VIEW_COLS
+
+def test_delta_keeps_manifest_order_for_overlapping_posts(drive):
+    a = posts(["1"], ["from-a"], ["https://blog/1/same"])
+    b = posts(["1"], ["from-b"], ["https://blog/1/same"])
+    drive.publish({"a.parquet": a, "b.parquet": b})
+    assert sync()[1]["title"].tolist() == ["from-b"]
+    drive.publish({"a.parquet": posts(["1", "1"], ["from-a", "a-new"], ["https://blog/1/same", None]), "b.parquet": b})
+    job, df = sync()
+    assert job.kept == 1 and sorted(df["title"].tolist()) == ["a-new", "from-b"]
+    assert rows(df) == rows(full_sync()[1])
+
+def test_shard_downloaded_by_interrupted_sync_is_read(drive, monkeypatch):
+    b = posts(["2"], ["b1"])
+    drive.publish({"a.parquet": posts(["1"], ["OLD-CONTENT"]), "b.parquet": b})
+    sync()
+    drive.publish({"a.parquet": posts(["1"], ["NEW-CONTENT"]), "b.parquet": b})
+    # 새 a.parquet을 받아 캐시에 기록한 뒤, 스냅샷에 넣기 전에 동기화가 끊긴다
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+    with monkeypatch.context() as m:
+        m.setattr(admin_viewer.sync, "merge_tables", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            sync()
+    job, df = sync()
+    assert job.hits == 1 and job.misses == 0
+    assert sorted(df["title"].tolist()) == ["NEW-CONTENT", "b1"]
+
+def test_cancel_after_download_keeps_snapshot(drive, monkeypatch):
+    drive.publish({"a.parquet": posts(["1"], ["OLD-CONTENT"])})
+    sync()
+    drive.publish({"a.parquet": posts(["1"], ["NEW-CONTENT"])})
+    job = SyncJob("manifest")
+    real = SyncJob._build_search
+    def cancel_then_build(self, trace):
+        # 다운로드가 끝난 뒤, 색인을 만드는 중에 취소된다
+        self.cancel()
+        real(self, trace)
+    monkeypatch.setattr(SyncJob, "_build_search", cancel_then_build)
+    with pytest.raises(SyncCancelled):
+        job.run()
+    assert load_snapshot()[0]["title"].tolist() == ["OLD-CONTENT"]
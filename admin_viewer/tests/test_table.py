@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+
+import pyarrow as pa
+
+from admin_viewer.cache import table_to_frame
+from admin_viewer.sync import compact_table, conform, merge_tables
+from admin_viewer.table import VirtualTable, sort_positions
+
+class FakeTree:
+    def __init__(self):
+        self.idle = []
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def after_idle(self, fn):
+        self.idle.append(fn)
+
+def test_shift_wheel_is_left_to_treeview():
+    tree = FakeTree()
+    table = VirtualTable(tree, SimpleNamespace(configure=lambda **kw: None))
+    assert table.on_wheel(SimpleNamespace(state=0x1, delta=-120, num=None)) is None
+    assert table.on_wheel(SimpleNamespace(state=0x1, delta=0, num=5)) is None
+    assert not tree.idle
+    assert table.on_wheel(SimpleNamespace(state=0, delta=-120, num=None)) == "break"
+    assert len(tree.idle) == 1
+
+def sorted_values(df, col, reverse=False):
+    return [None if v is None or v != v else v for v in df[col].take(sort_positions(df, col, reverse)).tolist()]
+
+def test_category_columns_sort_alphabetically():
+    # 처음 나온 순서(하늘, 가나, 나무)와 가나다 순이 다르게 만든다
+    raw = pa.table({"place_id": ["30", "4", "100", "4"], "company_name": ["하늘", "가나", "나무", None],
+                    "pub_date": pa.array([None] * 4, pa.timestamp("us")), "title": list("abcd"),
+                    "post_url": [f"https://blog/{i}" for i in range(4)]})
+    merged = merge_tables([conform(raw)])[0].df
+    lazy = table_to_frame(compact_table(conform(raw)))
+    for df in (merged, lazy):
+        assert sorted_values(df, "place_id") == ["100", "30", "4", "4"]
+        assert sorted_values(df, "place_id", reverse=True) == ["4", "4", "30", "100"]
+        assert sorted_values(df, "company_name") == ["가나", "나무", "하늘", None]
+        assert sorted_values(df, "company_name", reverse=True) == ["하늘", "나무", "가나", None]
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""화면 없이 ViewerApp 메서드만 가짜 객체에 붙여 확인한다."""
+import queue
+import threading
+from types import MethodType, SimpleNamespace
+
+import pandas as pd
+
+from admin_viewer.perf import Trace
+from admin_viewer.search import CompanySearch
+from admin_viewer.viewer import ViewerApp
+
+class Var:
+    def __init__(self, value=""):
+        self.value = value
+    def get(self):
+        return self.value
+    def set(self, value):
+        self.value = value
+
+class FakeTable:
+    """VirtualTable 대신 걸린 df와 순서만 기억한다."""
+    df = order = None
+    def show(self, df, order=None):
+        self.df, self.order = df, order
+    def update(self, df, order=None):
+        self.df, self.order = df, order
+    def reorder(self, order):
+        self.order = order
+    def titles(self):
+        return (self.df if self.order is None else self.df.take(self.order))["title"].tolist()
+
+def fake_viewer(**attrs):
+    app = SimpleNamespace(selected_ids=[], combo_map={}, combo_var=Var(), search_var=Var(), status=Var(), _ids_note="",
+                          last_filtered=None, sort_orders=None, view_order=None, sort_key=None, sort_reverse={},
+                          table=FakeTable(), memory_cap_mb=512, _stream=None, **attrs)
+    app.after = lambda ms, fn: None
+    app._report = lambda trace, text: app.status.set(text)
+    def render_table(df):
+        app.sort_orders = app.view_order = app.sort_key = None
+        app.table.show(df)
+    app.render_table = render_table
+    for name in ("_input_ids", "_query_ids", "_has_result", "_poll_stream", "_show_grown", "sort_by_column", "_result_frame"):
+        setattr(app, name, MethodType(getattr(ViewerApp, name), app))
+    return app
+
+def test_unknown_numeric_id_is_not_widened():
+    app = fake_viewer(company_search=CompanySearch([("123", "가게"), ("1234", "가게2"), ("555", "빵집")]))
+    app.search_var.set("12")
+    assert app._query_ids() == {"12"} and app._ids_note == ""
+    app.search_var.set("123")
+    assert app._query_ids() == {"123"}
+    # 숫자가 아닌 단어는 업체명 검색 결과로 넓히고 상태줄에 알린다
+    app.search_var.set("가게")
+    assert app._query_ids() == {"123", "1234"} and "2곳" in app._ids_note
+    app.search_var.set("123 555")
+    assert app._query_ids() == {"123", "555"} and app._ids_note == ""
+
+def test_sort_survives_streamed_chunks():
+    app = fake_viewer()
+    state = {"queue": queue.Queue(), "cancel": threading.Event(), "held": 0, "rows": 0, "truncated": False,
+             "done": False, "error": None, "trace": Trace("test_stream"), "note": "", "grown": False, "resort_at": 0.0}
+    app._stream = state
+    chunk = lambda titles: pd.DataFrame({"title": titles, "pub_date": pd.to_datetime(["2024-01-01"] * len(titles))})
+    state["queue"].put(chunk(["d", "b"]))
+    app._poll_stream(state)
+    app.sort_by_column("title")
+    assert app.table.titles() == ["b", "d"]
+    state["queue"].put(chunk(["c", "a"]))
+    app._poll_stream(state)
+    assert app.table.titles() == ["a", "b", "c", "d"]
+    # 다시 정렬할 때가 아니면 지난 정렬을 그대로 보여 주고, 조회가 끝나면 모두 정렬한다
+    state["resort_at"] = float("inf")
+    state["queue"].put(chunk(["e", "0"]))
+    app._poll_stream(state)
+    assert app.table.titles() == ["a", "b", "c", "d"]
+    # 그 사이 헤더를 누르면 아직 걸지 않은 행까지 정렬한다
+    app.sort_by_column("title")
+    assert app.table.titles() == ["e", "d", "c", "b", "a", "0"]
+    state["queue"].put(chunk(["f"]))
+    app._poll_stream(state)
+    state["done"] = True
+    app._poll_stream(state)
+    assert app.table.titles() == app._result_frame()["title"].tolist() == ["f", "e", "d", "c", "b", "a", "0"]